@@ -1,17 +1,21 @@
 
+import sys
 import argparse
 
-from pycktool.pycktool_run import PyCKTool
-
 '''
 This module contains the main() function, which is the entry point for the
 command line interface.
+
+The tool is only imported after the arguments are parsed, and each of its 
+modules imports its heavy dependencies (astroid, chardet, pyarrow, the output
+writers and the process pool) only in the code paths that use them, so the 
+help and the argument errors return quickly.
 '''
 
 __version__ = '1.0.0'
 
-def main():
-    '''The entry point for Setuptools.'''
+def create_argument_parser() -> argparse.ArgumentParser:
+    '''Creates the parser of the command line arguments.'''
 
     parser = argparse.ArgumentParser(description="Execute PyCKTool from the console.")
     parser.add_argument(
@@ -19,17 +23,210 @@ def main():
     )
     parser.add_argument(
         "--format", type=str, help="Format of the output file.", default='csv',
-        choices=['csv', 'json']
+        choices=['csv', 'json', 'jsonl', 'parquet', 'arrow', 'sqlite']
     )
     # TODO: Use output name
     parser.add_argument(
         "--output-prefix", type=str, help="Prefix of the output result files.",
         dest='prefix', default=''
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Number of processes used to parse the files. 0 uses all CPUs."
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, dest='cache_dir', default=None,
+        help="Directory of the parse cache. Unchanged files are not parsed again."
+    )
+    parser.add_argument(
+        "--snapshot", type=str, dest='snapshot_path', default=None,
+        help="Snapshot file saved with the analysis data, used by --git-range."
+    )
+    parser.add_argument(
+        "--git-range", type=str, dest='revision_range', default=None,
+        help="Git revision range changed since the snapshot was saved. Only the "
+             "files changed in the range, and with astroid the files that import "
+             "them, are analyzed again."
+    )
+    parser.add_argument(
+        "--backend", type=str, default=None, choices=['ast', 'astroid'],
+        help="Parser backend. astroid infers the coupled classes, ast is faster "
+             "and resolves them by name. Defaults to astroid, and to ast with "
+             "--history."
+    )
+    parser.add_argument(
+        "--inference-steps", type=int, dest='inference_steps', default=None,
+        help="Maximum number of nodes inferred by astroid for each inferred node."
+    )
+    parser.add_argument(
+        "--inference-timeout", type=float, dest='inference_timeout', default=None,
+        help="Maximum time in seconds spent by astroid inferring each file. "
+             "Nodes not inferred in time are resolved by name."
+    )
+    parser.add_argument(
+        "--inference-context", type=str, dest='inference_context', default=None,
+        choices=['all', 'modules', 'installed'],
+        help="astroid data kept after each file is parsed: its caches and modules "
+             "(memory grows with the number of files), the modules it loaded, or "
+             "only the modules of the standard library and installed packages. "
+             "Defaults to installed, and to modules with --daemon."
+    )
+    parser.add_argument(
+        "--engine", type=str, default='python', choices=['python', 'numpy'],
+        help="Engine of the metrics: python, one class at a time, or numpy, all "
+             "the classes at once (requires pip install pycktool[numpy])."
+    )
+    parser.add_argument(
+        "--profile", action='store_true',
+        help="Print a report of the time and memory of each phase, the slowest "
+             "files and the inference and cache counters."
+    )
+    parser.add_argument(
+        "--include", type=str, action='append', default=None,
+        help="Pattern of the files analyzed, '*.py' by default. Can be repeated."
+    )
+    parser.add_argument(
+        "--exclude", type=str, action='append', default=None,
+        help="Pattern of the files or folders not analyzed, with a trailing '/' "
+             "matching only folders, added to the folders excluded by default "
+             "(hidden folders, virtual environments, build outputs). Can be "
+             "repeated."
+    )
+    parser.add_argument(
+        "--no-gitignore", action='store_false', dest='use_gitignore',
+        help="Analyze the files ignored by the .gitignore files."
+    )
+    parser.add_argument(
+        "--shard", type=str, default='0/1',
+        help="Shard of the files extracted to --shard-output, as INDEX/COUNT, "
+             "like 0/4 for the first of four shards."
+    )
+    parser.add_argument(
+        "--shard-output", type=str, dest='shard_output', default=None,
+        help="File where the class records of the shard are saved, to be merged "
+             "with 'pycktool merge', instead of calculating the metrics."
+    )
+    parser.add_argument(
+        "--history", type=str, dest='history_range', default=None,
+        help="Git revision range, like HEAD or v1.0..main, whose commits are "
+             "analyzed, saving the metrics of each commit as a time series."
+    )
+    parser.add_argument(
+        "--daemon", action='store_true',
+        help="Keep the analysis in memory and answer queries over a local socket, "
+             "parsing again the files changed."
+    )
+    parser.add_argument(
+        "--socket", type=str, dest='socket_path', default=None,
+        help="Socket of the daemon. Defaults to .pycktool.sock in the analyzed path."
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, dest='poll_interval', default=1.0,
+        help="Seconds between the checks of the daemon for changed files."
+    )
+    parser.add_argument(
+        "--query", type=str, default=None,
+        help="JSON query sent to the daemon of the path, like "
+             "'{\"command\": \"class\", \"name\": \"module.Class\"}'."
+    )
+    return parser
+
+def create_merge_argument_parser() -> argparse.ArgumentParser:
+    '''Creates the parser of the arguments of the merge command.'''
+
+    parser = argparse.ArgumentParser(
+        prog='pycktool merge', 
+        description="Merge the shards saved with --shard-output and calculate the metrics."
+    )
+    parser.add_argument("shards", type=str, nargs='+', help="Shard files merged.")
+    parser.add_argument(
+        "--format", type=str, help="Format of the output file.", default='csv',
+        choices=['csv', 'json', 'jsonl', 'parquet', 'arrow', 'sqlite']
+    )
+    parser.add_argument(
+        "--output-prefix", type=str, help="Prefix of the output result files.",
+        dest='prefix', default=''
+    )
+    parser.add_argument(
+        "--root", type=str, default='.',
+        help="Folder of the analyzed files, used to hash them in the sqlite output."
+    )
+    parser.add_argument(
+        "--engine", type=str, default='python', choices=['python', 'numpy'],
+        help="Engine of the metrics: python, one class at a time, or numpy, all "
+             "the classes at once (requires pip install pycktool[numpy])."
+    )
+    return parser
+
+def analyze(*args, **kwargs):
+    '''
+    Analyzes python code and returns the results in memory, without writing
+    any file. See PyCKTool.analyze for the arguments.
+    '''
+    from pycktool.pycktool_run import PyCKTool
+    return PyCKTool.analyze(*args, **kwargs)
+
+def main():
+    '''The entry point for Setuptools.'''
+
+    if sys.argv[1:2] == ['merge']:
+        args = create_merge_argument_parser().parse_args(sys.argv[2:])
+        try:
+            from pycktool.pycktool_run import PyCKTool
+            PyCKTool.merge(args.shards, args.format, args.prefix, args.root, args.engine)
+        except Exception as e:
+            print(e)
+        return
+
+    args = create_argument_parser().parse_args()
+    if args.backend is None:
+        # astroid would infer the imports of past commits from the checkout
+        args.backend = 'ast' if args.history_range is not None else 'astroid'
+    if args.inference_context is None:
+        # The daemon keeps the analyzed modules loaded to parse the changed files
+        args.inference_context = 'modules' if args.daemon else 'installed'
 
     try:
-        PyCKTool.run(args.path, args.format, args.prefix)
+        from pycktool.pycktool_run import PyCKTool
+        if args.query is not None:
+            import json
+            from pycktool.daemon.analysis_daemon import AnalysisDaemon
+            answer = AnalysisDaemon.query(
+                PyCKTool.get_socket_path(args.path, args.socket_path), 
+                json.loads(args.query)
+            )
+            print(json.dumps(answer, indent=4))
+            return
+        if args.daemon:
+            PyCKTool.serve(
+                args.path, args.socket_path, args.cache_dir, args.backend,
+                args.inference_steps, args.inference_timeout, args.include,
+                args.exclude, args.use_gitignore, args.poll_interval,
+                args.inference_context
+            )
+            return
+        if args.history_range is not None:
+            PyCKTool.history(
+                args.path, args.history_range, args.format, args.prefix, 
+                args.cache_dir, args.backend, args.inference_steps, 
+                args.inference_timeout, args.include, args.exclude, 
+                args.use_gitignore, args.inference_context, args.profile, args.engine
+            )
+            return
+        if args.shard_output is not None:
+            PyCKTool.extract_shard(
+                args.path, args.shard_output, args.shard, args.jobs, args.cache_dir,
+                args.backend, args.inference_steps, args.inference_timeout,
+                args.include, args.exclude, args.use_gitignore, args.inference_context
+            )
+            return
+        PyCKTool.run(
+            args.path, args.format, args.prefix, args.jobs, args.cache_dir,
+            args.snapshot_path, args.revision_range, args.backend,
+            args.inference_steps, args.inference_timeout, args.profile,
+            args.include, args.exclude, args.use_gitignore, args.inference_context,
+            args.engine
+        )
     except Exception as e:
         print(e)
 
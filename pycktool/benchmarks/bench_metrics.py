@@ -0,0 +1,45 @@
+import random
+import sys
+import time
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+
+'''
+Benchmark of the metrics calculation over synthetic classes. The time per 
+class should stay flat as the number of classes grows.
+
+Usage: python -m pycktool.benchmarks.bench_metrics [python|numpy]
+'''
+
+def generate_classes(
+    number_of_classes: int, couplings_per_class: int = 5, seed: int = 0
+) -> dict[str, Class]:
+    """
+    Generates classes with random coupling and single inheritance.
+    """
+    rng = random.Random(seed)
+    names = [f'Class{i}' for i in range(number_of_classes)]
+    classes = {name: Class(name) for name in names}
+    for i, class_obj in enumerate(classes.values()):
+        if i > 0 and rng.random() < 0.5:
+            class_obj.parents.append(classes[names[rng.randrange(i)]])
+        for coupled_class in rng.sample(names, couplings_per_class):
+            class_obj.add_coupled_class(coupled_class)
+    return classes
+
+def main():
+    engine = sys.argv[1] if len(sys.argv) > 1 else 'python'
+    print(f'{"classes":>10} {"seconds":>10} {"us/class":>10}')
+    for number_of_classes in (1000, 2000, 4000, 8000, 16000):
+        classes = generate_classes(number_of_classes)
+        start = time.perf_counter()
+        Metrics.create(classes, engine).calculate_class_metrics()
+        elapsed = time.perf_counter() - start
+        print(
+            f'{number_of_classes:>10} {elapsed:>10.3f} '
+            f'{elapsed / number_of_classes * 1e6:>10.1f}'
+        )
+
+if __name__ == '__main__':
+    main()
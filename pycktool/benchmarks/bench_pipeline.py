@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from pycktool.benchmarks.project_generator import generate_project
+from pycktool.profiling.profiler import PeakMemory, get_peak_rss
+
+'''
+Benchmark of the PyCKTool pipeline over synthetic projects of growing size.
+The parsing, the metrics calculation and the output are timed separately, 
+with the peak RSS of the process during each phase, and the scaling of each 
+phase with the number of classes is estimated.
+
+Each size runs in a new process, so the peak RSS of a size is not affected by
+the previous ones. The results can be saved and compared with a baseline, 
+failing when a phase got slower than the tolerance.
+
+Usage: python -m pycktool.benchmarks.bench_pipeline [--sizes 500 1000 2000]
+'''
+
+PHASES = ['parse', 'metrics', 'output']
+
+# Slowdowns smaller than this are timing noise, not regressions
+MIN_REGRESSION_SECONDS = 0.01
+
+def run_size(
+    number_of_classes: int, backend: str = 'astroid', output_format: str = 'csv',
+    seed: int = 0, inference_context: str = 'installed'
+) -> dict:
+    """
+    Generates a project with the given number of classes and runs each phase
+        of the pipeline over it. Returns the time and peak RSS of each phase,
+        which is None if the platform can not reset the peak RSS and the 
+        phase did not raise it.
+
+    The inference context is the astroid data kept after each file is parsed,
+        which bounds the peak RSS of the parsing.
+    """
+    # Imported in the benchmark process, after the RSS baseline
+    from pycktool.metrics.metrics import Metrics
+    from pycktool.output_handler.output_handler import OutputHandler
+    from pycktool.parser.folder_parser import FolderParser
+
+    result = {'classes': number_of_classes, 'initial_rss': get_peak_rss()}
+    with tempfile.TemporaryDirectory() as path:
+        project_path = os.path.join(path, 'project')
+        generate_project(project_path, number_of_classes, seed=seed)
+
+        start = time.perf_counter()
+        with PeakMemory() as memory:
+            fp = FolderParser(
+                project_path, backend=backend, 
+                parser_options={'inference_context': inference_context} 
+                if backend == 'astroid' else None
+            )
+            classes = fp.parse_path()
+        result['parse'] = {
+            'seconds': time.perf_counter() - start, 'rss': memory.peak_rss
+        }
+
+        start = time.perf_counter()
+        with PeakMemory() as memory:
+            results_class, results_methods = Metrics(classes).calculate_all_metrics()
+        result['metrics'] = {
+            'seconds': time.perf_counter() - start, 'rss': memory.peak_rss
+        }
+
+        current_path = os.getcwd()
+        os.chdir(path)
+        try:
+            start = time.perf_counter()
+            with PeakMemory() as memory:
+                OutputHandler.save_results(
+                    results_class, results_methods, 'results', output_format
+                )
+            result['output'] = {
+                'seconds': time.perf_counter() - start, 'rss': memory.peak_rss
+            }
+        finally:
+            os.chdir(current_path)
+    return result
+
+def get_scaling_exponent(results: list[dict], phase: str) -> float | None:
+    """
+    Estimates the exponent k of the time of a phase, as O(n^k) of the number 
+        of classes, from the smallest and the largest size.
+    """
+    first, last = results[0], results[-1]
+    if last['classes'] == first['classes'] or \
+       min(first[phase]['seconds'], last[phase]['seconds']) <= 0:
+        return None
+    return math.log(last[phase]['seconds'] / first[phase]['seconds']) / \
+        math.log(last['classes'] / first['classes'])
+
+def compare_with_baseline(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """
+    Compares the time of each phase with the baseline results of the same 
+        size. Returns the descriptions of the regressions.
+    """
+    baseline_by_size = {result['classes']: result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_size.get(result['classes'])
+        if baseline_result is None:
+            continue
+        for phase in PHASES:
+            seconds = result[phase]['seconds']
+            baseline_seconds = baseline_result[phase]['seconds']
+            if seconds > baseline_seconds * (1 + tolerance) and \
+               seconds - baseline_seconds > MIN_REGRESSION_SECONDS:
+                regressions.append(
+                    f'{phase} with {result["classes"]} classes: '
+                    f'{seconds:.3f}s, baseline {baseline_seconds:.3f}s'
+                )
+    return regressions
+
+def print_results(results: list[dict]) -> None:
+    print(
+        f'{"classes":>8} {"phase":>8} {"seconds":>10} {"us/class":>10} '
+        f'{"peak MB":>10}'
+    )
+    for result in results:
+        for phase in PHASES:
+            seconds = result[phase]['seconds']
+            rss = result[phase]['rss']
+            print(
+                f'{result["classes"]:>8} {phase:>8} {seconds:>10.3f} '
+                f'{seconds / result["classes"] * 1e6:>10.1f} '
+                f'{rss if rss is not None else float("nan"):>10.1f}'
+            )
+    for phase in PHASES:
+        exponent = get_scaling_exponent(results, phase)
+        if exponent is not None:
+            print(f'{phase} scales as O(n^{exponent:.2f})')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PyCKTool pipeline.")
+    parser.add_argument(
+        "--sizes", type=int, nargs='+', default=[250, 500, 1000, 2000],
+        help="Numbers of classes of the generated projects."
+    )
+    parser.add_argument("--backend", type=str, default='astroid', choices=['ast', 'astroid'])
+    parser.add_argument("--format", type=str, default='csv', dest='output_format')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--inference-context", type=str, default='installed', dest='inference_context',
+        choices=['all', 'modules', 'installed']
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="JSON file where the results are saved."
+    )
+    parser.add_argument(
+        "--baseline", type=str, default=None, 
+        help="JSON file of previous results. Regressions exit with an error."
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Accepted slowdown over the baseline, as a fraction of its time."
+    )
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for number_of_classes in sorted(args.sizes):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(
+                run_size, number_of_classes, args.backend, args.output_format, 
+                args.seed, args.inference_context
+            ).result())
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare_with_baseline(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print('Regression: ', regression)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
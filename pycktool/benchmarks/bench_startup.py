@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from pycktool.benchmarks.project_generator import generate_project
+
+'''
+Benchmark of the startup time of the PyCKTool command line. Each command runs
+in a new interpreter, as when it is called by an editor or a git hook, and the
+heavy modules it imported are reported.
+
+The commands are the help, an argument error and a run of a project whose
+files are all in the parse cache, which should not import astroid.
+
+Usage: python -m pycktool.benchmarks.bench_startup [--repeats 10]
+'''
+
+# Modules that are slow to import, and are only needed by some code paths
+HEAVY_MODULES = [
+    'astroid', 'chardet', 'pyarrow', 'sqlite3', 'csv', 'concurrent.futures.process',
+    'subprocess', 'socketserver'
+]
+
+# Runs the command line with the given arguments, and prints the heavy modules
+# it imported
+_IMPORTS_SCRIPT = '''
+import sys, json
+heavy_modules = json.loads(sys.argv[2])
+sys.argv = ['pycktool'] + json.loads(sys.argv[1])
+import pycktool
+try:
+    pycktool.main()
+except SystemExit:
+    pass
+print(json.dumps([name for name in heavy_modules if name in sys.modules]))
+'''
+
+def get_environment() -> dict[str, str]:
+    """
+    Returns the environment of the benchmark processes, which must import this
+        PyCKTool and not an installed one.
+    """
+    package_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        [package_path] + ([os.environ['PYTHONPATH']] if os.environ.get('PYTHONPATH') else [])
+    )
+    return environment
+
+def time_command(command: list[str], repeats: int = 10, cwd: str | None = None) -> dict:
+    """
+    Runs a command the given times, and returns the minimum and the median of
+        its wall times in milliseconds.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            command, cwd=cwd, env=get_environment(), stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        times.append((time.perf_counter() - start) * 1000)
+    return {'min_ms': min(times), 'median_ms': statistics.median(times)}
+
+def get_imported_modules(args: list[str], cwd: str | None = None) -> list[str]:
+    """
+    Returns the heavy modules imported by the command line with the given
+        arguments.
+    """
+    result = subprocess.run(
+        [
+            sys.executable, '-c', _IMPORTS_SCRIPT, json.dumps(args),
+            json.dumps(HEAVY_MODULES)
+        ],
+        cwd=cwd, env=get_environment(), capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run_commands(repeats: int = 10, number_of_classes: int = 200) -> dict[str, dict]:
+    """
+    Times each command, with the heavy modules it imported. The time of an
+        empty interpreter is the baseline of the commands.
+    """
+    results = {'interpreter': time_command([sys.executable, '-c', 'pass'], repeats)}
+    results['interpreter']['imports'] = []
+    with tempfile.TemporaryDirectory() as path:
+        project_path = os.path.join(path, 'project')
+        generate_project(project_path, number_of_classes)
+        cache_dir = os.path.join(path, 'cache')
+        commands = {
+            'help': ['--help'],
+            'argument error': ['--format', 'unknown'],
+            'cached run': [project_path, '--cache-dir', cache_dir],
+        }
+        # Fills the parse cache
+        time_command([sys.executable, '-m', 'pycktool', *commands['cached run']], 1, path)
+        for name, args in commands.items():
+            results[name] = time_command(
+                [sys.executable, '-m', 'pycktool', *args], repeats, path
+            )
+            results[name]['imports'] = get_imported_modules(args, path)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PyCKTool startup.")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument(
+        "--classes", type=int, default=200,
+        help="Number of classes of the project of the cached run."
+    )
+    args = parser.parse_args()
+
+    results = run_commands(args.repeats, args.classes)
+    print(f'{"command":>16} {"min ms":>10} {"median ms":>10}  heavy imports')
+    for name, result in results.items():
+        print(
+            f'{name:>16} {result["min_ms"]:>10.1f} {result["median_ms"]:>10.1f}  '
+            f'{", ".join(result["imports"]) or "-"}'
+        )
+
+if __name__ == '__main__':
+    main()
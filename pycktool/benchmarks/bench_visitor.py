@@ -0,0 +1,125 @@
+import os
+import ast
+import sys
+import time
+import inspect
+import argparse
+import tempfile
+
+import astroid
+
+from pycktool.benchmarks.project_generator import generate_project
+from pycktool.parser.ast_code_parser import AstCodeParser
+from pycktool.parser.code_parser import CodeParser
+
+'''
+Benchmark of the traversal of the classes by the astroid based CodeParser. The
+nodes visited while extracting the data of the classes are counted, and
+compared with the number of nodes of the classes: each node should be visited
+at most once.
+
+The traversal of deeply nested code is run with a small stack, which is only
+enough for a traversal that does not recurse on each nested node, by the 
+parser of each backend.
+
+Usage: python -m pycktool.benchmarks.bench_visitor [--classes 200] [--frames 200]
+'''
+
+# Deepest nesting of statements accepted by the Python parser is 100
+STATEMENTS_DEPTH = 90
+
+def count_class_nodes(module: astroid.Module) -> int:
+    """
+    Returns the number of nodes of the classes of the given module.
+    """
+    return sum(
+        sum(1 for _ in node.nodes_of_class(astroid.NodeNG))
+        for node in module.body if isinstance(node, astroid.ClassDef)
+    )
+
+def run_project(number_of_classes: int = 200) -> dict:
+    """
+    Parses a generated project, and returns the number of nodes of its
+        classes, the nodes visited while extracting their data, and the
+        seconds spent on the extraction, without the astroid parsing.
+    """
+    result = {'class_nodes': 0, 'visited_nodes': 0, 'seconds': 0.0}
+    with tempfile.TemporaryDirectory() as path:
+        for file_path in generate_project(os.path.join(path, 'project'), number_of_classes):
+            with open(file_path, encoding='utf-8') as file:
+                module = astroid.parse(file.read(), path=file_path)
+            result['class_nodes'] += count_class_nodes(module)
+
+            parser = CodeParser()
+            start = time.perf_counter()
+            parser.extract_module_data(module)
+            result['seconds'] += time.perf_counter() - start
+            result['visited_nodes'] += parser.stats['visited_nodes']
+    return result
+
+def generate_nested_code(depth: int) -> str:
+    """
+    Returns the code of a class with a method that assigns a call with the
+        given depth of nested calls, nested in compound statements.
+    """
+    lines = ['class Nested:', '    def method(self, value):']
+    for level in range(STATEMENTS_DEPTH):
+        lines.append('        ' + '    ' * level + f'if value > {level}:')
+    lines.append(
+        '        ' + '    ' * STATEMENTS_DEPTH + 'self.total = ' +
+        'self.add(' * depth + 'value' + ')' * depth
+    )
+    return '\n'.join(lines) + '\n'
+
+def run_nesting(
+    depths: list[int], frames: int = 200, backend: str = 'astroid'
+) -> dict[int, str]:
+    """
+    Extracts the data of nested code of each depth with the given number of
+        stack frames available, once the code is parsed by the backend. 
+        Returns 'ok' or the error of each depth.
+    """
+    results = {}
+    for depth in depths:
+        if backend == 'ast':
+            module = ast.parse(generate_nested_code(depth))
+            parser = AstCodeParser()
+        else:
+            module = astroid.parse(generate_nested_code(depth))
+            parser = CodeParser()
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack(0)) + frames)
+        try:
+            parser.extract_module_data(module)
+            results[depth] = 'ok'
+        except RecursionError as e:
+            results[depth] = type(e).__name__
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CodeParser traversal.")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument(
+        "--frames", type=int, default=200,
+        help="Stack frames available to the traversal of the nested code."
+    )
+    args = parser.parse_args()
+
+    result = run_project(args.classes)
+    print(
+        f'{args.classes} classes: {result["class_nodes"]} nodes, '
+        f'{result["visited_nodes"]} visited '
+        f'({result["visited_nodes"] / max(result["class_nodes"], 1):.2f} per node), '
+        f'{result["seconds"]:.2f} s'
+    )
+    for backend in ('astroid', 'ast'):
+        for depth, outcome in run_nesting([25, 50, 100, 120], args.frames, backend).items():
+            print(
+                f'{backend:>7}: {depth:>4} nested calls in {STATEMENTS_DEPTH} '
+                f'nested ifs: {outcome}'
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import os
+import random
+
+'''
+Generator of synthetic Python projects, used to benchmark PyCKTool on large
+repositories with a known shape.
+'''
+
+def generate_class_code(
+    class_index: int, number_of_classes: int, rng: random.Random, 
+    hierarchy_depth: int, couplings_per_class: int, methods_per_class: int, 
+    statements_per_method: int
+) -> str:
+    """
+    Generates the code of a class. The classes form inheritance chains of the
+        given depth, and each class is coupled to random classes through
+        annotations and calls in its methods.
+    """
+    parent = f'(Class{class_index - 1})' if class_index % hierarchy_depth else ''
+    lines = [f'class Class{class_index}{parent}:', f'    counter = {class_index}', '']
+
+    coupled_classes = [
+        f'Class{rng.randrange(number_of_classes)}' 
+        for _ in range(couplings_per_class)
+    ]
+    for method_index in range(methods_per_class):
+        coupled_class = coupled_classes[method_index % len(coupled_classes)] \
+            if coupled_classes else 'object'
+        lines.append(
+            f'    def method_{method_index}(self, value: {coupled_class}, '
+            f'count: int) -> {coupled_class}:'
+        )
+        lines.append(f'        self.attribute_{method_index} = value')
+        for statement_index in range(statements_per_method):
+            kind = statement_index % 4
+            if kind == 0:
+                lines.append(f'        total = count + {statement_index}')
+            elif kind == 1:
+                lines.append(f'        if total > {statement_index}:')
+                lines.append(f'            self.method_{rng.randrange(methods_per_class)}(value, total)')
+            elif kind == 2:
+                lines.append('        for item in range(count):')
+                lines.append(f'            total += self.attribute_{method_index}.counter')
+            else:
+                target = coupled_classes[statement_index % len(coupled_classes)] \
+                    if coupled_classes else 'object'
+                lines.append(f'        {target}.method_0(value, total)')
+        lines.append('        return value')
+        lines.append('')
+    return '\n'.join(lines)
+
+def generate_project(
+    path: str, number_of_classes: int, classes_per_file: int = 10, 
+    hierarchy_depth: int = 8, couplings_per_class: int = 5, 
+    methods_per_class: int = 5, statements_per_method: int = 20, seed: int = 0
+) -> list[str]:
+    """
+    Generates a project with the given number of classes in packages of 
+        modules under the given path. The project is the same for the same
+        arguments and seed. Returns the paths of the generated files.
+    """
+    rng = random.Random(seed)
+    file_paths = []
+    for first_class in range(0, number_of_classes, classes_per_file):
+        file_index = first_class // classes_per_file
+        package_path = os.path.join(path, f'package_{file_index // 100}')
+        os.makedirs(package_path, exist_ok=True)
+
+        classes_code = [
+            generate_class_code(
+                class_index, number_of_classes, rng, hierarchy_depth, 
+                couplings_per_class, methods_per_class, statements_per_method
+            )
+            for class_index in range(
+                first_class, min(first_class + classes_per_file, number_of_classes)
+            )
+        ]
+        file_path = os.path.join(package_path, f'module_{file_index}.py')
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write('\n\n'.join(classes_code))
+        file_paths.append(file_path)
+    return file_paths
@@ -0,0 +1,398 @@
+import os
+import json
+import time
+import socket
+import threading
+import socketserver
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.parser.name_resolver import NameResolver
+from pycktool.parser.parse_cache import ParseCache
+
+class AnalysisDaemon:
+    """
+    Keeps the analysis of a folder in memory, and answers metric queries over
+        a local socket.
+
+    The class records of each file are kept, and the folder is polled for
+        changes: only the added or modified files, and with astroid the files
+        that import them, are parsed again, by the parser modules already 
+        imported and with the astroid caches warm. The astroid modules of the
+        changed files are released, so they are not inferred from their 
+        previous versions.
+        Only the classes of the changed files are rebuilt from their records, 
+        unless the changes add or remove classes, and the metrics are 
+        calculated when queried after a change.
+
+    The queries and their answers are JSON objects, one per line. Each query
+        has a command: status, class, file, top, refresh or shutdown. Each 
+        client is answered by its own thread, and the analysis is locked while
+        a query is answered or the folder is scanned.
+    """
+
+    def __init__(
+        self, path: str, backend: str = 'astroid', parser_options: dict | None = None,
+        discovery: FileDiscovery | None = None, cache_dir: str | None = None,
+        poll_interval: float = 1.0
+    ) -> None:
+
+        self.path = path
+        self.backend = backend
+        self.parser_options = parser_options
+        self.discovery = discovery if discovery is not None else FileDiscovery(path)
+        self.cache = ParseCache(cache_dir, backend, parser_options) if cache_dir else None
+        self.poll_interval = poll_interval
+
+        # Class records of each file, and the modification time and size of
+        # the file when it was parsed
+        self.file_records: dict[str, list[dict]] = {}
+        self.file_stamps: dict[str, tuple[int, int]] = {}
+        # Absolute paths of the analyzed files imported by each file, kept 
+        # with the astroid backend
+        self.file_imports: dict[str, set[str]] = {}
+
+        self.parser = BaseCodeParser()
+        self.scans = 0
+        self.last_scan = 0.0
+        self.last_scan_seconds = 0.0
+        self.running = False
+        self._lock = threading.RLock()
+
+        # Metrics of the current classes, created when first queried, and the
+        # results of all the classes, calculated when first needed
+        self._metrics: Metrics | None = None
+        self._classes_results: dict | None = None
+
+    @staticmethod
+    def _get_stamp(file_path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def scan(self) -> int:
+        """
+        Parses the files added or modified since the last scan, and removes
+            the deleted ones. With the astroid backend, the files that import
+            the changed files are parsed again too. Returns the number of 
+            changed files.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            file_paths = [
+                os.path.normpath(file_path) for file_path in self.discovery.iter_files()
+            ]
+            changed_paths = []
+            for file_path in file_paths:
+                stamp = self._get_stamp(file_path)
+                if stamp is None or self.file_stamps.get(file_path) == stamp:
+                    continue
+                changed_paths.append(file_path)
+                self.file_stamps[file_path] = stamp
+            deleted_paths = self.file_records.keys() - set(file_paths)
+            changed_count = len(changed_paths) + len(deleted_paths)
+
+            # With astroid, the classes of the files that import the changed 
+            # files are inferred from them, so these files are parsed again
+            if self.backend == 'astroid' and (changed_paths or deleted_paths):
+                changed_paths += self._get_importers(
+                    file_paths, changed_paths + list(deleted_paths)
+                )
+                self._release_modules(changed_paths + list(deleted_paths))
+
+            # Previous records of the changed files
+            changed_files = {}
+            for file_path in changed_paths:
+                changed_files[file_path] = self.file_records.get(file_path, [])
+                self.file_records[file_path] = self._extract_file_records(file_path)
+
+            for file_path in deleted_paths:
+                changed_files[file_path] = self.file_records.pop(file_path)
+                del self.file_stamps[file_path]
+                self.file_imports.pop(file_path, None)
+
+            if changed_files:
+                # Files are merged in the discovery order, as in a full analysis
+                self.file_records = {
+                    file_path: self.file_records[file_path]
+                    for file_path in file_paths if file_path in self.file_records
+                }
+                self._update_classes(changed_files)
+
+            self.scans += 1
+            self.last_scan = time.monotonic()
+            self.last_scan_seconds = time.perf_counter() - start
+            return changed_count
+
+    def _extract_file_records(self, file_path: str) -> list[dict]:
+        """
+        Extracts the class records of a file. With the astroid backend, the
+            analyzed files imported by the file are kept too.
+        """
+        module_name = NameResolver.get_module_name(self.path, file_path)
+        if self.backend == 'astroid':
+            try:
+                with open(file_path, 'rb') as file:
+                    content = file.read()
+            except OSError:
+                content = b''
+            self.file_imports[file_path] = set(
+                ParseCache.get_imported_files(content, file_path, module_name)
+            )
+        return FolderParser.extract_file_records(
+            file_path, self.cache, self.backend, self.parser_options,
+            self.parser.stats, None, module_name
+        )
+
+    def _get_importers(self, file_paths: list[str], changed_paths: list[str]) -> list[str]:
+        """
+        Returns the unchanged files that import any of the changed files, 
+            whose classes are inferred from the changed files by astroid.
+        """
+        changed = {os.path.abspath(file_path) for file_path in changed_paths}
+        return [
+            file_path for file_path in file_paths
+            if file_path not in changed_paths and file_path in self.file_records
+            and not self.file_imports.get(file_path, set()).isdisjoint(changed)
+        ]
+
+    def _release_modules(self, file_paths: list[str]) -> None:
+        """
+        Releases the modules of the given files loaded by astroid, so the 
+            changed files are not inferred from their previous versions.
+        """
+        from pycktool.parser.code_parser import CodeParser
+        CodeParser.release_modules(
+            NameResolver.get_module_name(self.path, file_path) for file_path in file_paths
+        )
+
+    @staticmethod
+    def _get_record_names(records: list[dict]) -> tuple[set[str], set[str]]:
+        """
+        Returns the names of the classes and base classes of some records, and 
+            the names of the classes defined by them.
+        """
+        names = set()
+        defined_names = set()
+        for record in records:
+            names.add(record['name'])
+            names.update(record['parents'])
+            if record['file']:
+                defined_names.add(record['name'])
+        return names, defined_names
+
+    def _update_classes(self, changed_files: dict[str, list[dict]]) -> None:
+        """
+        Rebuilds the classes of the changed files, given with their previous 
+            records, and discards the metrics of the previous classes.
+
+        The references of the other files are resolved against all the 
+            classes, so all the classes are rebuilt if the changed files added
+            or removed classes or base classes.
+        """
+        old_names, old_defined_names = self._get_record_names(
+            [record for records in changed_files.values() for record in records]
+        )
+        names, defined_names = self._get_record_names([
+            record 
+            for file_path in changed_files.keys() 
+            for record in self.file_records.get(file_path, ())
+        ])
+        if names != old_names or defined_names != old_defined_names:
+            self._rebuild_classes()
+            return
+
+        # Base classes that are not defined can have records in other files
+        changed_parser = BaseCodeParser()
+        for file_path, records in self.file_records.items():
+            changed_parser.merge_class_records([
+                record for record in records if record['name'] in names
+            ])
+
+        # The references are resolved as process_possible_coupled_classes does,
+        # with the classes that did not change
+        resolver = NameResolver(self.classes)
+        all_classes = set(self.classes.keys())
+        for class_name in names & all_classes:
+            class_obj = changed_parser.classes[class_name]
+            for i, parent in enumerate(class_obj.parents):
+                if parent.file:
+                    continue
+                resolved = resolver.resolve_defined(parent.name)
+                if resolved is not None and resolved not in (parent.name, class_name):
+                    class_obj.parents[i] = self.classes[resolved]
+            class_obj.process_possible_coupled_classes(all_classes, resolver=resolver)
+            self.classes[class_name] = class_obj
+
+        # Parents are linked to the classes by the parser that owns them
+        for class_obj in self.classes.values():
+            class_obj.parents = [self.classes[parent.name] for parent in class_obj.parents]
+
+        self._metrics = None
+        self._classes_results = None
+
+    def _rebuild_classes(self) -> None:
+        """
+        Rebuilds the classes from the class records of the files, and discards
+            the metrics of the previous classes.
+        """
+        stats = self.parser.stats
+        self.parser = BaseCodeParser()
+        self.parser.stats = stats
+        for records in self.file_records.values():
+            self.parser.merge_class_records(records)
+        self.parser.process_possible_coupled_classes()
+        self._metrics = None
+        self._classes_results = None
+
+    @property
+    def classes(self) -> dict[str, Class]:
+        return self.parser.classes
+
+    def _get_metrics(self) -> Metrics:
+        if self._metrics is None:
+            self._metrics = Metrics(self.classes)
+        return self._metrics
+
+    def _get_classes_results(self) -> dict:
+        if self._classes_results is None:
+            self._classes_results = self._get_metrics().calculate_class_metrics()
+        return self._classes_results
+
+    def _find_class(self, name: str) -> str | None:
+        """
+        Finds a class by its qualified name, or by a unique suffix of it.
+        """
+        if name in self.classes:
+            return name
+        return NameResolver(self.classes).resolve_defined(name)
+
+    def _class_results(self, class_name: str) -> dict:
+        metrics = self._get_metrics()
+        return {
+            'name': class_name,
+            'metrics': metrics.get_class_metrics(class_name),
+            'methods': metrics.get_method_metrics(class_name),
+        }
+
+    def handle_query(self, query: dict) -> dict:
+        """
+        Answers a query. Failed queries are answered with an error.
+        """
+        with self._lock:
+            return self._answer_query(query)
+
+    def _answer_query(self, query: dict) -> dict:
+        command = query.get('command')
+        if command == 'status':
+            return {
+                'ok': True, 'path': self.path, 'files': len(self.file_records),
+                'classes': len(self.classes), 'scans': self.scans,
+                'last_scan_seconds': self.last_scan_seconds,
+            }
+        if command == 'refresh':
+            return {'ok': True, 'changed_files': self.scan()}
+        if command == 'class':
+            class_name = self._find_class(str(query.get('name', '')))
+            if class_name is None:
+                return {'ok': False, 'error': f"Unknown class: {query.get('name')}"}
+            return {'ok': True, **self._class_results(class_name)}
+        if command == 'file':
+            file_path = os.path.normpath(os.path.join(self.path, str(query.get('path', ''))))
+            # Base classes not defined in the file have records without file
+            class_names = [
+                record['name'] for record in self.file_records.get(file_path, ())
+                if record['file'] and record['name'] in self.classes
+            ]
+            return {
+                'ok': True,
+                'classes': [self._class_results(class_name) for class_name in class_names]
+            }
+        if command == 'top':
+            metric = query.get('metric', 'CBO')
+            results = self._get_classes_results()
+            ranked = sorted(
+                (
+                    (class_name, class_results[metric])
+                    for class_name, class_results in results.items()
+                    if isinstance(class_results.get(metric), (int, float))
+                ),
+                key=lambda item: item[1], reverse=True
+            )
+            return {
+                'ok': True, 'metric': metric,
+                'classes': [list(item) for item in ranked[:int(query.get('limit', 10))]]
+            }
+        if command == 'shutdown':
+            self.running = False
+            return {'ok': True}
+        return {'ok': False, 'error': f'Unknown command: {command}'}
+
+    def _create_server(self, socket_path: str) -> socketserver.BaseServer:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('The daemon requires Unix domain sockets')
+
+        daemon = self
+
+        class QueryHandler(socketserver.StreamRequestHandler):
+
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        answer = daemon.handle_query(json.loads(line))
+                    except Exception as e:
+                        answer = {'ok': False, 'error': str(e)}
+                    self.wfile.write(json.dumps(answer).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                    if not daemon.running:
+                        break
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, QueryHandler)
+        server.timeout = self.poll_interval
+        # Clients left open do not keep the daemon running after a shutdown
+        server.daemon_threads = True
+        server.block_on_close = False
+        return server
+
+    def serve(self, socket_path: str) -> None:
+        """
+        Analyzes the folder and answers the queries sent to the socket,
+            polling the folder for changes between them, until a shutdown
+            query is received.
+        """
+        self.scan()
+        print(
+            'PyCKTool daemon listening on', socket_path, '-', len(self.file_records),
+            'files,', len(self.classes), 'classes'
+        )
+        server = self._create_server(socket_path)
+        self.running = True
+        try:
+            while self.running:
+                server.handle_request()
+                if self.running and \
+                   time.monotonic() - self.last_scan >= self.poll_interval:
+                    self.scan()
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    @staticmethod
+    def query(socket_path: str, query: dict, timeout: float | None = 60) -> dict:
+        """
+        Sends a query to a running daemon and returns its answer.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(json.dumps(query).encode('utf-8') + b'\n')
+            with client.makefile('rb') as answer:
+                return json.loads(answer.readline())
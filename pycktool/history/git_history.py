@@ -0,0 +1,255 @@
+import os
+import subprocess
+from typing import Iterator
+
+from pycktool.incremental.git_diff import GitDiff
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.parser.name_resolver import NameResolver
+from pycktool.parser.parse_cache import ParseCache
+
+class GitObjectReader:
+    """
+    Reads objects from the object store of a git repository with a single
+        'git cat-file --batch' process, without checking them out.
+    """
+
+    def __init__(self, path: str) -> None:
+
+        self._process = subprocess.Popen(
+            ['git', '-C', path, 'cat-file', '--batch'], stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+
+    def read(self, object_id: str) -> tuple[str, bytes]:
+        """
+        Returns the type and the content of an object. Raises a RuntimeError
+            if the object does not exist.
+        """
+        self._process.stdin.write(object_id.encode('ascii') + b'\n')
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) != 3:
+            raise RuntimeError(f'git object {object_id} not found')
+        content = self._process.stdout.read(int(header[2]))
+        # Each object is followed by a line feed
+        self._process.stdout.read(1)
+        return header[1].decode('ascii'), content
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        self._process.wait()
+        self._process.stdout.close()
+
+    def __enter__(self) -> 'GitObjectReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class GitHistory:
+    """
+    Calculates the metrics of a folder of a git repository at each commit of
+        a revision range, reading the files from the object store.
+
+    The class records of each file are keyed by the hash of its blob and its
+        path, which gives the module names of its classes, so each version of
+        a file is parsed once in the run, even if a later commit restores it.
+        The folders are keyed by the hash of their trees, so only the folders
+        changed by a commit are read.
+
+    The ast backend is used by default. The files are parsed from the object
+        store, but astroid infers the modules they import from the files 
+        checked out in the path, not from the analyzed commit.
+    """
+
+    # Modes of the tree entries of folders and of regular files
+    _TREE_MODE = b'40000'
+    _FILE_MODES = (b'100644', b'100755')
+
+    def __init__(
+        self, path: str, backend: str = 'ast', parser_options: dict | None = None,
+        discovery: FileDiscovery | None = None, cache_dir: str | None = None,
+        engine: str = 'python'
+    ) -> None:
+
+        self.path = path
+        self.backend = backend
+        self.parser_options = parser_options
+        self.discovery = discovery if discovery is not None else FileDiscovery(path)
+        self.cache = ParseCache(cache_dir, backend, parser_options) if cache_dir else None
+        self.engine = engine
+
+        # Counters of the extraction, summed over the commits
+        self.stats: dict[str, int] = {}
+
+        # Files and subtrees of each folder of the previous commit, by tree 
+        # hash, whose older entries are dropped, and class records of each 
+        # version of the files of the run, by blob hash and path
+        self._tree_files: dict[str, tuple[list[tuple[str, str]], list[str]]] = {}
+        self._file_records: dict[tuple[str, str], list[dict]] = {}
+
+        # Whether each path is analyzed and its module name, by relative path
+        self._included: dict[str, bool] = {}
+        self._module_names: dict[str, str] = {}
+
+    def list_commits(self, revision_range: str) -> list[tuple[str, str, str]]:
+        """
+        Returns the commit hash, the tree hash and the committer date of each
+            commit of the revision range, from the oldest, following only the
+            first parent of the merges.
+        """
+        output = GitDiff.run_git(
+            self.path, 'log', '--reverse', '--first-parent', '--format=%H %T %cI',
+            revision_range, '--'
+        )
+        return [tuple(line.split(' ', 2)) for line in output.splitlines() if line]
+
+    @staticmethod
+    def _parse_tree(content: bytes, hash_size: int) -> Iterator[tuple[bytes, str, str]]:
+        """
+        Yields the mode, the name and the object hash of each entry of a tree.
+        """
+        i = 0
+        while i < len(content):
+            space = content.index(b' ', i)
+            end = content.index(b'\0', space)
+            yield (
+                content[i:space], content[space + 1:end].decode('utf-8', 'surrogateescape'),
+                content[end + 1:end + 1 + hash_size].hex()
+            )
+            i = end + 1 + hash_size
+
+    def _keep_tree(self, tree_id: str, tree_files: dict) -> None:
+        """
+        Keeps the files of a tree read in the previous commit, and the ones of
+            its subtrees, in tree_files.
+        """
+        to_keep = [tree_id]
+        while to_keep:
+            tree_id = to_keep.pop()
+            tree_files[tree_id] = self._tree_files[tree_id]
+            to_keep.extend(tree_files[tree_id][1])
+
+    def _list_tree_files(
+        self, reader: GitObjectReader, tree_id: str, tree_files: dict
+    ) -> list[tuple[str, str]]:
+        """
+        Returns the relative path and the blob hash of each file of a tree and
+            its subtrees, reading only the trees not read in the previous commit.
+            The files and the subtrees of the trees used are stored in 
+            tree_files.
+        """
+        if tree_id in tree_files:
+            return tree_files[tree_id][0]
+        if tree_id in self._tree_files:
+            self._keep_tree(tree_id, tree_files)
+            return tree_files[tree_id][0]
+
+        files = []
+        subtrees = []
+        _, content = reader.read(tree_id)
+        self.stats['history_trees_read'] = self.stats.get('history_trees_read', 0) + 1
+        for mode, name, object_id in self._parse_tree(content, len(tree_id) // 2):
+            if mode == self._TREE_MODE:
+                subtrees.append(object_id)
+                files.extend(
+                    (f'{name}/{file_path}', blob_id) for file_path, blob_id in
+                    self._list_tree_files(reader, object_id, tree_files)
+                )
+            # Symbolic links and submodules are not analyzed
+            elif mode in self._FILE_MODES:
+                files.append((name, object_id))
+        tree_files[tree_id] = (files, subtrees)
+        return files
+
+    def _get_folder_tree(
+        self, reader: GitObjectReader, tree_id: str, prefix: str
+    ) -> str | None:
+        """
+        Returns the tree of the analyzed folder, given by its prefix in the
+            repository, from the root tree of a commit, or None if the commit
+            does not have the folder.
+        """
+        for name in prefix.strip('/').split('/') if prefix.strip('/') else []:
+            _, content = reader.read(tree_id)
+            tree_id = next((
+                object_id for mode, entry_name, object_id in
+                self._parse_tree(content, len(tree_id) // 2)
+                if mode == self._TREE_MODE and entry_name == name
+            ), None)
+            if tree_id is None:
+                return None
+        return tree_id
+
+    def _is_included(self, relative_path: str) -> bool:
+        if relative_path not in self._included:
+            self._included[relative_path] = self.discovery.is_included(relative_path)
+        return self._included[relative_path]
+
+    def _get_file_records(
+        self, reader: GitObjectReader, blob_id: str, relative_path: str
+    ) -> list[dict]:
+        """
+        Returns the class records of a version of a file, parsing it only if
+            the blob was not parsed before in the run or cached.
+        """
+        key = (blob_id, relative_path)
+        records = self._file_records.get(key)
+        if records is None:
+            self.stats['history_files_parsed'] = \
+                self.stats.get('history_files_parsed', 0) + 1
+            if relative_path not in self._module_names:
+                self._module_names[relative_path] = NameResolver.get_module_name(
+                    self.path, os.path.join(self.path, relative_path)
+                )
+            _, content = reader.read(blob_id)
+            records = FolderParser.extract_content_records(
+                content, os.path.join(self.path, relative_path), self.cache,
+                self.backend, self.parser_options, self.stats, None,
+                self._module_names[relative_path]
+            )
+            self._file_records[key] = records
+        else:
+            self.stats['history_files_reused'] = \
+                self.stats.get('history_files_reused', 0) + 1
+        return records
+
+    def iter_results(self, revision_range: str) -> Iterator[tuple[str, str, dict, dict]]:
+        """
+        Yields the commit hash, the committer date and the class and method
+            results of each commit of the revision range, from the oldest.
+
+        The results of a commit that does not change the analyzed files are
+            the ones of the previous commit.
+        """
+        prefix = GitDiff.run_git(self.path, 'rev-parse', '--show-prefix').strip()
+        commits = self.list_commits(revision_range)
+
+        previous_files = None
+        results = ({}, {})
+        with GitObjectReader(self.path) as reader:
+            for commit_id, tree_id, date in commits:
+                self.stats['history_commits'] = self.stats.get('history_commits', 0) + 1
+                tree_files = {}
+                folder_tree = self._get_folder_tree(reader, tree_id, prefix)
+                files = [] if folder_tree is None else [
+                    (file_path, blob_id) for file_path, blob_id in
+                    self._list_tree_files(reader, folder_tree, tree_files)
+                    if self._is_included(file_path)
+                ]
+                self._tree_files = tree_files
+                files.sort(key=lambda file: FileDiscovery.get_order_key(file[0]))
+
+                if files != previous_files:
+                    parser = BaseCodeParser()
+                    for file_path, blob_id in files:
+                        parser.merge_class_records(
+                            self._get_file_records(reader, blob_id, file_path)
+                        )
+                    parser.process_possible_coupled_classes()
+                    results = Metrics.create(parser.classes, self.engine).calculate_all_metrics()
+                    previous_files = files
+                yield commit_id, date, *results
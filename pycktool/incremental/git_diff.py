@@ -0,0 +1,48 @@
+import os
+import subprocess
+
+from pycktool.parser.file_discovery import FileDiscovery
+
+class GitDiff:
+
+    @staticmethod
+    def run_git(path: str, *args: str) -> str:
+        """
+        Runs a git command in the given path and returns its output.
+        """
+        result = subprocess.run(
+            ['git', '-C', path, *args], capture_output=True, text=True, 
+            encoding='utf-8'
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f'git {args[0]} failed: {result.stderr.strip()}')
+        return result.stdout
+
+    @staticmethod
+    def changed_python_files(
+        path: str, revision_range: str, discovery: FileDiscovery | None = None
+    ) -> dict[str, bool]:
+        """
+        Returns the python files inside the given path that were added, 
+            modified or deleted in the revision range.
+
+        The files are relative to the given path, mapped to True if they were
+            deleted. Renamed files are reported as deleted and added. Only the
+            files that the file discovery would analyze are returned.
+        """
+        if discovery is None:
+            discovery = FileDiscovery(path)
+        output = GitDiff.run_git(
+            path, 'diff', '--name-status', '--no-renames', '--relative', '-z',
+            revision_range
+        )
+        fields = output.split('\0')
+
+        changed_files = {}
+        for status, file_path in zip(fields[0::2], fields[1::2]):
+            file_path = os.path.normpath(file_path)
+            # Excluded files are not analyzed by the folder parser
+            if not discovery.is_included(file_path):
+                continue
+            changed_files[file_path] = status == 'D'
+        return changed_files
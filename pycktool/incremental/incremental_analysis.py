@@ -0,0 +1,203 @@
+import os
+
+from pycktool.incremental.git_diff import GitDiff
+from pycktool.incremental.snapshot import Snapshot
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.parser.name_resolver import NameResolver
+from pycktool.parser.parse_cache import ParseCache
+
+class IncrementalAnalysis:
+
+    def __init__(
+        self, path: str, snapshot: Snapshot, cache_dir: str | None = None,
+        parser_options: dict | None = None, discovery: FileDiscovery | None = None,
+        engine: str = 'python', jobs: int = 1
+    ) -> None:
+
+        self.path = path
+        self.snapshot = snapshot
+        self.cache_dir = cache_dir
+        self.parser_options = parser_options
+        self.discovery = discovery if discovery is not None else FileDiscovery(path)
+        self.engine = engine
+        self.jobs = jobs
+        self.parser = BaseCodeParser()
+
+        # Class records of each file, by path relative to the analyzed folder
+        self.file_records: dict[str, list[dict]] = {}
+
+        # Metrics of the classes after the changes, created by the run
+        self.metrics: Metrics | None = None
+
+    def _get_importers(self, changed_files: dict[str, bool]) -> list[str]:
+        """
+        Returns the unchanged files of the snapshot that import any of the 
+            changed files, whose classes are inferred from them by astroid.
+        """
+        changed_paths = {
+            os.path.abspath(os.path.join(self.path, file_path)) 
+            for file_path in changed_files.keys()
+        }
+        # Names of the changed modules, without which a file can not import them
+        module_names = {
+            os.path.basename(os.path.dirname(file_path)) 
+            if os.path.basename(file_path) == '__init__.py' 
+            else os.path.splitext(os.path.basename(file_path))[0]
+            for file_path in changed_paths
+        }
+        module_names = [module_name.encode('utf-8') for module_name in module_names]
+
+        importers = []
+        for file_path in self.snapshot.files.keys() - changed_files.keys():
+            absolute_path = os.path.join(self.path, file_path)
+            try:
+                with open(absolute_path, 'rb') as file:
+                    content = file.read()
+            except OSError:
+                continue
+            if not any(module_name in content for module_name in module_names):
+                continue
+            imported_files = ParseCache.get_imported_files(
+                content, absolute_path, NameResolver.get_module_name(self.path, absolute_path)
+            )
+            if not changed_paths.isdisjoint(imported_files):
+                importers.append(file_path)
+        return sorted(importers)
+
+    def _update_file_records(self, changed_files: dict[str, bool]) -> set[str]:
+        """
+        Parses the changed files again and replaces their records in the 
+            snapshot records. With the astroid backend, the files that import 
+            the changed files are parsed again too. Returns the names of the 
+            classes with records in the parsed files, before or after the 
+            change.
+        """
+        if self.snapshot.backend == 'astroid' and changed_files:
+            changed_files = {
+                **changed_files, 
+                **dict.fromkeys(self._get_importers(changed_files), False)
+            }
+
+        self.file_records = dict(self.snapshot.files)
+        changed_classes = set()
+        for file_path in changed_files.keys():
+            old_records = self.file_records.pop(file_path, [])
+            changed_classes.update(record['name'] for record in old_records)
+
+        fp = FolderParser(
+            self.path, self.jobs, self.cache_dir, keep_file_records=True, 
+            backend=self.snapshot.backend, parser_options=self.parser_options, 
+            discovery=self.discovery
+        )
+        file_records = fp.extract_files_records(
+            os.path.join(self.path, file_path) 
+            for file_path, deleted in changed_files.items() if not deleted
+        )
+        BaseCodeParser.add_stats(self.parser.stats, fp.parser.stats)
+        for absolute_path, records in file_records.items():
+            self.file_records[os.path.relpath(absolute_path, self.path)] = records
+            changed_classes.update(record['name'] for record in records)
+
+        return changed_classes
+
+    @staticmethod
+    def _get_changed_edges(
+        classes: dict[str, Class], old_edges: dict[str, list[str]], new_edges: dict
+    ) -> tuple[set[str], set[str]]:
+        """
+        Compares the old and new edges of each class. Returns the classes 
+            whose edges changed and the targets of the added or removed edges.
+        """
+        changed_sources = set()
+        changed_targets = set()
+        for class_name in classes.keys():
+            old = set(old_edges.get(class_name, ()))
+            new = new_edges[class_name]
+            if old != new:
+                changed_sources.add(class_name)
+                changed_targets.update(old ^ new)
+        for class_name in old_edges.keys() - classes.keys():
+            changed_targets.update(old_edges[class_name])
+        return changed_sources, changed_targets
+
+    @staticmethod
+    def _get_descendants(classes: dict[str, Class], class_names: set[str]) -> set[str]:
+        """
+        Returns the given classes and all the classes that inherit from them.
+        """
+        children = {}
+        for class_obj in classes.values():
+            for parent_name in class_obj.get_all_parent_names():
+                children.setdefault(parent_name, []).append(class_obj.name)
+
+        descendants = set()
+        to_visit = list(class_names)
+        while to_visit:
+            class_name = to_visit.pop()
+            if class_name not in descendants:
+                descendants.add(class_name)
+                to_visit.extend(children.get(class_name, ()))
+        return descendants
+
+    def run(self, revision_range: str) -> tuple[dict, dict]:
+        """
+        Analyzes the files changed in the git revision range again, and 
+            recalculates only the metrics affected by the changes.
+
+        Class level metrics are recalculated for the classes with records in 
+            the changed files. Cross-class metrics (FIN, FOUT, CBO, NOC and DIT)
+            are recalculated for the classes whose coupling or inheritance 
+            changed, and for the classes on the other side of those changes.
+
+        Returns:
+            tuple: The class and method results, as calculate_all_metrics.
+        """
+        changed_files = GitDiff.changed_python_files(
+            self.path, revision_range, self.discovery
+        )
+        changed_classes = self._update_file_records(changed_files)
+
+        for records in self.file_records.values():
+            self.parser.merge_class_records(records)
+        self.parser.process_possible_coupled_classes()
+        classes = self.parser.classes
+
+        coupled_sources, coupled_targets = self._get_changed_edges(
+            classes, self.snapshot.coupled_classes,
+            {name: class_obj.coupled_classes for name, class_obj in classes.items()}
+        )
+        inheritance_sources, inheritance_targets = self._get_changed_edges(
+            classes, self.snapshot.parents,
+            {name: class_obj.get_all_parent_names() for name, class_obj in classes.items()}
+        )
+        coupling_changed = coupled_sources | coupled_targets
+        dit_changed = self._get_descendants(classes, inheritance_sources)
+
+        metrics = self.metrics = Metrics.create(classes, self.engine)
+        old_classes_results = self.snapshot.classes_results
+        old_methods_results = self.snapshot.methods_results
+        classes_results = {}
+        methods_results = {}
+        for class_name, class_obj in classes.items():
+            if class_name in changed_classes or class_name not in old_classes_results:
+                classes_results[class_name] = metrics.get_class_metrics(class_name)
+                methods_results[class_name] = metrics.get_method_metrics(class_name)
+                continue
+
+            results = dict(old_classes_results[class_name])
+            if class_name in coupling_changed:
+                results['FIN'] = metrics.get_fan_in(class_name)
+                results['FOUT'] = Metrics.fan_out(class_obj)
+                results['CBO'] = metrics.get_coupling_between_classes(class_name)
+            if class_name in inheritance_targets:
+                results['NOC'] = metrics.get_number_of_children(class_name)
+            if class_name in dit_changed:
+                results['DIT'] = metrics.get_depth_of_inheritance_tree(class_name)
+            classes_results[class_name] = results
+            methods_results[class_name] = old_methods_results[class_name]
+
+        return classes_results, methods_results
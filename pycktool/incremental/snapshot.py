@@ -0,0 +1,88 @@
+import os
+import json
+
+from pycktool import __version__
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.model.class_model import Class
+
+class Snapshot:
+
+    def __init__(
+        self, files: dict[str, list[dict]], classes_results: dict, 
+        methods_results: dict, coupled_classes: dict[str, list[str]],
+        parents: dict[str, list[str]], backend: str = 'astroid'
+    ) -> None:
+
+        # Class records extracted from each file, by path relative to the
+        # analyzed folder, before the possible coupled classes are processed
+        self.files = files
+        self.classes_results = classes_results
+        self.methods_results = methods_results
+
+        # Resolved coupling and inheritance of each class
+        self.coupled_classes = coupled_classes
+        self.parents = parents
+
+        # Parser backend used to extract the class records
+        self.backend = backend
+
+    @staticmethod
+    def from_analysis(
+        path: str, file_records: dict[str, list[dict]], classes: dict[str, Class],
+        classes_results: dict, methods_results: dict, backend: str = 'astroid'
+    ) -> 'Snapshot':
+        """
+        Creates a snapshot from the data of an analysis of the given path.
+        """
+        files = {
+            os.path.normpath(os.path.relpath(file_path, path)): records
+            for file_path, records in file_records.items()
+        }
+        coupled_classes = {
+            class_name: sorted(class_obj.coupled_classes)
+            for class_name, class_obj in classes.items()
+        }
+        parents = {
+            class_name: [parent.name for parent in class_obj.parents]
+            for class_name, class_obj in classes.items()
+        }
+        return Snapshot(
+            files, classes_results, methods_results, coupled_classes, parents, 
+            backend
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Saves the snapshot to a JSON file.
+        """
+        data = {
+            'version': __version__,
+            'records_version': BaseCodeParser.RECORDS_VERSION,
+            'backend': self.backend,
+            'files': self.files,
+            'classes_results': self.classes_results,
+            'methods_results': self.methods_results,
+            'coupled_classes': self.coupled_classes,
+            'parents': self.parents,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+    @staticmethod
+    def load(path: str) -> 'Snapshot':
+        """
+        Loads a snapshot from a JSON file. Raises a ValueError if the snapshot
+            was created by another version of PyCKTool.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get('version') != __version__ or \
+           data.get('records_version') != BaseCodeParser.RECORDS_VERSION:
+            raise ValueError(
+                f'Snapshot {path} was created by another version of PyCKTool'
+            )
+        return Snapshot(
+            data['files'], data['classes_results'], data['methods_results'],
+            data['coupled_classes'], data['parents'], data['backend']
+        )
@@ -1,3 +1,5 @@
+from itertools import chain
+from typing import Iterable, Iterator
 
 from pycktool.model.class_model import Class
 from pycktool.model.method_model import Method
@@ -9,6 +11,44 @@ class Metrics:
     def __init__(self, classes_data: dict[str, Class]) -> None:
         self._classes_data = classes_data
 
+        # Number of classes coupled to and inheriting from each class
+        self._fan_in_index: dict[str, int] = {}
+        self._children_index: dict[str, int] = {}
+        self._build_reverse_indexes()
+
+        # DIT of each class by object id, and the circular inheritances found
+        self._depths, self.inheritance_cycles = \
+            self.calculate_depths_of_inheritance_tree(classes_data.values())
+
+    @staticmethod
+    def create(classes_data: dict[str, Class], engine: str = 'python') -> 'Metrics':
+        """
+        Creates the metrics of the dataset with the given engine. The python
+            engine calculates the metrics one class at a time, and the numpy
+            engine calculates them for all the classes at once with NumPy,
+            which is only imported if its engine is used.
+        """
+        if engine == 'python':
+            return Metrics(classes_data)
+        if engine == 'numpy':
+            from pycktool.metrics.numpy_metrics import NumpyMetrics
+            return NumpyMetrics(classes_data)
+        raise ValueError(f'Unknown metrics engine: {engine}')
+
+    def _build_reverse_indexes(self) -> None:
+        """
+        Builds the reverse coupling and inheritance indexes of the dataset in 
+            one pass, so FIN, NOC and CBO are calculated without scanning all 
+            the classes for each class.
+        """
+        for class_obj in self._classes_data.values():
+            for coupled_class in class_obj.coupled_classes:
+                self._fan_in_index[coupled_class] = \
+                    self._fan_in_index.get(coupled_class, 0) + 1
+            for parent_name in class_obj.get_all_parent_names():
+                self._children_index[parent_name] = \
+                    self._children_index.get(parent_name, 0) + 1
+
     def calculate_class_metrics(self) -> dict:
         """
         Calculate metrics for each class in the dataset.
@@ -26,25 +66,34 @@ class Metrics:
             Number of Attributes (NOA)
             Number of Methods (NOM)
         """
-        results = {}
-    
-        for class_name in self._classes_data.keys():
-            class_data = self._classes_data[class_name]
-            results[class_name] = {
-                'WMC': self.wheighted_methods_per_class(class_data),
-                'DIT': self.depth_of_inheritance_tree(class_data),
-                'NOC': self.number_of_children(class_name, self._classes_data),
-                'FIN': self.fan_in(class_name, self._classes_data),
-                'FOUT': self.fan_out(class_data),
-                'CBO': self.coupling_between_classes(class_name, self._classes_data),
-                'RFC': self.response_for_class(class_data),
-                'LCOM': self.lack_of_cohesion_4(class_data),
-                'LLOC': self.logical_lines_of_code(class_data),
-                'NOA': self.number_of_attributes(class_data),
-                'NOM': self.number_of_methods(class_data),
-            }
+        return dict(self.iter_class_metrics())
 
-        return results
+    def iter_class_metrics(self) -> Iterator[tuple[str, dict]]:
+        """
+        Yields the name and the metrics of each class of the dataset, 
+            calculating them one class at a time.
+        """
+        for class_name in self._classes_data.keys():
+            yield class_name, self.get_class_metrics(class_name)
+
+    def get_class_metrics(self, class_name: str) -> dict:
+        """
+        Calculate the metrics of a single class of the dataset.
+        """
+        class_data = self._classes_data[class_name]
+        return {
+            'WMC': self.wheighted_methods_per_class(class_data),
+            'DIT': self.get_depth_of_inheritance_tree(class_name),
+            'NOC': self.get_number_of_children(class_name),
+            'FIN': self.get_fan_in(class_name),
+            'FOUT': self.fan_out(class_data),
+            'CBO': self.get_coupling_between_classes(class_name),
+            'RFC': self.response_for_class(class_data),
+            'LCOM': self.lack_of_cohesion_4(class_data),
+            'LLOC': self.logical_lines_of_code(class_data),
+            'NOA': self.number_of_attributes(class_data),
+            'NOM': self.number_of_methods(class_data),
+        }
 
     def calculate_method_metrics(self) -> dict:
         """
@@ -56,18 +105,27 @@ class Metrics:
             Number of Parameters (NOP)
             Logical Lines of Code (LLOC)
         """
-        results = {}
-        for class_name in self._classes_data.keys():
-            results[class_name] = dict()
-    
+        return dict(self.iter_method_metrics())
+
+    def iter_method_metrics(self) -> Iterator[tuple[str, dict]]:
+        """
+        Yields the name of each class of the dataset and the metrics of its 
+            methods, calculating them one class at a time.
+        """
         for class_name in self._classes_data.keys():
-            for method in self._classes_data[class_name].methods.keys():
-                method_data = self._classes_data[class_name].methods[method]
-                results[class_name][method] = {
-                    'LLOC': self.logical_lines_of_code(method_data),
-                    'NOP': self.number_of_parameters(method_data),
-                }
+            yield class_name, self.get_method_metrics(class_name)
 
+    def get_method_metrics(self, class_name: str) -> dict:
+        """
+        Calculate the metrics of each method of a single class of the dataset.
+        """
+        results = {}
+        for method in self._classes_data[class_name].methods.keys():
+            method_data = self._classes_data[class_name].methods[method]
+            results[method] = {
+                'LLOC': self.logical_lines_of_code(method_data),
+                'NOP': self.number_of_parameters(method_data),
+            }
         return results
 
     def calculate_all_metrics(self) -> None:
@@ -79,6 +137,36 @@ class Metrics:
         """
         return self.calculate_class_metrics(), self.calculate_method_metrics()
 
+    def get_depth_of_inheritance_tree(self, class_name: str) -> int | str:
+        """
+        Gets the depth of the inheritance tree (DIT) of a class of the dataset,
+            calculated for all the classes at once.
+        """
+        return self._depths[id(self._classes_data[class_name])]
+
+    def get_number_of_children(self, class_name: str) -> int:
+        """
+        Gets the number of children (NOC) of a class of the dataset from the
+            reverse inheritance index.
+        """
+        return self._children_index.get(class_name, 0)
+
+    def get_fan_in(self, class_name: str) -> int:
+        """
+        Gets the fan in (FIN) of a class of the dataset from the reverse 
+            coupling index.
+        """
+        return self._fan_in_index.get(class_name, 0)
+
+    def get_coupling_between_classes(self, class_name: str) -> int:
+        """
+        Gets the coupling between classes (CBO) of a class of the dataset, using
+            the reverse coupling index for the fan in.
+        """
+        return \
+            self.get_fan_in(class_name) + \
+            self.fan_out(self._classes_data[class_name])
+
     @staticmethod
     def wheighted_methods_per_class(class_obj: Class) -> list:
         """
@@ -93,32 +181,72 @@ class Metrics:
         return wmc
 
     @staticmethod
-    def depth_of_inheritance_tree(class_obj: Class) -> int:
+    def depth_of_inheritance_tree(class_obj: Class) -> int | str:
         """
         Calculates the depth of the inheritance tree (DIT) of the given class.
 
         The depth is the number of superclasses until the root of the 
             inheritance tree is reached.
+        If the class inherits from a circular inheritance, 'Circular' is 
+            returned.
         """
-        try:
-            return Metrics.depth_of_inheritance_tree_recursive(class_obj, 0)
-        except RecursionError:
-            # Maximum recursion depth exceeded. Probably a circular inheritance
-            return 'Circular'
-    
+        depths, _ = Metrics.calculate_depths_of_inheritance_tree([class_obj])
+        return depths[id(class_obj)]
+
     @staticmethod
-    def depth_of_inheritance_tree_recursive(class_obj: Class, depth: int) -> int:
-        """
-        Recursive function to calculate DIT, with an additional parameter to 
-            keep track of the depth.
-        """
-        if len(class_obj.parents) == 0:
-            return depth
-        new_depth = max(
-            Metrics.depth_of_inheritance_tree_recursive(parent, depth + 1) 
-            for parent in class_obj.parents
-        )
-        return new_depth
+    def calculate_depths_of_inheritance_tree(
+        classes: Iterable[Class]
+    ) -> tuple[dict[int, int | str], list[list[str]]]:
+        """
+        Calculates the DIT of the given classes and all their superclasses in 
+            one iterative pass over the inheritance graph. The DIT of each 
+            class is calculated once, even if it is shared by many hierarchies.
+
+        Returns:
+            tuple: The DIT of each class by the id of the class object, and the 
+                names of the classes of each circular inheritance found.
+        """
+        depths = {}
+        cycles = []
+        circular = set()
+
+        for class_obj in classes:
+            if id(class_obj) in depths:
+                continue
+
+            # Stack of the classes being visited, with their parents not yet 
+            # visited, and the position of each class in the stack
+            stack = [(class_obj, iter(class_obj.parents))]
+            stack_positions = {id(class_obj): 0}
+            while stack:
+                current, parents = stack[-1]
+                parent = next(parents, None)
+
+                if parent is None:
+                    # All the parents were visited, so the depth is known
+                    stack.pop()
+                    del stack_positions[id(current)]
+                    # Parents without a depth are still in the stack, in a cycle
+                    parents_depths = [
+                        depths.get(id(parent), 'Circular') for parent in current.parents
+                    ]
+                    if id(current) in circular or 'Circular' in parents_depths:
+                        depths[id(current)] = 'Circular'
+                    else:
+                        depths[id(current)] = max(parents_depths, default=-1) + 1
+
+                elif id(parent) in stack_positions:
+                    # The parent is still being visited, so it is an ancestor 
+                    # of itself. All classes in the stack above it are in the cycle
+                    cycle = [item[0] for item in stack[stack_positions[id(parent)]:]]
+                    circular.update(id(cycle_class) for cycle_class in cycle)
+                    cycles.append([cycle_class.name for cycle_class in cycle])
+
+                elif id(parent) not in depths:
+                    stack_positions[id(parent)] = len(stack)
+                    stack.append((parent, iter(parent.parents)))
+
+        return depths, cycles
     
     @staticmethod
     def number_of_children(class_name: str, all_classes: dict[str, Class]) -> int:
@@ -174,53 +302,45 @@ class Metrics:
         
         1 is good, 0 and >= 2 is bad.
         """
-        attributes = map(lambda y: y[0], class_obj.attributes)
+        attributes = {attribute[0] for attribute in class_obj.attributes}
         methods = class_obj.methods.keys()
 
         if len(methods) == 0 or \
            len(methods) == 1 and list(methods)[0] == '__init__':
             return 0
-    
-        # Instantiate vertices and edges
-        vertices = list(set(attributes).union(methods))
-        edges = []
-        for _ in range(len(vertices)):
-            edges.append([0 for _ in range(len(vertices))])
-            
-        # Fill edges
-        for method in class_obj.methods.values():
-            for attribute in method.accessed_attributes:
-                if attribute in vertices:
-                    edges[vertices.index(attribute)][vertices.index(method.name)] = 1
-                    edges[vertices.index(method.name)][vertices.index(attribute)] = 1
-            for called_method in method.called:
-                if called_method in vertices:
-                    edges[vertices.index(called_method)][vertices.index(method.name)] = 1
-                    edges[vertices.index(method.name)][vertices.index(called_method)] = 1
 
-        # Compute clusters
-        return Metrics.count_connected_components(edges)
-        
-    @staticmethod
-    def dfs(node, visited, edges):
-        visited[node] = True
-        for neighbor, is_connected in enumerate(edges[node]):
-            if is_connected and not visited[neighbor]:
-                Metrics.dfs(neighbor, visited, edges)
+        # Each vertex starts in its own cluster, represented by a root vertex
+        roots = {vertex: vertex for vertex in attributes.union(methods)}
 
-    @staticmethod
-    def count_connected_components(edges):
-
-        visited = [False] * len(edges)
-        connected_components = 0
+        # Join the clusters of the vertices connected by an edge
+        for method_name, method in class_obj.methods.items():
+            for used in chain(method.accessed_attributes, method.called):
+                if used in roots:
+                    Metrics._join_clusters(roots, used, method_name)
 
-        for node in range(len(edges)):
-            if not visited[node]:
-                connected_components += 1
-                Metrics.dfs(node, visited, edges)
+        # Compute clusters
+        return sum(1 for vertex, root in roots.items() if vertex == root)
 
-        return connected_components
+    @staticmethod
+    def _find_root(roots: dict[str, str], vertex: str) -> str:
+        """
+        Finds the root vertex of the cluster of the given vertex, shortening
+            the path to the root along the way.
+        """
+        while roots[vertex] != vertex:
+            roots[vertex] = roots[roots[vertex]]
+            vertex = roots[vertex]
+        return vertex
 
+    @staticmethod
+    def _join_clusters(roots: dict[str, str], vertex_1: str, vertex_2: str) -> None:
+        """
+        Joins the clusters of two vertices.
+        """
+        root_1 = Metrics._find_root(roots, vertex_1)
+        root_2 = Metrics._find_root(roots, vertex_2)
+        if root_1 != root_2:
+            roots[root_1] = root_2
 
     @staticmethod
     def fan_in(class_name: str, all_classes: dict[str, Class]) -> float:
@@ -0,0 +1,195 @@
+from itertools import chain, repeat
+from operator import attrgetter
+from typing import Iterable
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+
+class NumpyMetrics(Metrics):
+    """
+    Metrics calculated for all the classes at once with NumPy, with the same
+        results of Metrics.
+
+    The classes are numbered, and the model is turned into integer arrays:
+        the LLOC of the methods, contiguous by class, and the edges of the
+        coupling, of the inheritance and of the LCOM graph of each class. WMC
+        is a segment sum of the method LLOCs, FIN and NOC are counts of the
+        edge targets, kept in the reverse indexes of Metrics, so the getters
+        of Metrics use them, and the LCOM clusters are the connected components of
+        the graphs of all the classes, found together. DIT and RFC are
+        calculated one class at a time.
+
+    NumPy is an optional dependency, installed with the numpy extra.
+    """
+
+    # Class metrics, in the order of the results of Metrics
+    CLASS_METRICS = [
+        'WMC', 'DIT', 'NOC', 'FIN', 'FOUT', 'CBO', 'RFC', 'LCOM', 'LLOC', 'NOA', 'NOM'
+    ]
+
+    def __init__(self, classes_data: dict[str, Class]) -> None:
+        np = self._import_numpy()
+
+        self._class_indexes = dict(zip(classes_data.keys(), range(len(classes_data))))
+        # Builds the reverse indexes with NumPy and the depths of the classes
+        super().__init__(classes_data)
+        classes = list(classes_data.values())
+        number_of_classes = len(classes)
+
+        nom = self._count(np, map(len, map(attrgetter('methods'), classes)), number_of_classes)
+        methods = chain.from_iterable(map(dict.values, map(attrgetter('methods'), classes)))
+        method_lloc = self._count(np, map(attrgetter('lloc'), methods), int(nom.sum()))
+        # Sum of the LLOC of the methods of each class, whose methods are
+        # contiguous in the method array
+        lloc_sums = np.concatenate(([0], np.cumsum(method_lloc)))
+        method_ends = np.cumsum(nom)
+        wmc = lloc_sums[method_ends] - lloc_sums[method_ends - nom]
+
+        fout = self._count(
+            np, map(len, map(attrgetter('coupled_classes'), classes)), number_of_classes
+        )
+
+        columns = {
+            'WMC': wmc.tolist(),
+            'DIT': [self._depths[id(class_obj)] for class_obj in classes],
+            'NOC': self._noc.tolist(),
+            'FIN': self._fin.tolist(),
+            'FOUT': fout.tolist(),
+            'CBO': (self._fin + fout).tolist(),
+            'RFC': [
+                len(class_obj.methods) + len(class_obj.called) + len(set().union(
+                    *map(attrgetter('called'), class_obj.methods.values())
+                ))
+                for class_obj in classes
+            ],
+            'LCOM': self._calculate_lack_of_cohesion(np, classes).tolist(),
+            'LLOC': list(map(attrgetter('lloc'), classes)),
+            'NOA': list(map(len, map(attrgetter('attributes'), classes))),
+            'NOM': nom.tolist(),
+        }
+        self._class_rows = list(zip(*(columns[metric] for metric in self.CLASS_METRICS)))
+
+    @staticmethod
+    def _import_numpy():
+        """
+        Imports NumPy, with instructions to install it if it is not installed.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                'The numpy metrics engine requires numpy. '
+                'Install it with: pip install pycktool[numpy]'
+            )
+        return numpy
+
+    def _build_reverse_indexes(self) -> None:
+        """
+        Builds the reverse coupling and inheritance indexes of the dataset, 
+            counting the targets of the edges of all the classes at once.
+        """
+        np = self._import_numpy()
+        classes = self._classes_data.values()
+        self._fin = self._count_targets(np, map(attrgetter('coupled_classes'), classes))
+        self._noc = self._count_targets(np, map(Class.get_all_parent_names, classes))
+        self._fan_in_index = dict(zip(self._classes_data.keys(), self._fin.tolist()))
+        self._children_index = dict(zip(self._classes_data.keys(), self._noc.tolist()))
+
+    @staticmethod
+    def _count(np, values: Iterable[int], count: int):
+        return np.fromiter(values, dtype=np.int64, count=count)
+
+    def _count_targets(self, np, names_of_classes: Iterable[Iterable[str]]):
+        """
+        Counts how many times each class is the target of an edge, given by
+            the names of the targets of each class. Targets that are not
+            classes of the dataset are ignored.
+        """
+        targets = np.fromiter(map(
+            self._class_indexes.get, chain.from_iterable(names_of_classes), repeat(-1)
+        ), dtype=np.int64)
+        return np.bincount(targets[targets >= 0], minlength=len(self._class_indexes))
+
+    @staticmethod
+    def _find_components(np, number_of_vertices: int, sources, targets):
+        """
+        Returns the label of the connected component of each vertex of a graph,
+            which is the lowest vertex of the component. Each round joins the
+            vertices of each edge to their lowest label, and shortens the
+            paths between the labels, until the labels are stable.
+        """
+        labels = np.arange(number_of_vertices, dtype=np.int64)
+        while True:
+            lowest = np.minimum(labels[sources], labels[targets])
+            np.minimum.at(labels, labels[sources], lowest)
+            np.minimum.at(labels, labels[targets], lowest)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels[sources], labels[targets]):
+                return labels
+
+    def _calculate_lack_of_cohesion(self, np, classes: list[Class]):
+        """
+        Calculates the LCOM of all the classes, as the connected components of
+            a graph with the methods and attributes of all the classes as
+            vertices, and the uses between the members of each class as edges.
+            The members used by the methods of each class are found with set
+            intersections, and the components of all the classes are found
+            together.
+        """
+        vertex_counts = []
+        method_vertices = []
+        used_counts = []
+        used_vertices = []
+        number_of_vertices = 0
+        for class_obj in classes:
+            methods = class_obj.methods
+            # Classes without methods, or with only __init__, have no clusters
+            if len(methods) == 0 or len(methods) == 1 and '__init__' in methods:
+                vertex_counts.append(0)
+                continue
+
+            members = {attribute[0] for attribute in class_obj.attributes}
+            members.update(methods)
+            vertices = dict(zip(
+                members, range(number_of_vertices, number_of_vertices + len(members))
+            ))
+            number_of_vertices += len(members)
+            vertex_counts.append(len(members))
+
+            # Members accessed or called by each method of the class
+            used = list(map(
+                set.union,
+                map(members.intersection, map(attrgetter('accessed_attributes'), methods.values())),
+                map(members.intersection, map(attrgetter('called'), methods.values()))
+            ))
+            method_vertices.extend(map(vertices.__getitem__, methods))
+            used_counts.extend(map(len, used))
+            used_vertices.extend(map(vertices.__getitem__, chain.from_iterable(used)))
+
+        sources = np.repeat(np.array(method_vertices, dtype=np.int64), used_counts)
+        targets = np.array(used_vertices, dtype=np.int64)
+        labels = self._find_components(np, number_of_vertices, sources, targets)
+        vertex_classes = np.repeat(np.arange(len(classes)), vertex_counts)
+        # Each cluster is counted once, in the class of its lowest vertex
+        roots = labels == np.arange(number_of_vertices)
+        return np.bincount(vertex_classes[roots], minlength=len(classes))
+
+    def get_class_metrics(self, class_name: str) -> dict:
+        """
+        Gets the metrics of a single class of the dataset, calculated for all
+            the classes at once.
+        """
+        return dict(zip(self.CLASS_METRICS, self._class_rows[self._class_indexes[class_name]]))
+
+    def get_method_metrics(self, class_name: str) -> dict:
+        """
+        Gets the metrics of each method of a single class of the dataset.
+        """
+        return {
+            method_name: {'LLOC': method.lloc, 'NOP': method.number_of_parameters}
+            for method_name, method in self._classes_data[class_name].methods.items()
+        }
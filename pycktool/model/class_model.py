@@ -1,8 +1,15 @@
+from sys import intern
+
 from pycktool.model.method_model import Method
 from pycktool.model.model import Model
 
 class Class(Model):
 
+    __slots__ = (
+        'file', 'methods', 'attributes', 'variables', 'coupled_classes', 
+        'possible_coupled_classes', 'parents'
+    )
+
     def __init__(self, name: str, file: str = ''):
 
         super().__init__(name)
@@ -17,17 +24,24 @@ class Class(Model):
 
     def add_coupled_class(self, coupled_to: str) -> None:
         if coupled_to != self.name:
-            self.coupled_classes.add(coupled_to)
+            self.coupled_classes.add(intern(coupled_to))
 
     def process_possible_coupled_classes(
-            self, all_classes: set, cleanup: bool = True
+            self, all_classes: set, cleanup: bool = True, resolver=None
         ) -> None:
         """
         Process the possible coupled classes for this class.
+
+        If a NameResolver is given, the possible coupled classes that are not 
+            in all classes are resolved by it.
         """
         for possible_coupled_class in self.possible_coupled_classes:
             if possible_coupled_class in all_classes:
                 self.add_coupled_class(possible_coupled_class)
+            elif resolver is not None:
+                resolved = resolver.resolve(possible_coupled_class)
+                if resolved is not None:
+                    self.add_coupled_class(resolved)
 
         if cleanup:
             self.possible_coupled_classes = set()
@@ -36,4 +50,62 @@ class Class(Model):
         """
         Returns a set of all the names of the parent classes of this class.
         """
-        return {parent.name for parent in self.parents}
\ No newline at end of file
+        return {parent.name for parent in self.parents}
+
+    def merge(self, other: 'Class') -> None:
+        """
+        Merges the data extracted for the same class in another run of the
+            parser into this class. Parents are not merged, since they must
+            be linked to the classes of the parser that owns this class.
+        """
+        # Only classes defined in a file have a file, placeholders created 
+        # from inheritance data keep the previously extracted values
+        if other.file:
+            self.file = other.file
+            self.lloc = other.lloc
+
+        self.methods.update(other.methods)
+        self.called.update(other.called)
+        self.accessed_attributes.update(other.accessed_attributes)
+        self.attributes.update(other.attributes)
+        self.variables.update(other.variables)
+        self.coupled_classes.update(other.coupled_classes)
+        self.possible_coupled_classes.update(other.possible_coupled_classes)
+
+    def to_record(self) -> dict:
+        """
+        Returns a compact and picklable representation of this class. Parents
+            are represented by their names.
+        """
+        record = super().to_record()
+        record.update({
+            'file': self.file,
+            'methods': [method.to_record() for method in self.methods.values()],
+            'attributes': [list(attribute) for attribute in self.attributes],
+            'variables': list(self.variables),
+            'coupled_classes': list(self.coupled_classes),
+            'possible_coupled_classes': list(self.possible_coupled_classes),
+            'parents': [parent.name for parent in self.parents],
+        })
+        return record
+
+    @staticmethod
+    def from_record(record: dict) -> 'Class':
+        """
+        Creates a class from a record created by to_record. Parents are not 
+            linked, since they are only known by name in the record.
+        """
+        class_obj = Class(record['name'], record['file'])
+        class_obj._load_record(record)
+        for method_record in record['methods']:
+            method = Method.from_record(method_record)
+            class_obj.methods[method.name] = method
+        class_obj.attributes = {
+            (intern(name), intern(type_name) if type_name is not None else None)
+            for name, type_name in record['attributes']
+        }
+        class_obj.variables = Class.intern_all(record['variables'])
+        class_obj.coupled_classes = Class.intern_all(record['coupled_classes'])
+        class_obj.possible_coupled_classes = \
+            Class.intern_all(record['possible_coupled_classes'])
+        return class_obj
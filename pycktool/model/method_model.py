@@ -3,8 +3,28 @@ from pycktool.model.model import Model
 
 class Method(Model):
 
+    __slots__ = ('number_of_parameters',)
+
     def __init__(self, name: str):
         
         super().__init__(name)
 
-        self.number_of_parameters: int = 0
\ No newline at end of file
+        self.number_of_parameters: int = 0
+
+    def to_record(self) -> dict:
+        """
+        Returns a compact and picklable representation of this method.
+        """
+        record = super().to_record()
+        record['number_of_parameters'] = self.number_of_parameters
+        return record
+
+    @staticmethod
+    def from_record(record: dict) -> 'Method':
+        """
+        Creates a method from a record created by to_record.
+        """
+        method = Method(record['name'])
+        method._load_record(record)
+        method.number_of_parameters = record['number_of_parameters']
+        return method
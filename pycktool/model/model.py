@@ -1,10 +1,43 @@
+from sys import intern
+from typing import Iterable
 
 class Model():
 
+    # Slots instead of a dictionary of attributes, since there is one model 
+    # for each class and method of the analyzed code
+    __slots__ = ('name', 'called', 'accessed_attributes', 'lloc')
+
     def __init__(self, name: str):
 
-        self.name: str = name
+        self.name: str = intern(name)
 
         self.called: set = set()
         self.accessed_attributes: set = set()
-        self.lloc: int = 0
\ No newline at end of file
+        self.lloc: int = 0
+
+    def to_record(self) -> dict:
+        """
+        Returns a compact and picklable representation of this model.
+        """
+        return {
+            'name': self.name,
+            'called': list(self.called),
+            'accessed_attributes': list(self.accessed_attributes),
+            'lloc': self.lloc,
+        }
+
+    @staticmethod
+    def intern_all(names: Iterable[str]) -> set[str]:
+        """
+        Returns a set of the interned given names, so the same name is stored 
+            only once in all the models.
+        """
+        return {intern(name) for name in names}
+
+    def _load_record(self, record: dict) -> None:
+        """
+        Loads the data of a record created by to_record into this model.
+        """
+        self.called = self.intern_all(record['called'])
+        self.accessed_attributes = self.intern_all(record['accessed_attributes'])
+        self.lloc = record['lloc']
@@ -0,0 +1,101 @@
+from typing import Iterable
+
+class ColumnarOutput:
+    """
+    Saves the results of the metrics extraction in the typed columnar formats 
+        of Apache Arrow: Parquet files or Arrow IPC files.
+
+    The tables have a fixed schema, with the repository, file, class and 
+        method (for the methods table) string columns followed by one int64 
+        column for each metric. Values that are not integers, like the 
+        'Circular' DIT, are stored as nulls. pyarrow is an optional dependency, 
+        only imported when a columnar format is used.
+    """
+
+    CLASS_METRICS = [
+        'WMC', 'DIT', 'NOC', 'FIN', 'FOUT', 'CBO', 'RFC', 'LCOM', 'LLOC', 'NOA', 'NOM'
+    ]
+
+    METHOD_METRICS = ['LLOC', 'NOP']
+
+    # Number of rows written at once, as a record batch or row group
+    _BATCH_SIZE = 65536
+
+    @staticmethod
+    def _import_pyarrow():
+        """
+        Imports pyarrow, raising an error with the installation instructions if
+            it is not installed.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(
+                'The parquet and arrow formats require pyarrow. '
+                'Install it with: pip install pycktool[columnar]'
+            )
+        return pyarrow
+
+    @staticmethod
+    def get_schema(key_names: list[str], metric_names: list[str]):
+        """
+        Returns the schema of a results table with the given key columns, 
+            besides the repository and the file, and metrics columns.
+        """
+        pa = ColumnarOutput._import_pyarrow()
+        return pa.schema(
+            [
+                pa.field('repository', pa.string(), nullable=False),
+                pa.field('file', pa.string()),
+                *(pa.field(name, pa.string(), nullable=False) for name in key_names),
+                *(pa.field(name, pa.int64()) for name in metric_names),
+            ]
+        )
+
+    @staticmethod
+    def _open_writer(path: str, schema, output_format: str):
+        pa = ColumnarOutput._import_pyarrow()
+        if output_format == 'parquet':
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(path, schema)
+        if output_format == 'arrow':
+            return pa.ipc.new_file(path, schema)
+        raise ValueError(f'Unknown columnar format: {output_format}')
+
+    @staticmethod
+    def save_rows(
+        rows: Iterable[dict], key_names: list[str], metric_names: list[str], 
+        path: str, output_format: str = 'parquet', repository: str = '', 
+        class_files: dict[str, str] | None = None
+    ) -> None:
+        """
+        Saves the result rows to a Parquet or Arrow IPC file, writing them in 
+            batches as they are produced.
+
+        The rows have the key columns and the metrics of a class or method, and
+            the file of each class is taken from the given class files.
+        """
+        pa = ColumnarOutput._import_pyarrow()
+        schema = ColumnarOutput.get_schema(key_names, metric_names)
+        class_files = class_files or {}
+
+        columns = {name: [] for name in schema.names}
+        writer = ColumnarOutput._open_writer(path, schema, output_format)
+        try:
+            for row in rows:
+                columns['repository'].append(repository)
+                columns['file'].append(class_files.get(row['class']))
+                for name in key_names:
+                    columns[name].append(row[name])
+                for name in metric_names:
+                    value = row.get(name)
+                    columns[name].append(value if isinstance(value, int) else None)
+
+                if len(columns['repository']) >= ColumnarOutput._BATCH_SIZE:
+                    writer.write_table(pa.Table.from_pydict(columns, schema))
+                    columns = {name: [] for name in schema.names}
+
+            if columns['repository']:
+                writer.write_table(pa.Table.from_pydict(columns, schema))
+        finally:
+            writer.close()
@@ -1,4 +1,5 @@
 import csv
+from typing import Iterable
 
 class CSVOutput:
     
@@ -66,6 +67,26 @@ class CSVOutput:
                 
         return formatted_dict
 
+    @staticmethod
+    def save_rows(rows: Iterable[dict], path: str) -> None:
+        """
+        Saves the results of the metrics extraction to a CSV file, writing each
+            row as it is produced. The headers are the keys of the first row.
+        """
+        with open(path, 'w', newline='', encoding="utf-8") as file:
+            writer = csv.writer(file)
+
+            rows = iter(rows)
+            first_row = next(rows, None)
+            if first_row is None:
+                writer.writerow([])
+                return
+
+            writer.writerow(first_row.keys())
+            writer.writerow(first_row.values())
+            for row in rows:
+                writer.writerow(row.values())
+
     @staticmethod
     def save_results(data: dict, path: str) -> None:
         """
@@ -0,0 +1,69 @@
+import csv
+import json
+from typing import Iterable
+
+class HistoryOutput:
+
+    # Formats of the history results, which are written as rows
+    FORMATS = ('csv', 'jsonl')
+
+    @staticmethod
+    def _write_rows(
+        file, writer, rows: Iterable[dict], output_format: str, write_headers: bool
+    ) -> bool:
+        """
+        Writes rows to a CSV writer, with the headers before the first row if
+            write_headers is set, or as JSON objects in their own lines.
+            Returns whether the headers are still to be written.
+        """
+        for row in rows:
+            if output_format == 'jsonl':
+                file.write(json.dumps(row))
+                file.write('\n')
+                continue
+            if write_headers:
+                writer.writerow(row.keys())
+                write_headers = False
+            writer.writerow(row.values())
+        return write_headers
+
+    @staticmethod
+    def save_results(
+        results: Iterable[tuple[str, str, dict, dict]], path_classes: str,
+        path_methods: str, output_format: str = 'csv'
+    ) -> int:
+        """
+        Saves the class and method results of each commit to a CSV or JSON
+            Lines file, with the commit hash and date in the first columns.
+            The results are given as tuples of commit hash, commit date, class
+            results and method results, and are written as they are produced,
+            so the results of only one commit are kept in memory. Returns the
+            number of commits written.
+        """
+        commits = 0
+        with open(path_classes, 'w', newline='', encoding='utf-8') as classes_file, \
+             open(path_methods, 'w', newline='', encoding='utf-8') as methods_file:
+            classes_writer = csv.writer(classes_file)
+            methods_writer = csv.writer(methods_file)
+            classes_headers = methods_headers = True
+            for commit_id, date, classes_results, methods_results in results:
+                commits += 1
+                classes_headers = HistoryOutput._write_rows(
+                    classes_file, classes_writer, (
+                        {'commit': commit_id, 'date': date, 'class': class_name, **class_results}
+                        for class_name, class_results in classes_results.items()
+                    ),
+                    output_format, classes_headers
+                )
+                methods_headers = HistoryOutput._write_rows(
+                    methods_file, methods_writer, (
+                        {
+                            'commit': commit_id, 'date': date, 'class': class_name,
+                            'method': method_name, **method_results
+                        }
+                        for class_name, class_methods in methods_results.items()
+                        for method_name, method_results in class_methods.items()
+                    ),
+                    output_format, methods_headers
+                )
+        return commits
@@ -1,8 +1,25 @@
 import json
+from typing import Iterable
 
 class JSONOutput:
 
     @staticmethod
-    def save_results(results: dict, path: str) -> None:
+    def save_results(results: dict | Iterable[tuple[str, dict]], path: str) -> None:
+        """
+        Saves the results of the metrics extraction to a JSON file.
+
+        The results are given as a dictionary or as pairs of class name and 
+            results, and each class is written as it is produced. The file is 
+            the same written by json.dump with an indentation of 4.
+        """
+        if isinstance(results, dict):
+            results = results.items()
+
         with open(path, 'w', encoding='utf-8') as file:
-            json.dump(results, file, indent=4)
\ No newline at end of file
+            separator = '{\n'
+            for class_name, class_results in results:
+                # Writes the class without the braces of its own document
+                document = json.dumps({class_name: class_results}, indent=4)
+                file.write(separator + document[2:-2])
+                separator = ',\n'
+            file.write('{}' if separator == '{\n' else '\n}')
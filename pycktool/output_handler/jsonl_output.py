@@ -0,0 +1,15 @@
+import json
+from typing import Iterable
+
+class JSONLOutput:
+
+    @staticmethod
+    def save_rows(rows: Iterable[dict], path: str) -> None:
+        """
+        Saves the results of the metrics extraction to a JSON Lines file, 
+            writing each row as a JSON object in its own line as it is produced.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(row))
+                file.write('\n')
@@ -1,28 +1,114 @@
 import os
-from pycktool.output_handler.csv_output import CSVOutput
-from pycktool.output_handler.json_output import JSONOutput
+from typing import Iterable, Iterator
+
+from pycktool.model.class_model import Class
 
 class OutputHandler:
 
+    @staticmethod
+    def class_rows(results: Iterable[tuple[str, dict]]) -> Iterator[dict]:
+        """
+        Yields a row for each class results, given as pairs of class name 
+            and results, with the class name in the first column.
+        """
+        for class_name, class_results in results:
+            yield {'class': class_name, **class_results}
+
+    @staticmethod
+    def method_rows(results: Iterable[tuple[str, dict]]) -> Iterator[dict]:
+        """
+        Yields a row for each method results, given as pairs of class name
+            and results of its methods, with the class and method names in the
+            first columns.
+        """
+        for class_name, methods_results in results:
+            for method_name, method_results in methods_results.items():
+                yield {'class': class_name, 'method': method_name, **method_results}
+
+    @staticmethod
+    def get_class_files(classes: dict[str, Class], path: str) -> dict[str, str]:
+        """
+        Returns the file of each class defined in the analyzed files, relative 
+            to the analyzed path.
+        """
+        class_files = {}
+        for class_name, class_obj in classes.items():
+            file_path = class_obj.file[0] if isinstance(class_obj.file, list) \
+                else class_obj.file
+            if file_path and file_path != '<?>':
+                class_files[class_name] = os.path.normpath(
+                    os.path.relpath(file_path, path)
+                )
+        return class_files
+
     @staticmethod
     def save_results(
-        classes_data: dict, methods_data: dict, file_name: str, 
-        output_format: str= 'csv', prefix: str= ''
+        classes_data: dict | Iterable[tuple[str, dict]], 
+        methods_data: dict | Iterable[tuple[str, dict]], file_name: str, 
+        output_format: str= 'csv', prefix: str= '', repository: str= '',
+        class_files: dict[str, str] | None= None, 
+        coupled_classes: dict[str, Iterable[str]] | None= None, root: str= '',
+        settings: str= ''
     ) -> None:
         """
-        Saves the results of the metrics extraction to a CSV or JSON file.
+        Saves the results of the metrics extraction to a CSV, JSON, JSON Lines,
+            Parquet or Arrow IPC file, or to an SQLite database.
+
+        The results are given as dictionaries by class name, or as iterables of
+            pairs of class name and results, like the ones of 
+            Metrics.iter_class_metrics and Metrics.iter_method_metrics. The 
+            results are written as they are produced, so iterables are not 
+            kept in memory.
+        The columnar formats also have the repository and the file of each
+            class, given by its path relative to the repository.
+        The SQLite database is updated with the results of the repository, 
+            including the coupled classes of each class, and the files are 
+            hashed from the root of the repository with the settings of the 
+            analysis, like the parser backend, so the results of the files are 
+            written again when the settings change.
+        Only the writer of the output format is imported.
         """
+        if isinstance(classes_data, dict):
+            classes_data = classes_data.items()
+        if isinstance(methods_data, dict):
+            methods_data = methods_data.items()
+
+        if output_format == 'sqlite':
+            from pycktool.output_handler.sqlite_output import SQLiteOutput
+            path_database = os.path.join(os.getcwd(), prefix + file_name + '.sqlite')
+            SQLiteOutput.save_results(
+                classes_data, methods_data, path_database, repository, 
+                class_files, coupled_classes, root, settings
+            )
+            return
+
         path_classes = prefix + file_name + '-classes.' + output_format
         path_classes = os.path.join(os.getcwd(), path_classes)
 
         path_methods = prefix + file_name + '-methods.' + output_format
         path_methods = os.path.join(os.getcwd(), path_methods)
+
         if output_format == 'csv':
-            formatted_classes_data = CSVOutput.format_class_results(classes_data)
-            CSVOutput.save_results(formatted_classes_data, path_classes)
-            formatted_methods_data = CSVOutput.format_method_results(methods_data)
-            CSVOutput.save_results(formatted_methods_data, path_methods)
+            from pycktool.output_handler.csv_output import CSVOutput
+            CSVOutput.save_rows(OutputHandler.class_rows(classes_data), path_classes)
+            CSVOutput.save_rows(OutputHandler.method_rows(methods_data), path_methods)
         elif output_format == 'json':
+            from pycktool.output_handler.json_output import JSONOutput
             JSONOutput.save_results(classes_data, path_classes)
             JSONOutput.save_results(methods_data, path_methods)
-        
\ No newline at end of file
+        elif output_format == 'jsonl':
+            from pycktool.output_handler.jsonl_output import JSONLOutput
+            JSONLOutput.save_rows(OutputHandler.class_rows(classes_data), path_classes)
+            JSONLOutput.save_rows(OutputHandler.method_rows(methods_data), path_methods)
+        elif output_format in ('parquet', 'arrow'):
+            from pycktool.output_handler.columnar_output import ColumnarOutput
+            ColumnarOutput.save_rows(
+                OutputHandler.class_rows(classes_data), ['class'], 
+                ColumnarOutput.CLASS_METRICS, path_classes, output_format, 
+                repository, class_files
+            )
+            ColumnarOutput.save_rows(
+                OutputHandler.method_rows(methods_data), ['class', 'method'], 
+                ColumnarOutput.METHOD_METRICS, path_methods, output_format, 
+                repository, class_files
+            )
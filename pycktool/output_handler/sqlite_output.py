@@ -0,0 +1,257 @@
+import os
+import sqlite3
+import hashlib
+from typing import Iterable
+
+from pycktool import __version__
+from pycktool.output_handler.columnar_output import ColumnarOutput
+
+class SQLiteOutput:
+    """
+    Saves the results of the metrics extraction to an SQLite database, with 
+        tables for the files, classes, methods and coupling edges of each 
+        repository.
+
+    The rows of a repository are upserted, so only the rows whose values 
+        changed since the previous run are written, and the rows of removed 
+        files, classes, methods and edges are deleted. The methods of the 
+        classes of files whose hash did not change are not written again.
+    The hash of each file covers the version of PyCKTool and the settings of 
+        the analysis, so the files are written again when they change.
+    """
+
+    CLASS_METRICS = ColumnarOutput.CLASS_METRICS
+
+    METHOD_METRICS = ColumnarOutput.METHOD_METRICS
+
+    @staticmethod
+    def _get_schema() -> str:
+        class_metrics = ''.join(
+            f'{name} INTEGER, ' for name in SQLiteOutput.CLASS_METRICS
+        )
+        method_metrics = ''.join(
+            f'{name} INTEGER, ' for name in SQLiteOutput.METHOD_METRICS
+        )
+        indexes = ''.join(
+            f'CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({name});\n'
+            for table, metrics in (
+                ('classes', SQLiteOutput.CLASS_METRICS), 
+                ('methods', SQLiteOutput.METHOD_METRICS)
+            )
+            for name in metrics
+        )
+        return f"""
+            CREATE TABLE IF NOT EXISTS files (
+                repository TEXT NOT NULL, path TEXT NOT NULL, hash TEXT NOT NULL,
+                PRIMARY KEY (repository, path)
+            );
+            CREATE TABLE IF NOT EXISTS classes (
+                repository TEXT NOT NULL, class TEXT NOT NULL, file TEXT, 
+                {class_metrics}
+                PRIMARY KEY (repository, class)
+            );
+            CREATE TABLE IF NOT EXISTS methods (
+                repository TEXT NOT NULL, class TEXT NOT NULL, method TEXT NOT NULL, 
+                {method_metrics}
+                PRIMARY KEY (repository, class, method)
+            );
+            CREATE TABLE IF NOT EXISTS coupling (
+                repository TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,
+                PRIMARY KEY (repository, source, target)
+            );
+            CREATE INDEX IF NOT EXISTS classes_file ON classes (repository, file);
+            CREATE INDEX IF NOT EXISTS coupling_target ON coupling (repository, target);
+            {indexes}
+            CREATE TEMP TABLE current_classes (class TEXT PRIMARY KEY);
+            CREATE TEMP TABLE current_edges (
+                source TEXT NOT NULL, target TEXT NOT NULL, PRIMARY KEY (source, target)
+            );
+            CREATE TEMP TABLE changed_classes (class TEXT PRIMARY KEY);
+            CREATE TEMP TABLE current_methods (
+                class TEXT NOT NULL, method TEXT NOT NULL, PRIMARY KEY (class, method)
+            );
+        """
+
+    @staticmethod
+    def _get_upsert(table: str, key_names: list[str], value_names: list[str]) -> str:
+        """
+        Returns the statement that inserts a row in the table, or updates it 
+            only if any of its values changed.
+        """
+        names = ', '.join(key_names + value_names)
+        placeholders = ', '.join('?' * len(key_names + value_names))
+        updates = ', '.join(f'{name} = excluded.{name}' for name in value_names)
+        old_values = ', '.join(value_names)
+        new_values = ', '.join(f'excluded.{name}' for name in value_names)
+        return f"""
+            INSERT INTO {table} ({names}) VALUES ({placeholders})
+            ON CONFLICT ({', '.join(key_names)}) DO UPDATE SET {updates}
+            WHERE ({old_values}) IS NOT ({new_values})
+        """
+
+    @staticmethod
+    def _get_file_hash(file_path: str, settings: str = '') -> str:
+        """
+        Returns the hash of the content of a file, the version of PyCKTool and 
+            the settings of the analysis, or an empty string if the file can 
+            not be read.
+        """
+        file_hash = hashlib.sha256(f'{__version__}\0{settings}\0'.encode('utf-8'))
+        try:
+            with open(file_path, 'rb') as file:
+                file_hash.update(file.read())
+        except OSError:
+            return ''
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def _to_integer(value) -> int | None:
+        """
+        Converts a metric value to an integer column, with values that are not
+            integers, like the 'Circular' DIT, stored as null.
+        """
+        return value if isinstance(value, int) else None
+
+    @staticmethod
+    def _save_files(
+        connection: sqlite3.Connection, repository: str, root: str, 
+        class_files: dict[str, str], settings: str = ''
+    ) -> tuple[set[str], int]:
+        """
+        Upserts the hash of each analyzed file and deletes the removed files. 
+            Returns the files whose hash changed and the number of written rows.
+        """
+        stored_hashes = dict(connection.execute(
+            'SELECT path, hash FROM files WHERE repository = ?', (repository,)
+        ))
+
+        changed_files = set()
+        written = 0
+        for file_path in set(class_files.values()):
+            file_hash = SQLiteOutput._get_file_hash(
+                os.path.join(root, file_path), settings
+            )
+            if stored_hashes.pop(file_path, None) != file_hash:
+                changed_files.add(file_path)
+                written += connection.execute(
+                    SQLiteOutput._get_upsert('files', ['repository', 'path'], ['hash']),
+                    (repository, file_path, file_hash)
+                ).rowcount
+
+        connection.executemany(
+            'DELETE FROM files WHERE repository = ? AND path = ?',
+            ((repository, file_path) for file_path in stored_hashes.keys())
+        )
+        return changed_files, written
+
+    @staticmethod
+    def save_results(
+        classes_data: Iterable[tuple[str, dict]], methods_data: Iterable[tuple[str, dict]],
+        path: str, repository: str = '', class_files: dict[str, str] | None = None,
+        coupled_classes: dict[str, Iterable[str]] | None = None, root: str = '',
+        settings: str = ''
+    ) -> dict[str, int]:
+        """
+        Saves the results of a repository to the database in the given path, 
+            creating it if needed. The file hashes are calculated from the 
+            files of the classes, relative to the root of the repository, and 
+            the settings of the analysis, like the parser backend.
+
+        Returns the number of rows written to each table.
+        """
+        class_files = class_files or {}
+        coupled_classes = coupled_classes or {}
+        written = {}
+
+        connection = sqlite3.connect(path)
+        try:
+            connection.executescript(SQLiteOutput._get_schema())
+            with connection:
+                changed_files, written['files'] = SQLiteOutput._save_files(
+                    connection, repository, root, class_files, settings
+                )
+
+                # Classes
+                upsert = SQLiteOutput._get_upsert(
+                    'classes', ['repository', 'class'], 
+                    ['file', *SQLiteOutput.CLASS_METRICS]
+                )
+                written['classes'] = 0
+                for class_name, class_results in classes_data:
+                    connection.execute(
+                        'INSERT INTO current_classes VALUES (?)', (class_name,)
+                    )
+                    written['classes'] += connection.execute(upsert, (
+                        repository, class_name, class_files.get(class_name),
+                        *(
+                            SQLiteOutput._to_integer(class_results.get(name))
+                            for name in SQLiteOutput.CLASS_METRICS
+                        )
+                    )).rowcount
+                connection.execute("""
+                    DELETE FROM classes WHERE repository = ? 
+                    AND class NOT IN (SELECT class FROM current_classes)
+                """, (repository,))
+                connection.execute("""
+                    DELETE FROM methods WHERE repository = ? 
+                    AND class NOT IN (SELECT class FROM current_classes)
+                """, (repository,))
+
+                # Methods, only of the classes of changed files
+                upsert = SQLiteOutput._get_upsert(
+                    'methods', ['repository', 'class', 'method'], 
+                    SQLiteOutput.METHOD_METRICS
+                )
+                written['methods'] = 0
+                for class_name, methods_results in methods_data:
+                    if class_files.get(class_name) not in changed_files:
+                        continue
+                    connection.execute(
+                        'INSERT INTO changed_classes VALUES (?)', (class_name,)
+                    )
+                    for method_name, method_results in methods_results.items():
+                        connection.execute(
+                            'INSERT INTO current_methods VALUES (?, ?)', 
+                            (class_name, method_name)
+                        )
+                        written['methods'] += connection.execute(upsert, (
+                            repository, class_name, method_name,
+                            *(
+                                SQLiteOutput._to_integer(method_results.get(name))
+                                for name in SQLiteOutput.METHOD_METRICS
+                            )
+                        )).rowcount
+                # Only the removed methods of the changed classes are deleted
+                connection.execute("""
+                    DELETE FROM methods WHERE repository = ? 
+                    AND class IN (SELECT class FROM changed_classes) AND NOT EXISTS (
+                        SELECT 1 FROM current_methods 
+                        WHERE current_methods.class = methods.class 
+                        AND current_methods.method = methods.method
+                    )
+                """, (repository,))
+
+                # Coupling edges
+                connection.executemany(
+                    'INSERT INTO current_edges VALUES (?, ?)',
+                    (
+                        (source, target) 
+                        for source, targets in coupled_classes.items() 
+                        for target in targets
+                    )
+                )
+                connection.execute("""
+                    DELETE FROM coupling WHERE repository = ? AND NOT EXISTS (
+                        SELECT 1 FROM current_edges 
+                        WHERE current_edges.source = coupling.source 
+                        AND current_edges.target = coupling.target
+                    )
+                """, (repository,))
+                written['coupling'] = connection.execute("""
+                    INSERT OR IGNORE INTO coupling (repository, source, target)
+                    SELECT ?, source, target FROM current_edges
+                """, (repository,)).rowcount
+        finally:
+            connection.close()
+
+        return written
@@ -0,0 +1,470 @@
+import os
+import ast
+import builtins
+import textwrap
+import time
+from sys import intern
+
+from pycktool.model.method_model import Method
+from pycktool.model.model import Model
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.name_resolver import NameResolver
+
+class AstCodeParser(BaseCodeParser):
+    """
+    Code parser based on the standard library ast module.
+
+    It extracts the same structural data of the astroid based CodeParser,
+        without inference. Built-ins are detected by name, and all the names
+        used as classes are possible coupled classes, resolved by name when
+        the possible coupled classes are processed.
+    """
+
+    _BUILTIN_NAMES = frozenset(dir(builtins))
+
+    _SIMPLE_STATEMENTS = (
+        ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Expr, ast.Return,
+        ast.Raise, ast.Delete, ast.Pass, ast.Break, ast.Continue,
+        ast.Global, ast.Nonlocal, ast.Assert, ast.Import, ast.ImportFrom
+    )
+
+    _COMPOUND_STATEMENTS = (
+        ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith
+    )
+
+    _LITERALS = (
+        ast.Constant, ast.JoinedStr, ast.List, ast.Tuple, ast.Set, ast.Dict,
+        ast.ListComp, ast.SetComp, ast.DictComp
+    )
+
+    # Contexts of the nodes visited while traversing a method, as in 
+    # CodeParser: statements of the body of a function or of a compound 
+    # statement, counted as logical lines, other traversed nodes, arguments 
+    # and called objects of calls, from which only calls and accessed 
+    # attributes are extracted, and nodes of the parameters, from which only
+    # names are extracted
+    _FUNCTION_BODY = 0
+    _COMPOUND_BODY = 1
+    _TRAVERSE = 2
+    _CALL_PART = 3
+    _PARAMETERS = 4
+
+    # Attributes of the nodes traversed to extract the data of a method
+    _TRAVERSED_ATTRIBUTES = (
+        'body', 'orelse', 'test', 'value', 'values', 'elts', 'elt', 'iter',
+        'generators', 'operand', 'handlers'
+    )
+
+    def count_lloc(self, node):
+        """
+        Count the number of logical lines of code in the given AST node.
+        """
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            raise ValueError("Node must be a function or method definition")
+        return self._count_statements_lloc(
+            self._get_body_without_docstring(node), self._FUNCTION_BODY
+        )
+
+    @staticmethod
+    def _get_body_without_docstring(node) -> list:
+        """
+        Returns the body of a function or class without its docstring, which 
+            is not part of the body in astroid.
+        """
+        if ast.get_docstring(node, clean=False) is not None:
+            return node.body[1:]
+        return node.body
+
+    def count_lloc_in_compound_statement(self, node):
+        """
+        Count the logical lines of code in compound statements like if, for, 
+            while, try, with.
+        """
+        return self._count_statements_lloc([node], self._COMPOUND_BODY)
+
+    def _count_statements_lloc(self, statements: list, context: int) -> int:
+        """
+        Counts the logical lines of code of the given statements, which are in
+            the body of a function or of a compound statement, with an explicit
+            stack instead of recursion.
+        """
+        lloc = 0
+        stack = [(statement, context) for statement in statements]
+        while stack:
+            node, context = stack.pop()
+            node_lloc, body_context = self._get_statement_lloc(node, context)
+            lloc += node_lloc
+            if body_context is not None:
+                stack.extend(
+                    (child, body_context) for child in self._get_counted_body(node)
+                )
+        return lloc
+
+    def _get_statement_lloc(self, node, context: int) -> tuple[int, int | None]:
+        """
+        Returns the logical lines of code of a statement, without the ones of
+            its body, and the context in which the statements of its body and 
+            orelse are counted, or None if they are not counted.
+
+        Compound statements count in any body, but functions only count in the
+            body of a function, with their own body. Other statements, like 
+            classes, do not count.
+        """
+        if context == self._TRAVERSE:
+            return 0, None
+        if isinstance(node, self._SIMPLE_STATEMENTS):
+            return 1, None
+        if isinstance(node, self._COMPOUND_STATEMENTS):
+            return 1, self._COMPOUND_BODY
+        if context == self._FUNCTION_BODY and \
+           isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return 1, self._FUNCTION_BODY
+        return 0, None
+
+    def _get_counted_body(self, node) -> list:
+        """
+        Returns the statements of the body and orelse of a statement whose 
+            logical lines are counted, without the docstring of a function.
+        """
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return self._get_body_without_docstring(node)
+        return [*node.body, *getattr(node, 'orelse', [])]
+
+    @staticmethod
+    def is_builtin_call(node: ast.Call) -> bool:
+        """
+        Determines by name if the given call is a call of a built-in, or of a
+            method of a built-in or literal.
+        """
+        func = node.func
+        while isinstance(func, (ast.Attribute, ast.Call)):
+            func = func.value if isinstance(func, ast.Attribute) else func.func
+        if isinstance(func, ast.Name):
+            return func.id in AstCodeParser._BUILTIN_NAMES
+        return isinstance(func, AstCodeParser._LITERALS)
+
+    def _add_called_method(self, node: ast.Call, obj: Model, class_name: str) -> None:
+
+        called_method = ast.unparse(node.func)
+        if not AstCodeParser.is_builtin_call(node):
+            bare_name = NameResolver.get_bare_name(class_name)
+            if f"{bare_name}." in called_method:
+                called_method = called_method.replace(f"{bare_name}.", "")
+            if f"self." in called_method:
+                called_method = called_method.replace(f"self.", "")
+            obj.called.add(intern(called_method))
+
+        # Checking if call is a Class method
+        if '.' in called_method:
+            if isinstance(node.func, ast.Attribute):
+                self._extract_coupled_classes(node.func.value, class_name)
+
+    def _extract_coupled_classes(self, node: ast.expr, class_name: str) -> None:
+        """
+        Adds the name of the given node as a possible coupled class of the
+            given class name, if it is not a built-in.
+        """
+        if isinstance(node, ast.Name) and node.id not in self._BUILTIN_NAMES:
+            self.classes[class_name].possible_coupled_classes.add(node.id)
+
+    def _extract_used_attribute_or_call(self, node, obj: Model, class_name) -> list:
+        """
+        Extracts the method called by the node, if it is a call, or the 
+            attribute accessed by it, if it is an attribute.
+        Returns the nodes of a call that are extracted next: its arguments and
+            the object of the called method, e.g. self.attribute in 
+            self.attribute.add().
+        """
+        if isinstance(node, ast.Call):
+            self._add_called_method(node, obj, class_name)
+            self._extract_coupled_classes(node.func, class_name)
+
+            call_parts = list(node.args)
+            if isinstance(node.func, ast.Attribute):
+                call_parts.append(node.func.value)
+            return call_parts
+
+        if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load):
+            attr_name = ast.unparse(node)
+            if 'self' in attr_name:
+                attr_name = attr_name.replace("self.", "")
+                obj.accessed_attributes.add(intern(attr_name))
+        return []
+
+    def _extract_used_attributes_and_called(self, node, obj: Model, class_name) -> None:
+        """
+        Traverse the node and its nested calls with an explicit stack, and 
+            extract the methods that are called and the attributes that are 
+            accessed.
+        The extracted data is stored in the given dictionary.
+        """
+        stack = [node]
+        while stack:
+            stack.extend(self._extract_used_attribute_or_call(stack.pop(), obj, class_name))
+
+    def _extract_self_attributes(self, node, obj: Model, class_name: str) -> None:
+        """
+        Extract the attributes of the class that are accessed via the 'self'
+            variable from the given node and store the extracted data in the
+            given dictionary.
+        """
+        # If AnnAssing, target is only one and attribute is different
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        for target in targets:
+            if isinstance(target, ast.Attribute):
+                attr_name = target.attr
+                # Attribute types are not inferred without astroid
+                self.classes[class_name].attributes.add((intern(attr_name), None))
+                obj.accessed_attributes.add(intern(attr_name))
+            if isinstance(target, ast.Subscript):
+                # Case of assing of a new dict that calls functions
+                # E.g.: var = {"key": self.method()}
+                if isinstance(node.value, ast.Dict):
+                    for value in node.value.values:
+                        self._extract_used_attributes_and_called(value, obj, class_name)
+        if isinstance(node.value, ast.Attribute):
+            obj.accessed_attributes.add(intern(node.value.attr))
+        if isinstance(node, ast.AnnAssign):
+            coupling_to_add = [node.annotation]
+            if isinstance(node.annotation, ast.Subscript):
+                if isinstance(node.annotation.slice, (ast.Tuple, ast.List)):
+                    coupling_to_add.extend(node.annotation.slice.elts)
+                else:
+                    coupling_to_add.append(node.annotation.slice)
+            for item in coupling_to_add:
+                self.classes[class_name].possible_coupled_classes.add(
+                    ast.unparse(item)
+                )
+
+    def _extract_methods(self, node: ast.FunctionDef, class_name: str) -> int:
+        """
+        Extract the methods of the class from the given node and store the
+            extracted data in the classes dictionary. Returns the logical lines
+            of code of the method.
+
+        The extracted data includes the name of the method, the logical lines of
+            code (LLOC), the number of parameters, the attributes that are
+            accessed and the methods that are called.
+        """
+        method_name = node.name
+        method_obj = Method(method_name)
+        method_obj.number_of_parameters = len(node.args.args)
+
+        # Add return type to possible coupled classes
+        if node.returns:
+            self._extract_return_type(node.returns, class_name)
+
+        method_obj.lloc = self._extract_methods_data(node, method_obj, class_name)
+
+        self.classes[class_name].methods[method_name] = method_obj
+        return method_obj.lloc
+
+    def _get_traversed_children(self, node, body_context: int | None) -> list:
+        """
+        Returns the children of a node that are traversed to extract the data of
+            a method, with their context. These are the same children traversed
+            by CodeParser: the keys of dicts, the context of with statements, 
+            and the body, orelse, test, value, values, elts, elt, iter, 
+            generators, operand and handlers of the other nodes. The target of
+            an attribute is not traversed.
+
+        The statements of the body and orelse are in the given body context, 
+            if any, except the docstring of a function.
+        """
+        if isinstance(node, (ast.Constant, ast.Attribute)):
+            return []
+        if isinstance(node, ast.Dict):
+            return [(key, self._TRAVERSE) for key in node.keys if key is not None]
+
+        counted = set(map(id, self._get_counted_body(node))) \
+            if body_context is not None else ()
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            children = [*node.body, *(item.context_expr for item in node.items)]
+        else:
+            children = []
+            for attribute in self._TRAVERSED_ATTRIBUTES:
+                child = getattr(node, attribute, None)
+                if isinstance(child, list):
+                    children.extend(child)
+                elif isinstance(child, ast.AST):
+                    children.append(child)
+        return [
+            (child, body_context if id(child) in counted else self._TRAVERSE)
+            for child in children
+        ]
+
+    def _extract_methods_data(
+            self, node: ast.FunctionDef, method_obj: Method, class_name: str
+        ) -> int:
+        """
+        Traverse the given method node in a single pass, with an explicit 
+            stack, and extract the logical lines of code, the types of the 
+            parameters, the methods that are called and the attributes that are
+            accessed. Returns the logical lines of code.
+
+        Each node is visited once: the statements are counted when visited, 
+            and the parts of the calls and the parameters are pushed to the 
+            same stack with their own context.
+        """
+        lloc = 0
+        stack = [(node.args, self._PARAMETERS)]
+        stack.extend(reversed(self._get_traversed_children(node, self._FUNCTION_BODY)))
+        while stack:
+            node, context = stack.pop()
+
+            if context == self._CALL_PART:
+                stack.extend(
+                    (call_part, context) for call_part in 
+                    self._extract_used_attribute_or_call(node, method_obj, class_name)
+                )
+                continue
+
+            # Add parameters types to possible coupled classes
+            if context == self._PARAMETERS:
+                if isinstance(node, ast.Name):
+                    self.classes[class_name].possible_coupled_classes.add(node.id)
+                stack.extend((child, context) for child in ast.iter_child_nodes(node))
+                continue
+
+            node_lloc, body_context = self._get_statement_lloc(node, context)
+            lloc += node_lloc
+
+            if isinstance(node, (ast.Assign, ast.AnnAssign)):
+                self._extract_self_attributes(node, method_obj, class_name)
+
+            stack.extend(
+                (call_part, self._CALL_PART) for call_part in 
+                self._extract_used_attribute_or_call(node, method_obj, class_name)
+            )
+            stack.extend(reversed(self._get_traversed_children(node, body_context)))
+
+        return lloc
+
+    def _extract_return_type(self, returns: ast.expr, class_name: str) -> None:
+        """
+        Extracts the return type of a method and adds it to the possible coupled
+            classes of the given class.
+        """
+        if isinstance(returns, ast.Subscript):
+            # The return is of format 'dict[str, Class]'
+            self.classes[class_name].possible_coupled_classes.add(
+                ast.unparse(returns.value)
+            )
+            if isinstance(returns.slice, (ast.Tuple, ast.List)):
+                for slice in returns.slice.elts:
+                    self.classes[class_name].possible_coupled_classes.add(
+                        ast.unparse(slice)
+                    )
+            else:
+                self.classes[class_name].possible_coupled_classes.add(
+                    ast.unparse(returns.slice)
+                )
+        else:
+            # Simple return
+            self.classes[class_name].possible_coupled_classes.add(
+                ast.unparse(returns)
+            )
+
+    def _extract_inheritance(self, base: ast.Name | ast.Attribute, class_name: str) -> None:
+        """
+        Extract the inheritance information for the given class.
+        """
+        base_class = self._qualify_reference(ast.unparse(base))
+        # Create base_class, if doesnt exist
+        self.classes[base_class] = self._get_class(base_class)
+
+        self.classes[class_name].parents.append(self.classes[base_class])
+        self.classes[class_name].possible_coupled_classes.add(base_class)
+
+    def _extract_classes_data(self, module: ast.Module, path: str) -> None:
+        """
+        Extracts the data from a class node, including methods and attributes,
+            and stores it in the classes dictionary.
+        Also extracts classes inheritance data.
+        """
+        # Same format of the module path used by astroid
+        module_path = [os.path.abspath(path)] if path else ['<?>']
+
+        for node in module.body:
+            if isinstance(node, ast.ClassDef):
+                class_name = self._qualify_class_name(node.name)
+                self.classes[class_name] = self._get_class(class_name)
+                self.classes[class_name].file = module_path
+                self.classes[class_name].lloc = 0
+                counted = self._get_body_without_docstring(node)
+
+                # Extract methods and attributes
+                for class_node in node.body:
+
+                    # Method instantiation, whose lines are counted with its data
+                    if isinstance(class_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self.classes[class_name].lloc += \
+                            1 + self._extract_methods(class_node, class_name)
+                    elif class_node in counted:
+                        self.classes[class_name].lloc += self._count_statements_lloc(
+                            [class_node], self._FUNCTION_BODY
+                        )
+
+                    # Attribute assign
+                    if isinstance(class_node, (ast.Assign, ast.AnnAssign)):
+                        targets = \
+                            class_node.targets if isinstance(class_node, ast.Assign) \
+                            else [class_node.target]
+                        for target in targets:
+                            self.classes[class_name].variables.add(intern(target.id))
+
+                    # Method call or attribute access
+                    if isinstance(class_node, (ast.Expr, ast.Assign, ast.AnnAssign)):
+                        self._extract_used_attributes_and_called(
+                            class_node.value, self.classes[class_name], class_name
+                        )
+
+                # Extract inheritance information
+                for base in node.bases:
+                    if isinstance(base, ast.Name) and base.id not in self._BUILTIN_NAMES \
+                       or isinstance(base, ast.Attribute):
+                        self._extract_inheritance(base, class_name)
+
+    def _extract_imports(self, module: ast.Module, is_package: bool) -> None:
+        """
+        Extracts the names bound by the imports of the module, used to qualify
+            the references to classes.
+        """
+        for node in ast.walk(module):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self._add_import(alias.name, alias.asname)
+            elif isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    self._add_import_from(
+                        node.module, node.level, alias.name, alias.asname, is_package
+                    )
+
+    def extract_code_data(self, code: str, path: str = '', module_name: str = '') -> None:
+        """
+        Extract the data from the given code string.
+
+        The classes are named by the module name, if given, followed by their 
+            names in the code.
+        """
+        start = time.perf_counter() if self.timings is not None else None
+        # Indented code is accepted, as by astroid
+        module = ast.parse(textwrap.dedent(code), filename=path or '<unknown>')
+        if start is not None:
+            self.timings['ast_parse'] = time.perf_counter() - start
+        self.extract_module_data(module, path, module_name)
+
+    def extract_module_data(
+        self, module: ast.Module, path: str = '', module_name: str = ''
+    ) -> None:
+        """
+        Extract the data from the given module, already parsed by ast.
+        """
+        self._start_module(module_name, {
+            node.name for node in module.body if isinstance(node, ast.ClassDef)
+        })
+        try:
+            self._extract_imports(module, path.endswith('__init__.py'))
+            self._extract_classes_data(module, path)
+        finally:
+            self._finish_module()
@@ -0,0 +1,179 @@
+from pycktool.model.class_model import Class
+from pycktool.parser.name_resolver import NameResolver
+
+class BaseCodeParser:
+
+    # Version of the format of the class records, changed when the records 
+    # of a file change, to invalidate the stored records
+    RECORDS_VERSION = '2'
+
+    def __init__(self) -> None:
+
+        self.classes: dict[str, Class] = {}
+
+        # Counters of the extraction, summed over the parsed files
+        self.stats: dict[str, int] = {}
+
+        # Seconds of each step of the extraction of the current file, only 
+        # measured when set by a profiled run
+        self.timings: dict[str, float] | None = None
+
+        # Name of the module of the current file, and the names bound in it by
+        # imports and by class definitions, used to qualify class references
+        self.module_name: str = ''
+        self._imported_names: dict[str, str] = {}
+        self._module_class_names: set[str] = set()
+
+    def _get_class(self, class_name: str) -> Class:
+        """
+        Gets a class from the classes dictionary, or creates a new class if not 
+            found.
+        """
+        return self.classes.get(class_name, Class(class_name))
+
+    @staticmethod
+    def add_stats(stats: dict[str, int], other_stats: dict[str, int]) -> None:
+        """
+        Adds the counters of other stats to the given stats.
+        """
+        for name, value in other_stats.items():
+            stats[name] = stats.get(name, 0) + value
+
+    def extract_code_data(self, code: str, path: str = '', module_name: str = '') -> None:
+        """
+        Extract the data from the given code string.
+
+        The classes are named by the module name, if given, followed by their 
+            names in the code.
+        """
+        raise NotImplementedError
+
+    def _qualify_class_name(self, name: str) -> str:
+        """
+        Returns the qualified name of a class defined in the current module.
+        """
+        return f'{self.module_name}.{name}' if self.module_name else name
+
+    def _add_import(self, name: str, alias: str | None) -> None:
+        """
+        Adds the name bound by an 'import name as alias' statement of the 
+            current module.
+        """
+        if alias:
+            self._imported_names[alias] = name
+        else:
+            top_name = name.split('.', 1)[0]
+            self._imported_names[top_name] = top_name
+
+    def _add_import_from(
+        self, imported_module: str | None, level: int, name: str, alias: str | None,
+        is_package: bool
+    ) -> None:
+        """
+        Adds the name bound by a 'from module import name as alias' statement 
+            of the current module.
+        """
+        if name == '*':
+            return
+        imported_module = NameResolver.resolve_relative_import(
+            self.module_name, is_package, imported_module, level
+        )
+        self._imported_names[alias or name] = \
+            f'{imported_module}.{name}' if imported_module else name
+
+    def _qualify_reference(self, reference: str) -> str:
+        """
+        Qualifies a reference to a class in the current module with the names
+            imported or defined in the module. References to other names are
+            kept, to be resolved when all the classes are known.
+        """
+        head, _, rest = reference.partition('.')
+        if head in self._imported_names:
+            target = self._imported_names[head]
+            return f'{target}.{rest}' if rest else target
+        if head in self._module_class_names and self.module_name:
+            return f'{self.module_name}.{reference}'
+        return reference
+
+    def _start_module(self, module_name: str, class_names: set[str]) -> None:
+        """
+        Starts the extraction of a module, with the names of its classes. The
+            imports of the module are added by the parser.
+        """
+        self.module_name = module_name
+        self._imported_names = {}
+        self._module_class_names = class_names
+
+    def _finish_module(self) -> None:
+        """
+        Qualifies the possible coupled classes of the classes of the current 
+            module, and finishes its extraction.
+        """
+        for class_name in self._module_class_names:
+            class_obj = self.classes.get(self._qualify_class_name(class_name))
+            if class_obj is not None:
+                class_obj.possible_coupled_classes = {
+                    self._qualify_reference(reference) 
+                    for reference in class_obj.possible_coupled_classes
+                }
+        self._start_module('', set())
+
+    def _link_parents(self, resolver: NameResolver) -> None:
+        """
+        Links the base classes that are placeholders, since their references 
+            could not be qualified by their modules, to the classes defined in
+            the analyzed files that they resolve to. Placeholders no longer 
+            used are removed.
+        """
+        replaced = set()
+        for class_obj in self.classes.values():
+            for i, parent in enumerate(class_obj.parents):
+                if parent.file:
+                    continue
+                resolved = resolver.resolve_defined(parent.name)
+                if resolved is not None and resolved not in (parent.name, class_obj.name):
+                    class_obj.parents[i] = self.classes[resolved]
+                    replaced.add(parent.name)
+
+        if replaced:
+            used = {
+                parent.name 
+                for class_obj in self.classes.values() for parent in class_obj.parents
+            }
+            for class_name in replaced - used:
+                del self.classes[class_name]
+
+    def process_possible_coupled_classes(self) -> None:
+        """
+        Process the possible coupled classes for each class in the dictionary.
+
+        The references to classes are resolved to the qualified names of the
+            classes, and the base classes are linked to the resolved classes.
+        """
+        self._link_parents(NameResolver(self.classes))
+
+        resolver = NameResolver(self.classes)
+        all_classes = set(self.classes.keys())
+        for class_obj in self.classes.values():
+            class_obj.process_possible_coupled_classes(all_classes, resolver=resolver)
+
+    def export_class_records(self) -> list[dict]:
+        """
+        Exports the extracted classes as compact records, in extraction order.
+        """
+        return [class_obj.to_record() for class_obj in self.classes.values()]
+
+    def merge_class_records(self, records: list[dict]) -> None:
+        """
+        Merges class records exported by another parser into the classes
+            dictionary. Merging the records of each parsed chunk in order
+            results in the same data as parsing all the chunks with this parser.
+        """
+        for record in records:
+            class_name = record['name']
+            self.classes[class_name] = self._get_class(class_name)
+            self.classes[class_name].merge(Class.from_record(record))
+
+            for parent_name in record['parents']:
+                self.classes[parent_name] = self._get_class(parent_name)
+                self.classes[class_name].parents.append(self.classes[parent_name])
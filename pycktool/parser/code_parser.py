@@ -1,24 +1,125 @@
+import time
+import sysconfig
+from sys import intern
+from typing import Iterable
 import astroid
+from astroid.context import InferenceContext
 from inspect import ismethod
 
 from pycktool.model.class_model import Class
 from pycktool.model.method_model import Method
 from pycktool.model.model import Model
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.name_resolver import NameResolver
+
+class BoundedInferenceContext(InferenceContext):
+    """
+    Inference context with a configurable maximum number of inferred nodes,
+        which is kept by the clones of the context.
+    """
+
+    __slots__ = ('max_inferred',)
+
+    def __init__(self, max_inferred: int, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_inferred = max_inferred
+
+    def clone(self) -> 'BoundedInferenceContext':
+        clone = BoundedInferenceContext(
+            self.max_inferred, self.path.copy(), nodes_inferred=self._nodes_inferred
+        )
+        clone.callcontext = self.callcontext
+        clone.boundnode = self.boundnode
+        clone.extra_context = self.extra_context
+        clone.constraints = self.constraints.copy()
+        return clone
+
+
+class CodeParser(BaseCodeParser):
+
+    _SIMPLE_STATEMENTS = (
+        astroid.Assign, astroid.AugAssign, astroid.AnnAssign, astroid.Expr, astroid.Return,
+        astroid.Raise, astroid.Delete, astroid.Pass, astroid.Break, astroid.Continue,
+        astroid.Global, astroid.Nonlocal, astroid.Assert, astroid.Import, astroid.ImportFrom
+    )
+
+    _COMPOUND_STATEMENTS = (astroid.If, astroid.For, astroid.While, astroid.Try, astroid.With)
+
+    # All of these attributes are traverseable and contain data
+    _TRAVERSED_ATTRIBUTES = (
+        'body', 'orelse', 'test', 'value', 'values', 'elts', 'elt', 'iter',
+        'generators', 'operand', 'handlers', 'items'
+    )
+
+    # Contexts of the nodes visited in a method: statements of the body of a
+    # function or of a compound statement, which count as logical lines, 
+    # other traversed nodes, arguments and called objects of calls, from which
+    # only calls and accessed attributes are extracted, and nodes of the 
+    # parameters, from which only names are extracted
+    _FUNCTION_BODY = 0
+    _COMPOUND_BODY = 1
+    _TRAVERSE = 2
+    _CALL_PART = 3
+    _PARAMETERS = 4
+
+    # Traversed attributes of each node class, found from its first node
+    _node_attributes: dict[type, tuple[str, ...]] = {}
+
+    # Inference context kept by astroid after each file: its caches and the
+    # modules it loaded, only the modules, or only the modules of the standard
+    # library and installed packages
+    INFERENCE_CONTEXTS = ('all', 'modules', 'installed')
+
+    # Number of files parsed between two clears of the astroid caches, which 
+    # also rebuild the astroid builtins, and number of files parsed since the
+    # last clear in this process
+    CLEAR_CACHE_INTERVAL = 10
+    _files_since_cache_clear = 0
+
+    # Folders of the standard library and installed packages
+    _INSTALLED_PATHS = tuple({
+        sysconfig.get_paths()[name] 
+        for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+    })
+
+    def __init__(
+        self, inference_steps: int | None = None, 
+        file_inference_time: float | None = None, inference_context: str = 'installed'
+    ) -> None:
+        """
+        The inference budget is given by the maximum number of nodes inferred
+            for each inferred node, and the maximum time in seconds spent on
+            inference for each file. When the budget is exhausted, the node is
+            considered uninferable and the name based coupling is used.
+
+        The inference context is the astroid data kept after each file is
+            parsed. With 'installed', the modules of the analyzed code loaded 
+            by astroid are released after each file, keeping the modules of 
+            the standard library and installed packages to infer the next 
+            files. With 'modules', they are all kept. Unless it is 'all', the
+            caches of astroid are cleared every CLEAR_CACHE_INTERVAL files, so
+            the memory does not grow with the number of parsed files.
+        """
+        super().__init__()
 
-class CodeParser:
-
+        if inference_context not in self.INFERENCE_CONTEXTS:
+            raise ValueError(f'Unknown inference context: {inference_context}')
 
-    
-    def __init__(self) -> None:
+        self.inference_steps = inference_steps
+        self.file_inference_time = file_inference_time
+        self.inference_context = inference_context
 
-        self.classes: dict[str, Class] = {}
+        # First inferred value of each node of the current file, or the error
+        # raised when inferring it
+        self._inference_cache: dict = {}
+        self._inference_deadline: float | None = None
 
-    def _get_class(self, class_name: str) -> Class:
-        """
-        Gets a class from the classes dictionary, or creates a new class if not 
-            found.
-        """
-        return self.classes.get(class_name, Class(class_name))
+        self.stats.update({
+            'inferences': 0,
+            'inference_cache_hits': 0,
+            'inference_fallbacks': 0,
+            'visited_nodes': 0,
+        })
 
     def count_lloc(self, node):
         """
@@ -28,45 +129,51 @@ class CodeParser:
             astroid.FunctionDef, astroid.AsyncFunctionDef, astroid.ClassDef
         )):
             raise ValueError("Node must be a function or method definition")
-        
-        lloc = 0
-        for child in node.body:
-            if isinstance(child, (
-                astroid.Assign, astroid.AugAssign, astroid.AnnAssign, astroid.Expr, astroid.Return,
-                astroid.Raise, astroid.Delete, astroid.Pass, astroid.Break, astroid.Continue,
-                astroid.Global, astroid.Nonlocal, astroid.Assert, astroid.Import, astroid.ImportFrom
-            )):
-                lloc += 1
-            elif isinstance(child, (astroid.If, astroid.For, astroid.While, astroid.Try, astroid.With)):
-                lloc += self.count_lloc_in_compound_statement(child)
-            elif isinstance(child, (astroid.FunctionDef, astroid.AsyncFunctionDef)):
-                lloc += 1 + self.count_lloc(child)
-        return lloc
+        return self._count_statements_lloc(node.body, self._FUNCTION_BODY)
 
     def count_lloc_in_compound_statement(self, node):
         """
-        Recursively count the logical lines of code in compound statements like if, for, while, try, with.
-        """
-        lloc = 1  # Count the compound statement itself
-        for child in node.body:
-            if isinstance(child, (
-                astroid.Assign, astroid.AugAssign, astroid.AnnAssign, astroid.Expr, astroid.Return,
-                astroid.Raise, astroid.Delete, astroid.Pass, astroid.Break, astroid.Continue,
-                astroid.Global, astroid.Nonlocal, astroid.Assert, astroid.Import, astroid.ImportFrom
-            )):
-                lloc += 1
-            elif isinstance(child, (astroid.If, astroid.For, astroid.While, astroid.Try, astroid.With)):
-                lloc += self.count_lloc_in_compound_statement(child)
-        for child in getattr(node, 'orelse', []):
-            if isinstance(child, (
-                astroid.Assign, astroid.AugAssign, astroid.AnnAssign, astroid.Expr, astroid.Return,
-                astroid.Raise, astroid.Delete, astroid.Pass, astroid.Break, astroid.Continue,
-                astroid.Global, astroid.Nonlocal, astroid.Assert, astroid.Import, astroid.ImportFrom
-            )):
-                lloc += 1
-            elif isinstance(child, (astroid.If, astroid.For, astroid.While, astroid.Try, astroid.With)):
-                lloc += self.count_lloc_in_compound_statement(child)
+        Count the logical lines of code in compound statements like if, for, 
+            while, try, with.
+        """
+        return self._count_statements_lloc([node], self._COMPOUND_BODY)
+
+    def _count_statements_lloc(self, statements: list, context: int) -> int:
+        """
+        Counts the logical lines of code of the given statements, which are in
+            the body of a function or of a compound statement, with an explicit
+            stack instead of recursion.
+        """
+        lloc = 0
+        stack = [(statement, context) for statement in statements]
+        while stack:
+            node, context = stack.pop()
+            node_lloc, body_context = self._get_statement_lloc(node, context)
+            lloc += node_lloc
+            if body_context is not None:
+                stack.extend((child, body_context) for child in node.body)
+                stack.extend((child, body_context) for child in getattr(node, 'orelse', ()))
         return lloc
+
+    def _get_statement_lloc(self, node, context: int) -> tuple[int, int | None]:
+        """
+        Returns the logical lines of code of a statement, without the ones of
+            its body, and the context in which the statements of its body and 
+            orelse are counted, or None if they are not counted.
+
+        Compound statements count in any body, but functions only count in the
+            body of a function, with their own body. Other statements, like 
+            classes, do not count.
+        """
+        if context == self._TRAVERSE:
+            return 0, None
+        if isinstance(node, self._SIMPLE_STATEMENTS):
+            return 1, None
+        if isinstance(node, self._COMPOUND_STATEMENTS):
+            return 1, self._COMPOUND_BODY
+        if context == self._FUNCTION_BODY and isinstance(node, astroid.FunctionDef):
+            return 1, self._FUNCTION_BODY
+        return 0, None
     
     @staticmethod
     def is_builtin(node: astroid.NodeNG) -> bool:
@@ -75,18 +182,59 @@ class CodeParser:
         """
         return node.root().name in {"builtins", "__builtin__"}
     
-    @staticmethod
-    def infer_is_builtin(node: astroid.NodeNG) -> bool:
+    def _infer_first(self, node: astroid.NodeNG):
+        """
+        Infers the first value of the given node, or None if no value is 
+            inferred. Inference results are cached for each node of the file.
+
+        If the inference budget is exhausted, Uninferable is returned and the
+            fallback is counted.
+        """
+        if node in self._inference_cache:
+            self.stats['inference_cache_hits'] += 1
+            inferred, error = self._inference_cache[node]
+            if error is not None:
+                raise error
+            return inferred
+
+        if self._inference_deadline is not None and \
+           time.perf_counter() > self._inference_deadline:
+            self.stats['inference_fallbacks'] += 1
+            self._inference_cache[node] = (astroid.Uninferable, None)
+            return astroid.Uninferable
+
+        self.stats['inferences'] += 1
+        if self.inference_steps is not None:
+            context = BoundedInferenceContext(self.inference_steps)
+        else:
+            context = InferenceContext()
+        start = time.perf_counter() if self.timings is not None else None
+        try:
+            inferred = next(node.infer(context), None)
+        except Exception as error:
+            self._inference_cache[node] = (None, error)
+            raise
+        finally:
+            if start is not None:
+                self.timings['inference'] = \
+                    self.timings.get('inference', 0.0) + time.perf_counter() - start
+        if inferred is astroid.Uninferable and \
+           context.nodes_inferred > context.max_inferred:
+            self.stats['inference_fallbacks'] += 1
+
+        self._inference_cache[node] = (inferred, None)
+        return inferred
+
+    def infer_is_builtin(self, node: astroid.NodeNG) -> bool:
         """
         Determines if the given node is part of a built-in module.
         """
         try:
-            return CodeParser.is_builtin(next(node.infer(), None))
+            return CodeParser.is_builtin(self._infer_first(node))
         except astroid.InferenceError:
             return False
     
-    @staticmethod
-    def is_builtin_call(node: astroid.Call) -> bool:
+    def is_builtin_call(self, node: astroid.Call) -> bool:
         try:
             # TODO: Fix this section. Expected to detect built-in calls, but is generating errors
             # if isinstance(node.func, astroid.Attribute):
@@ -96,22 +244,23 @@ class CodeParser:
             #         method_name = node.func.attrname
             #         return method_name in dir(parent)
             # else:
-            inferred = next(node.func.infer())
+            inferred = self._infer_first(node.func)
+            if inferred is None:
+                return False
             return CodeParser.is_builtin(inferred)
         except astroid.InferenceError:
             return False
-        except StopIteration:
-            return False
     
     def _add_called_method(self, node, obj: Model, class_name: str) -> None:
 
         called_method = node.func.as_string()
-        if not CodeParser.is_builtin_call(node):
-            if f"{class_name}." in called_method:
-                called_method = called_method.replace(f"{class_name}.", "")
+        if not self.is_builtin_call(node):
+            bare_name = NameResolver.get_bare_name(class_name)
+            if f"{bare_name}." in called_method:
+                called_method = called_method.replace(f"{bare_name}.", "")
             if f"self." in called_method:
                 called_method = called_method.replace(f"self.", "")
-            obj.called.add(called_method)
+            obj.called.add(intern(called_method))
 
         # Checking if call is a Class method
         if '.' in called_method:
@@ -126,44 +275,54 @@ class CodeParser:
         """
         if isinstance(node, astroid.Name):
             try:
-                inferred = next(node.infer(), None)
+                inferred = self._infer_first(node)
                 if inferred is astroid.Uninferable:
                     raise Exception
                 if isinstance(inferred, astroid.ClassDef):
                     if not CodeParser.is_builtin(inferred):
-                        self.classes[class_name].possible_coupled_classes.add(inferred.name)
+                        # Classes of modules without name are qualified by '.'
+                        self.classes[class_name].possible_coupled_classes.add(
+                            inferred.qname().lstrip('.')
+                        )
             except:
                 # If could not infer, try to detect it at post processing
                 self.classes[class_name].possible_coupled_classes.add(node.name)
     
-    def _extract_used_attributes_and_called_recursive(
-        self, node, obj: Model, class_name
-    ) -> None:
+    def _extract_used_attribute_or_call(self, node, obj: Model, class_name) -> list:
         """
-        Recursively traverse the node and extract the methods that are called 
-            and the attributes that are accessed. 
-        The extracted data is stored in the given dictionary.
+        Extracts the method called by the node, if it is a call, or the 
+            attribute accessed by it, if it is an attribute.
+        Returns the nodes of a call that are extracted next: its arguments and
+            the object of the called method, e.g. self.attribute in 
+            self.attribute.add().
         """
         if isinstance(node, astroid.Call):
-            # Extract function arguments
-            if node.args:
-                for arg in node.args:
-                    self._extract_used_attributes_and_called_recursive(arg, obj, class_name)
-
-            # Exctract attribute if it is a call from an attribute
-            # E.g.: self.attribute.add()
-            if hasattr(node.func, 'expr'):
-                self._extract_used_attributes_and_called_recursive(node.func.expr, obj, class_name)
-
             self._add_called_method(node, obj, class_name)
-
             self._extract_coupled_classes(node.func, class_name)
 
+            call_parts = list(node.args) if node.args else []
+            if hasattr(node.func, 'expr'):
+                call_parts.append(node.func.expr)
+            return call_parts
+
         if isinstance(node, astroid.Attribute):
             attr_name = node.as_string()
             if 'self' in attr_name:
                 attr_name = attr_name.replace("self.", "")
-                obj.accessed_attributes.add(attr_name)
+                obj.accessed_attributes.add(intern(attr_name))
+        return []
+
+    def _extract_used_attributes_and_called(self, node, obj: Model, class_name) -> None:
+        """
+        Traverse the node and its nested calls with an explicit stack, and 
+            extract the methods that are called and the attributes that are 
+            accessed. 
+        The extracted data is stored in the given dictionary.
+        """
+        stack = [node]
+        while stack:
+            self.stats['visited_nodes'] += 1
+            stack.extend(self._extract_used_attribute_or_call(stack.pop(), obj, class_name))
 
     def _extract_self_attributes(self, node, obj: Model, class_name: str) -> None:
         """
@@ -177,7 +336,7 @@ class CodeParser:
             if isinstance(target, astroid.AssignAttr):
                 attr_name = target.attrname
                 try:
-                    attr_instance = next(target.infer(), None).pytype()
+                    attr_instance = self._infer_first(target).pytype()
                     if attr_instance is astroid.Uninferable:
                         attr_instance = None
                     else:
@@ -186,19 +345,21 @@ class CodeParser:
                 except:
                     attr_instance = None
                 self.classes[class_name].attributes.add((
-                    attr_name, attr_instance
+                    intern(attr_name), 
+                    intern(attr_instance) if isinstance(attr_instance, str) 
+                    else attr_instance
                 ))
                 if "self." in attr_name:
                     attr_name = attr_name.replace("self.", "")
-                obj.accessed_attributes.add(attr_name)
+                obj.accessed_attributes.add(intern(attr_name))
             if isinstance(target, astroid.Subscript):
                 # Case of assing of a new dict that calls functions
                 # E.g.: var = {"key": self.method()}
                 if hasattr(node.value, 'items') and not ismethod(node.value.items):
                         for item in node.value.items:
-                            self._extract_used_attributes_and_called_recursive(item[1], obj, class_name)
+                            self._extract_used_attributes_and_called(item[1], obj, class_name)
         if isinstance(node.value, astroid.Attribute):
-            obj.accessed_attributes.add(node.value.attrname)
+            obj.accessed_attributes.add(intern(node.value.attrname))
         if isinstance(node, astroid.AnnAssign):
             coupling_to_add = [node.annotation]
             if hasattr(node.annotation, 'slice'):
@@ -213,10 +374,11 @@ class CodeParser:
         
     def _extract_methods(
         self, node: astroid.FunctionDef, class_name: str
-    ) -> None:
+    ) -> int:
         """
         Extract the methods of the class from the given node and store the 
-            extracted data in the classes dictionary.
+            extracted data in the classes dictionary. Returns the logical lines
+            of code of the method.
 
         The extracted data includes the name of the method, the logical lines of 
             code (LLOC), the number of parameters, the attributes that are 
@@ -224,57 +386,98 @@ class CodeParser:
         """
         method_name = node.name
         method_obj = Method(method_name)
-        method_obj.lloc = self.count_lloc(node)
         method_obj.number_of_parameters = len(node.args.args)
 
-        # Add parameters types to possible coupled classes
-        for arg_type in node.args.nodes_of_class(astroid.Name):
-            if not CodeParser.is_builtin(arg_type):
-                self.classes[class_name].possible_coupled_classes.add(arg_type.name)
-
         # Add return type to possible coupled classes
         if node.returns:
             self._extract_return_type(node.returns, class_name)
-        
-        for method_node in node.body:
-            self._extract_methods_data_recursively(method_node, method_obj, class_name)
+
+        method_obj.lloc = self._extract_methods_data(node, method_obj, class_name)
 
         self.classes[class_name].methods[method_name] = method_obj
+        return method_obj.lloc
 
-    def _extract_methods_data_recursively(
-            self, node, method_obj: Method, class_name: str
-        ) -> None:
+    def _get_traversed_attributes(self, node) -> tuple[str, ...]:
         """
-        Recursively traverse the given method node and extract the methods that
-            are called and the attributes that are accessed.
+        Returns the traversed attributes of the given node, which are the ones
+            it has that are not methods. Constants are not traversed, and 
+            neither are the attributes of the built-in classes proxied by the 
+            literals, like the body of the dict class for a dict literal.
         """
-        if isinstance(node, (astroid.Assign, astroid.AnnAssign)):
-            self._extract_self_attributes(node, method_obj, class_name)
-        
-        if isinstance(node, (astroid.Expr, astroid.Assign, astroid.AnnAssign)):
-            self._extract_used_attributes_and_called_recursive(
-                node.value, method_obj, class_name
+        attributes = CodeParser._node_attributes.get(type(node))
+        if attributes is None:
+            attributes = () if isinstance(node, astroid.Const) else tuple(
+                attribute for attribute in self._TRAVERSED_ATTRIBUTES
+                if (attribute in vars(node) or hasattr(type(node), attribute)) and
+                not ismethod(getattr(node, attribute))
+            )
+            CodeParser._node_attributes[type(node)] = attributes
+        return attributes
+
+    def _extract_methods_data(
+            self, node: astroid.FunctionDef, method_obj: Method, class_name: str
+        ) -> int:
+        """
+        Traverse the given method node in a single pass, with an explicit 
+            stack, and extract the logical lines of code, the types of the 
+            parameters, the methods that are called and the attributes that are
+            accessed. Returns the logical lines of code.
+
+        Each node is visited once: the statements are counted when visited, 
+            and the parts of the calls and the parameters are pushed to the 
+            same stack with their own context.
+        """
+        lloc = 0
+        visited_nodes = 0
+        stack = [(node.args, self._PARAMETERS)]
+        stack.extend((child, self._FUNCTION_BODY) for child in reversed(node.body))
+        while stack:
+            node, context = stack.pop()
+            visited_nodes += 1
+
+            if context == self._CALL_PART:
+                stack.extend(
+                    (call_part, context) for call_part in 
+                    self._extract_used_attribute_or_call(node, method_obj, class_name)
+                )
+                continue
+
+            # Add parameters types to possible coupled classes
+            if context == self._PARAMETERS:
+                if isinstance(node, astroid.Name) and not CodeParser.is_builtin(node):
+                    self.classes[class_name].possible_coupled_classes.add(node.name)
+                stack.extend((child, context) for child in node.get_children())
+                continue
+
+            node_lloc, body_context = self._get_statement_lloc(node, context)
+            lloc += node_lloc
+
+            if isinstance(node, (astroid.Assign, astroid.AnnAssign)):
+                self._extract_self_attributes(node, method_obj, class_name)
+
+            stack.extend(
+                (call_part, self._CALL_PART) for call_part in 
+                self._extract_used_attribute_or_call(node, method_obj, class_name)
             )
 
-        # All of these attributes are traverseable and contain data
-        possible_node_attributes = [
-            'body', 'orelse', 'test', 'value', 'values', 'elts', 'elt', 'iter',
-            'locals', 'generators', 'operand', 'handlers', 'items'
-        ]
-        for attribute in possible_node_attributes:
-            if not isinstance(node, (astroid.Const)) and \
-               hasattr(node, attribute) and \
-               not ismethod(getattr(node, attribute)):
+            children = []
+            for attribute in self._get_traversed_attributes(node):
+                child_context = body_context if body_context is not None and \
+                    attribute in ('body', 'orelse') else self._TRAVERSE
                 # Attribute could be a list or one single element
-                node_attribute_list = \
-                    getattr(node, attribute) if \
-                    isinstance(getattr(node, attribute), (list, tuple)) else \
-                    [getattr(node, attribute)]
-                for node_attribute in node_attribute_list:
-                    if isinstance(node_attribute, tuple):
-                        node_attribute = node_attribute[0]
-                    self._extract_methods_data_recursively(node_attribute, method_obj, class_name)
-                    self._extract_used_attributes_and_called_recursive(node_attribute, method_obj, class_name)
+                node_attribute = getattr(node, attribute, None)
+                for child in node_attribute if isinstance(node_attribute, (list, tuple)) \
+                             else [node_attribute]:
+                    # Pairs of dict items and with items are traversed by the 
+                    # key and the context expression
+                    if isinstance(child, tuple):
+                        child = child[0]
+                    if isinstance(child, astroid.NodeNG):
+                        children.append((child, child_context))
+            stack.extend(reversed(children))
+
+        self.stats['visited_nodes'] += visited_nodes
+        return lloc
 
     def _extract_return_type(self, returns: astroid.Subscript, class_name: str) -> None:
         """
@@ -302,12 +505,12 @@ class CodeParser:
             )
                             
     def _extract_inheritance(
-        self, base: astroid.FunctionDef, class_name: str
+        self, base: astroid.Name | astroid.Attribute, class_name: str
     ) -> None:
         """
         Extract the inheritance information for the given class.
         """
-        base_class = base.name
+        base_class = self._qualify_reference(base.as_string())
         # Create base_class, if doesnt exist
         self.classes[base_class] = self._get_class(base_class)
 
@@ -324,17 +527,22 @@ class CodeParser:
         
         for node in module.body:
             if isinstance(node, astroid.ClassDef):
-                class_name = node.name
+                class_name = self._qualify_class_name(node.name)
                 self.classes[class_name] = self._get_class(class_name)
                 self.classes[class_name].file = module.path
-                self.classes[class_name].lloc = self.count_lloc(node)
+                self.classes[class_name].lloc = 0
 
                 # Extract methods and attributes
                 for class_node in node.body:
 
-                    # Method instantiation
+                    # Method instantiation, whose lines are counted with its data
                     if isinstance(class_node, astroid.FunctionDef):
-                        self._extract_methods(class_node, class_name)
+                        self.classes[class_name].lloc += \
+                            1 + self._extract_methods(class_node, class_name)
+                    else:
+                        self.classes[class_name].lloc += self._count_statements_lloc(
+                            [class_node], self._FUNCTION_BODY
+                        )
 
                     # Attribute assign
                     if isinstance(class_node, (astroid.Assign, astroid.AnnAssign)):
@@ -345,34 +553,124 @@ class CodeParser:
                             targets = class_node.targets
                         for target in targets:
                             attr_name = target.name
-                            self.classes[class_name].variables.add(attr_name)
+                            self.classes[class_name].variables.add(intern(attr_name))
                             
                     # Method call or attribute access
                     if isinstance(class_node, (astroid.Expr, astroid.Assign, astroid.AnnAssign)):
-                        self._extract_used_attributes_and_called_recursive(
+                        self._extract_used_attributes_and_called(
                             class_node.value, self.classes[class_name], class_name
                         )
 
                 # Extract inheritance information
                 for base in node.bases:
-                    if isinstance(base, astroid.Name) and not self.infer_is_builtin(base):
+                    if isinstance(base, (astroid.Name, astroid.Attribute)) and \
+                       not self.infer_is_builtin(base):
                         self._extract_inheritance(base, class_name)
 
-    def extract_code_data(self, code: str, path: str = '') -> None:
+    def _extract_imports(self, module: astroid.Module, is_package: bool) -> None:
+        """
+        Extracts the names bound by the imports of the module, used to qualify
+            the references to classes. The module is traversed in order with an 
+            explicit stack.
+        """
+        stack = [module]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, (astroid.Import, astroid.ImportFrom)):
+                stack.extend(reversed(list(node.get_children())))
+                continue
+            for name, alias in node.names:
+                if isinstance(node, astroid.Import):
+                    self._add_import(name, alias)
+                else:
+                    self._add_import_from(
+                        node.modname, node.level or 0, name, alias, is_package
+                    )
+
+    def extract_code_data(self, code: str, path: str = '', module_name: str = '') -> None:
         """
         Extract the data from the given code string.
+
+        The classes are named by the module name, if given, followed by their 
+            names in the code.
         """
-        module = astroid.parse(code, path=path)
+        start = time.perf_counter() if self.timings is not None else None
+        module = astroid.parse(code, module_name=module_name, path=path)
+        if start is not None:
+            self.timings['ast_parse'] = time.perf_counter() - start
 
-        self._extract_classes_data(module)
+        self.extract_module_data(module, path.endswith('__init__.py'))
+
+    def extract_module_data(self, module: astroid.Module, is_package: bool = False) -> None:
+        """
+        Extract the data from the given module, already parsed by astroid.
+
+        The classes are named by the module name, if any, followed by their 
+            names in the module.
+        """
+        self._start_module(module.name, {
+            node.name for node in module.body if isinstance(node, astroid.ClassDef)
+        })
+        if self.file_inference_time is not None:
+            self._inference_deadline = time.perf_counter() + self.file_inference_time
+        try:
+            self._extract_imports(module, is_package)
+            self._extract_classes_data(module)
+        finally:
+            self._finish_module()
+            # Cached nodes are not shared between files and keep the module alive
+            self._inference_cache = {}
+            self._inference_deadline = None
+            # Named modules are cached by astroid, and would be kept alive too.
+            # A module of the same name loaded by an import of a previous file 
+            # may be outdated, so it is released as well
+            if module.name:
+                CodeParser.release_modules([module.name])
+            if self.inference_context != 'all':
+                self.release_inference_context(self.inference_context)
 
-    def process_possible_coupled_classes(self) -> None:
+    @staticmethod
+    def is_installed_module(module: astroid.Module) -> bool:
+        """
+        Determines if the given module is built-in, or a module of the 
+            standard library or of an installed package.
+        """
+        return not module.file or module.file.startswith(CodeParser._INSTALLED_PATHS)
+
+    @staticmethod
+    def release_modules(module_names: Iterable[str]) -> None:
+        """
+        Releases the modules with the given names loaded by astroid, like the
+            modules of changed files, so they are loaded again when imported.
+        """
+        for module_name in module_names:
+            astroid.MANAGER.astroid_cache.pop(module_name, None)
+
+    @staticmethod
+    def release_inference_context(inference_context: str = 'installed') -> None:
         """
-        Process the possible coupled classes for each class in the dictionary.
+        Releases the astroid data of a parsed file. If the inference context
+            is 'installed', the modules loaded by astroid that are not 
+            installed, like the modules of the analyzed code, are released.
+            Every CLEAR_CACHE_INTERVAL files, the caches of astroid, which 
+            keep the inferred nodes alive, are cleared, and the modules kept
+            are loaded again in the astroid cache, so they are not parsed
+            again.
         """
-        all_classes = set(self.classes.keys())
-        for class_obj in self.classes.values():
-            class_obj.process_possible_coupled_classes(all_classes)
+        astroid_cache = astroid.MANAGER.astroid_cache
+        if inference_context == 'installed':
+            for module_name, module in list(astroid_cache.items()):
+                if not CodeParser.is_installed_module(module):
+                    del astroid_cache[module_name]
+
+        CodeParser._files_since_cache_clear += 1
+        if CodeParser._files_since_cache_clear >= CodeParser.CLEAR_CACHE_INTERVAL:
+            CodeParser._files_since_cache_clear = 0
+            modules = dict(astroid_cache)
+            astroid.MANAGER.clear_cache()
+            # The builtins are rebuilt by the clear
+            for module_name, module in modules.items():
+                astroid_cache.setdefault(module_name, module)
 
 
 # Test execution
@@ -0,0 +1,281 @@
+import os
+import re
+from typing import Iterator
+
+class FileDiscovery:
+    """
+    Discovers the python files of a folder to be analyzed.
+
+    The folders are walked with os.scandir, and excluded folders are pruned
+        before descending into them. A file is analyzed if it matches an
+        include pattern, and neither it nor its folders match an exclude
+        pattern or a rule of the .gitignore files of the folder.
+
+    Patterns without a '/' match the name of a file or folder at any level,
+        and the others match its path relative to the analyzed folder. A
+        trailing '/' only matches folders, as in .gitignore files. As in git,
+        '*' and '?' do not match a '/', and '**' matches any folders.
+    """
+
+    # Patterns of the files analyzed by default
+    DEFAULT_INCLUDE = ['*.py']
+
+    # Patterns of the folders that are never analyzed by default: hidden
+    # folders, virtual environments, installed packages and build outputs
+    DEFAULT_EXCLUDE = [
+        '.*/', '__pycache__/', 'node_modules/', 'site-packages/', 'venv/', 
+        'build/', 'dist/'
+    ]
+
+    # File of the folders of virtual environments, pruned whatever their names
+    VENV_MARKER = 'pyvenv.cfg'
+
+    # Regular expressions of the patterns, compiled when first matched
+    _compiled_patterns: dict[str, re.Pattern] = {}
+
+    def __init__(
+        self, root: str, include: list[str] | None = None,
+        exclude: list[str] | None = None, use_gitignore: bool = True
+    ) -> None:
+
+        self.root = root
+        self.include = list(include) if include else list(self.DEFAULT_INCLUDE)
+        self.exclude = self.DEFAULT_EXCLUDE + list(exclude or ())
+        self.use_gitignore = use_gitignore
+
+        # Counters of the last walk: files scanned and skipped, folders pruned
+        # and symbolic links to folders already visited
+        self.stats: dict[str, int] = {}
+
+        # Rules of the .gitignore files read, by folder relative to the root
+        self._gitignore_rules: dict[str, list[tuple[str, bool, bool, bool]]] = {}
+
+    @staticmethod
+    def parse_gitignore(content: str) -> list[tuple[str, bool, bool, bool]]:
+        """
+        Parses the rules of a .gitignore file. Each rule is a tuple with its
+            pattern, whether it is negated, whether it only matches folders and
+            whether it is anchored to the folder of the file.
+        """
+        rules = []
+        for line in content.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            line = line.removeprefix('\\')
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if line:
+                rules.append((line, negated, dir_only, anchored))
+        return rules
+
+    @staticmethod
+    def compile_pattern(pattern: str) -> re.Pattern:
+        """
+        Compiles a pattern to a regular expression with the wildcards of git: 
+            '*', '?' and the character classes match anything but a '/', a 
+            leading '**/' or an inner '/**/' match any folders, and a trailing
+            '/**' matches everything inside a folder.
+        """
+        regex = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            at_folder_start = i == 0 or pattern[i - 1] == '/'
+            if at_folder_start and pattern.startswith('**/', i):
+                regex.append('(?:.*/)?')
+                i += 3
+            elif at_folder_start and pattern[i:] == '**':
+                regex.append('.*')
+                i += 2
+            elif char == '*':
+                regex.append('[^/]*')
+                i += 1
+            elif char == '?':
+                regex.append('[^/]')
+                i += 1
+            elif char == '[':
+                # A ']' first in the class is part of it
+                end = i + 1
+                if end < len(pattern) and pattern[end] in '!^':
+                    end += 1
+                if end < len(pattern) and pattern[end] == ']':
+                    end += 1
+                end = pattern.find(']', end)
+                if end == -1:
+                    regex.append(re.escape(char))
+                    i += 1
+                    continue
+                chars = pattern[i + 1:end]
+                for special in '\\[]':
+                    chars = chars.replace(special, '\\' + special)
+                if chars[0] in '!^':
+                    regex.append(f'[^/{chars[1:]}]')
+                else:
+                    regex.append(f'(?!/)[{chars}]')
+                i = end + 1
+            else:
+                regex.append(re.escape(char))
+                i += 1
+        return re.compile(''.join(regex) + r'\Z', re.DOTALL)
+
+    @staticmethod
+    def match_pattern(relative_path: str, pattern: str, anchored: bool) -> bool:
+        """
+        Checks if a path, relative to the folder of the pattern and separated
+            by '/', matches a pattern.
+        """
+        compiled = FileDiscovery._compiled_patterns.get(pattern)
+        if compiled is None:
+            compiled = FileDiscovery.compile_pattern(pattern)
+            FileDiscovery._compiled_patterns[pattern] = compiled
+        if not anchored:
+            relative_path = relative_path.rsplit('/', 1)[-1]
+        return compiled.match(relative_path) is not None
+
+    def _match_patterns(self, relative_path: str, is_dir: bool, patterns: list[str]) -> bool:
+        for pattern in patterns:
+            if pattern.endswith('/'):
+                if not is_dir:
+                    continue
+                pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            if self.match_pattern(relative_path, pattern.lstrip('/'), anchored):
+                return True
+        return False
+
+    def _load_gitignore(self, relative_dir: str) -> None:
+        """
+        Reads the rules of the .gitignore file of a folder, if any.
+        """
+        if not self.use_gitignore or relative_dir in self._gitignore_rules:
+            return
+        gitignore_path = os.path.join(self.root, relative_dir, '.gitignore')
+        try:
+            with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as file:
+                self._gitignore_rules[relative_dir] = self.parse_gitignore(file.read())
+        except OSError:
+            self._gitignore_rules[relative_dir] = []
+
+    def _is_gitignored(self, relative_path: str, is_dir: bool) -> bool:
+        """
+        Checks if a path is ignored by the rules of the .gitignore files of its
+            folders. The last matching rule wins, and the rules of the inner
+            folders are applied after the rules of the outer ones.
+        """
+        ignored = False
+        parts = relative_path.split('/')
+        for i in range(len(parts)):
+            relative_dir = '/'.join(parts[:i])
+            self._load_gitignore(relative_dir)
+            path_in_dir = '/'.join(parts[i:])
+            for pattern, negated, dir_only, anchored in \
+                    self._gitignore_rules.get(relative_dir, ()):
+                if dir_only and not is_dir:
+                    continue
+                if self.match_pattern(path_in_dir, pattern, anchored):
+                    ignored = not negated
+        return ignored
+
+    def _is_excluded(self, relative_path: str, is_dir: bool) -> bool:
+        return self._match_patterns(relative_path, is_dir, self.exclude) or \
+            (self.use_gitignore and self._is_gitignored(relative_path, is_dir))
+
+    def _is_virtual_environment(self, relative_dir: str, entries=None) -> bool:
+        """
+        Checks if a folder, relative to the root, is a virtual environment, 
+            from its scanned entries if given. The root is never one.
+        """
+        if not relative_dir:
+            return False
+        if entries is not None:
+            return any(entry.name == self.VENV_MARKER for entry in entries)
+        return os.path.isfile(os.path.join(self.root, relative_dir, self.VENV_MARKER))
+
+    def _count(self, counter: str) -> None:
+        self.stats[counter] = self.stats.get(counter, 0) + 1
+
+    @staticmethod
+    def get_order_key(relative_path: str) -> tuple:
+        """
+        Returns a key that sorts relative file paths in the order they are
+            discovered: the files of each folder by name, followed by its
+            subfolders by name, depth first.
+        """
+        parts = relative_path.replace(os.sep, '/').split('/')
+        return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+    def is_included(self, relative_path: str) -> bool:
+        """
+        Checks if a file, relative to the root, would be discovered. Used for
+            files that may no longer exist, like the files deleted in git.
+        """
+        parts = os.path.normpath(relative_path).replace(os.sep, '/').split('/')
+        for i in range(1, len(parts)):
+            relative_dir = '/'.join(parts[:i])
+            if self._is_excluded(relative_dir, True) or \
+               self._is_virtual_environment(relative_dir):
+                return False
+        relative_path = '/'.join(parts)
+        return self._match_patterns(relative_path, False, self.include) and \
+            not self._is_excluded(relative_path, False)
+
+    def iter_files(self) -> Iterator[str]:
+        """
+        Yields the paths of the python files of the folder and its subfolders,
+            in a stable order. Symbolic links to folders are followed once. The
+            .gitignore files are read again in each walk.
+        """
+        self._gitignore_rules = {}
+        self.stats = {
+            'files_scanned': 0, 'files_skipped': 0, 'dirs_pruned': 0, 'symlink_loops': 0
+        }
+        visited = set()
+        to_visit = [('', self.root)]
+        while to_visit:
+            relative_dir, dir_path = to_visit.pop()
+            try:
+                dir_stat = os.stat(dir_path)
+                # Folders reached again by a symbolic link are not walked twice
+                dir_id = (dir_stat.st_dev, dir_stat.st_ino)
+                if dir_id in visited:
+                    self._count('symlink_loops')
+                    continue
+                visited.add(dir_id)
+                with os.scandir(dir_path) as scanned:
+                    entries = sorted(scanned, key=lambda entry: entry.name)
+            except OSError:
+                print('Failed to read folder: ', dir_path)
+                continue
+            # Virtual environments are pruned whatever their names
+            if self._is_virtual_environment(relative_dir, entries):
+                self._count('dirs_pruned')
+                continue
+
+            subdirs = []
+            for entry in entries:
+                relative_path = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if self._is_excluded(relative_path, True):
+                        self._count('dirs_pruned')
+                    else:
+                        subdirs.append((relative_path, entry.path))
+                    continue
+                self._count('files_scanned')
+                if self._match_patterns(relative_path, False, self.include) and \
+                   not self._is_excluded(relative_path, False):
+                    yield entry.path
+                else:
+                    self._count('files_skipped')
+
+            # Visited in the order of their names, depth first
+            to_visit.extend(reversed(subdirs))
@@ -1,62 +1,397 @@
+import io
 import os
-import glob
-import chardet
+import time
+import tokenize
+from typing import Iterable
 
 from pycktool.model.class_model import Class
-from pycktool.parser.code_parser import CodeParser
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.name_resolver import NameResolver
+from pycktool.parser.parse_cache import ParseCache
+from pycktool.profiling.profiler import Profiler
 
 class FolderParser:
 
-    def __init__(self, path) -> None:
+    # Maximum number of files sent to a worker at once in parallel mode
+    _MAX_CHUNK_SIZE = 64
+
+    # Number of bytes of a file used to detect its encoding, when it is not 
+    # declared
+    _ENCODING_SAMPLE_SIZE = 64 * 1024
+
+    def __init__(
+        self, path, jobs: int = 1, cache_dir: str | None = None,
+        keep_file_records: bool = False, backend: str = 'astroid',
+        parser_options: dict | None = None, profiler: Profiler | None = None,
+        discovery: FileDiscovery | None = None
+    ) -> None:
 
         self.path = path
-        self.parser = CodeParser()
+        self.jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.cache = ParseCache(cache_dir, backend, parser_options) if cache_dir else None
+        self.keep_file_records = keep_file_records
+        self.backend = backend
+        self.parser_options = parser_options
+        # Files are only parsed by this parser in serial runs without cache, 
+        # otherwise it merges the class records of the files, so the backend
+        # is only imported when a file is parsed
+        if self.jobs > 1 or self.cache is not None or keep_file_records:
+            self.parser = BaseCodeParser()
+        else:
+            self.parser = self.create_code_parser(backend, parser_options)
+        self.profiler = profiler if profiler is not None and profiler.enabled else None
+        self.discovery = discovery if discovery is not None else FileDiscovery(path)
+
+        # Class records extracted from each file, if keep_file_records is set
+        self.file_records: dict[str, list[dict]] = {}
         
     @staticmethod
-    def _guess_file_encode(file_path):
+    def create_code_parser(
+        backend: str = 'astroid', parser_options: dict | None = None
+    ) -> BaseCodeParser:
         """
-        Guess the encoding of a file using chardet library.
+        Creates the code parser of the given backend. The astroid backend 
+            infers the coupled classes, the ast backend is faster and resolves 
+            them by name. astroid is only imported if its backend is used.
+
+        The parser options, like the inference budget, are only used by the
+            astroid backend.
+        """
+        if backend == 'ast':
+            from pycktool.parser.ast_code_parser import AstCodeParser
+            return AstCodeParser()
+        if backend == 'astroid':
+            from pycktool.parser.code_parser import CodeParser
+            return CodeParser(**(parser_options or {}))
+        raise ValueError(f'Unknown parser backend: {backend}')
+
+    @staticmethod
+    def _guess_file_encode(content: bytes):
+        """
+        Guess the encoding of a file content using chardet library, from a 
+            sample of its first bytes. chardet is only imported if needed.
         If undefined, utf-8 is default
         """
-        file_encoding = ""
-        with open(file_path, 'rb') as file:
-            file_encoding = chardet.detect(file.read())['encoding']
+        import chardet
+        sample = content[:FolderParser._ENCODING_SAMPLE_SIZE]
+        file_encoding = chardet.detect(sample)['encoding']
         if file_encoding is None:
             return 'utf-8'
         return file_encoding
-    
-    def parse_path(self) -> dict[str, Class]:
 
+    @staticmethod
+    def _get_declared_encoding(content: bytes) -> str:
         """
-        Parses all the python files in the folder and its subfolders.
+        Returns the encoding of a python file content declared by its BOM or 
+            by a PEP 263 coding cookie, or utf-8 if none is declared. Invalid
+            declarations are ignored.
+        """
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+        except SyntaxError:
+            return 'utf-8'
+        return encoding
 
-        Returns:
-            dict: The extracted data.
+    @staticmethod
+    def _decode_file_content(content: bytes, file_path: str) -> str:
+        """
+        Decodes the content of a python file with the encoding declared by its
+            BOM or coding cookie, as the interpreter does. If the content can
+            not be decoded with it, the encoding is detected.
         """
-        for file_path in glob.iglob(os.path.join(self.path, '**', '*.py'), recursive=True):
-            current_code = ""
+        try:
+            return content.decode(FolderParser._get_declared_encoding(content))
+        except (UnicodeDecodeError, LookupError):
+            # Try to detect file encoding
             try:
-                with open(file_path, 'r', encoding='utf_8_sig') as file:
-                    current_code = file.read()
-            except UnicodeDecodeError:
-                # Try to detect file encoding
-                try:
-                    file_encoding = self._guess_file_encode(file_path)
-                    with open(file_path, 'r', encoding=file_encoding) as file:
-                        current_code = file.read()
-                except Exception as e:
-                    print('Failed to read file: ', file_path)
+                return content.decode(FolderParser._guess_file_encode(content))
+            except Exception as e:
+                print('Failed to read file: ', file_path)
+        return ""
+
+    @staticmethod
+    def _read_file(file_path: str) -> bytes:
+        """
+        Reads the content of a file as bytes.
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                return file.read()
+        except OSError as e:
+            print('Failed to read file: ', file_path)
+        return b""
+
+    @staticmethod
+    def _extract_file_data(
+        parser: BaseCodeParser, content: bytes, file_path: str, 
+        timings: dict[str, float] | None = None, module_name: str = ''
+    ) -> bool:
+        """
+        Extracts the data of a python file content with the given parser, 
+            naming its classes by the module name. Returns False if the 
+            content could not be parsed.
+
+        If a timings dictionary is given, the seconds spent decoding and 
+            parsing the content are stored in it.
+        """
+        if timings is None:
+            current_code = FolderParser._decode_file_content(content, file_path)
             try:
-                self.parser.extract_code_data(current_code, file_path)
+                parser.extract_code_data(current_code, file_path, module_name)
             except Exception as e:
                 print('Failed to parse file content: ', file_path)
+                BaseCodeParser.add_stats(parser.stats, {'parse_failures': 1})
+                return False
+            return True
+
+        start = time.perf_counter()
+        current_code = FolderParser._decode_file_content(content, file_path)
+        timings['decode'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parser.timings = timings
+        try:
+            parser.extract_code_data(current_code, file_path, module_name)
+        except Exception as e:
+            print('Failed to parse file content: ', file_path)
+            BaseCodeParser.add_stats(parser.stats, {'parse_failures': 1})
+            return False
+        finally:
+            parser.timings = None
+            timings['parse'] = time.perf_counter() - start
+        return True
 
+    @staticmethod
+    def _read_file_timed(
+        file_path: str, timings: dict[str, float] | None = None
+    ) -> bytes:
+        """
+        Reads the content of a file, storing the seconds spent in the given 
+            timings dictionary, if any.
+        """
+        if timings is None:
+            return FolderParser._read_file(file_path)
+        start = time.perf_counter()
+        content = FolderParser._read_file(file_path)
+        timings['read'] = time.perf_counter() - start
+        return content
+
+    @staticmethod
+    def extract_file_records(
+        file_path: str, cache: ParseCache | None = None, backend: str = 'astroid',
+        parser_options: dict | None = None, stats: dict[str, int] | None = None,
+        timings: dict[str, float] | None = None, module_name: str = ''
+    ) -> list[dict]:
+        """
+        Extracts the data of a single python file as class records, without 
+            processing the possible coupled classes. The classes are named by
+            the module name of the file.
+
+        If a cache is given, the records of unchanged files are loaded from it, 
+            and the records of the other files are stored in it.
+        If a stats dictionary is given, the counters of the extraction are 
+            added to it, and if a timings dictionary is given, the seconds of 
+            each step of the extraction are stored in it.
+        """
+        content = FolderParser._read_file_timed(file_path, timings)
+        return FolderParser.extract_content_records(
+            content, file_path, cache, backend, parser_options, stats, timings,
+            module_name
+        )
+
+    @staticmethod
+    def extract_content_records(
+        content: bytes, file_path: str, cache: ParseCache | None = None,
+        backend: str = 'astroid', parser_options: dict | None = None,
+        stats: dict[str, int] | None = None, timings: dict[str, float] | None = None,
+        module_name: str = ''
+    ) -> list[dict]:
+        """
+        Extracts the data of the content of a python file as class records,
+            as extract_file_records does, for contents that are not read from
+            the file, like the versions of the file stored by git.
+        """
+        if cache is not None:
+            key = cache.get_key(content, file_path, module_name)
+            records = cache.load(key)
+            if stats is not None:
+                counter = 'parse_cache_misses' if records is None else 'parse_cache_hits'
+                stats[counter] = stats.get(counter, 0) + 1
+            if records is not None:
+                return records
+
+        file_parser = FolderParser.create_code_parser(backend, parser_options)
+        parsed = FolderParser._extract_file_data(
+            file_parser, content, file_path, timings, module_name
+        )
+        records = file_parser.export_class_records()
+        if stats is not None:
+            BaseCodeParser.add_stats(stats, file_parser.stats)
+        # Files that fail to parse are not cached, to report them every run.
+        # Neither are files that exhausted the inference budget, since their 
+        # data depends on the budget
+        if cache is not None and parsed and \
+           not file_parser.stats.get('inference_fallbacks'):
+            cache.save(
+                key, records, cache.get_dependencies(content, file_path, module_name)
+            )
+        return records
+
+    @staticmethod
+    def _extract_files_chunk(
+        file_paths: list[str], cache_dir: str | None = None, 
+        backend: str = 'astroid', parser_options: dict | None = None,
+        profile: bool = False, root: str = ''
+    ) -> tuple[list[list[dict]], dict[str, int], list[dict] | None]:
+        """
+        Extracts the class records of each file of a chunk in a worker process,
+            the counters of the extraction and, if profiled, the timings of 
+            each file. The module names of the files are relative to the root.
+        """
+        cache = ParseCache(cache_dir, backend, parser_options) if cache_dir else None
+        stats = {}
+        chunk_timings = [{} for _ in file_paths] if profile else None
+        chunk_records = [
+            FolderParser.extract_file_records(
+                file_path, cache, backend, parser_options, stats,
+                chunk_timings[i] if profile else None,
+                NameResolver.get_module_name(root, file_path) if root else ''
+            ) 
+            for i, file_path in enumerate(file_paths)
+        ]
+        return chunk_records, stats, chunk_timings
+
+    def get_module_name(self, file_path: str) -> str:
+        """
+        Returns the dotted module name of a file of the folder.
+        """
+        return NameResolver.get_module_name(self.path, file_path)
+
+    def _split_in_chunks(self, file_paths: list[str]) -> list[list[str]]:
+        """
+        Splits the files in ordered chunks, small enough to balance the work
+            between the worker processes.
+        """
+        chunk_size = -(-len(file_paths) // (self.jobs * 4))
+        chunk_size = max(1, min(chunk_size, self._MAX_CHUNK_SIZE))
+        return [
+            file_paths[i:i + chunk_size] 
+            for i in range(0, len(file_paths), chunk_size)
+        ]
+
+    def _add_file_records(self, file_path: str, records: list[dict]) -> None:
+        """
+        Merges the class records of a file into the parser data.
+        """
+        if self.keep_file_records:
+            self.file_records[file_path] = records
+        self.parser.merge_class_records(records)
+    
+    def parse_path(self) -> dict[str, Class]:
+
+        """
+        Parses all the python files in the folder and its subfolders.
+
+        The files are found by the file discovery of the parser, and its 
+            counters are added to the parser stats.
+
+        Returns:
+            dict: The extracted data.
+        """
+        file_paths = self.discovery.iter_files()
+        self._parse_file_paths(file_paths)
+        BaseCodeParser.add_stats(self.parser.stats, self.discovery.stats)
         self.parser.process_possible_coupled_classes()
             
         return self.parser.classes
 
+    def parse_files(self, file_paths: Iterable[str]) -> dict[str, Class]:
+        """
+        Parses the given python files, named by their modules relative to the
+            folder.
+
+        Returns:
+            dict: The extracted data.
+        """
+        self._parse_file_paths(file_paths)
+        self.parser.process_possible_coupled_classes()
+        return self.parser.classes
+
+    def extract_files_records(self, file_paths: Iterable[str]) -> dict[str, list[dict]]:
+        """
+        Extracts the class records of the given python files, named by their
+            modules relative to the folder, without processing the possible
+            coupled classes. The parser must keep the file records.
+
+        Returns:
+            dict: The class records of each file.
+        """
+        if not self.keep_file_records:
+            raise ValueError('The file records are only extracted if they are kept')
+        self._parse_file_paths(file_paths)
+        return self.file_records
+
+    def _parse_file_paths(self, file_paths: Iterable[str]) -> None:
+        """
+        Extracts the data of the given files into the parser data, without
+            processing the possible coupled classes.
+
+        If more than one job is configured, the files are parsed by a pool of
+            processes and the results are merged in the files order, so the
+            extracted data is the same of a serial run.
+        If a cache directory is configured, only files changed since they were
+            cached are parsed.
+        """
+        if self.jobs > 1:
+            chunks = self._split_in_chunks(list(file_paths))
+            cache_dirs = [self.cache_dir] * len(chunks)
+            backends = [self.backend] * len(chunks)
+            options = [self.parser_options] * len(chunks)
+            profile = [self.profiler is not None] * len(chunks)
+            roots = [self.path] * len(chunks)
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                chunks_results = executor.map(
+                    self._extract_files_chunk, chunks, cache_dirs, backends, options,
+                    profile, roots
+                )
+                for chunk, (chunk_records, stats, chunk_timings) in zip(
+                    chunks, chunks_results
+                ):
+                    for file_path, records in zip(chunk, chunk_records):
+                        self._add_file_records(file_path, records)
+                    BaseCodeParser.add_stats(self.parser.stats, stats)
+                    if chunk_timings is not None:
+                        for file_path, timings in zip(chunk, chunk_timings):
+                            self.profiler.add_file(file_path, timings)
+        elif self.cache is not None or self.keep_file_records:
+            for file_path in file_paths:
+                timings = {} if self.profiler is not None else None
+                self._add_file_records(
+                    file_path, 
+                    self.extract_file_records(
+                        file_path, self.cache, self.backend, 
+                        self.parser_options, self.parser.stats, timings,
+                        self.get_module_name(file_path)
+                    )
+                )
+                if timings is not None:
+                    self.profiler.add_file(file_path, timings)
+        else:
+            for file_path in file_paths:
+                timings = {} if self.profiler is not None else None
+                content = self._read_file_timed(file_path, timings)
+                self._extract_file_data(
+                    self.parser, content, file_path, timings, 
+                    self.get_module_name(file_path)
+                )
+                if timings is not None:
+                    self.profiler.add_file(file_path, timings)
+
 if __name__ == "__main__":
 
     path = 'F:\\CEFET\\TCC\\PyCKTools\\pycktools\\example' 
     fp = FolderParser(path)
-    fp.parse_path()
\ No newline at end of file
+    fp.parse_path()
@@ -0,0 +1,115 @@
+import os
+
+from pycktool.model.class_model import Class
+
+class NameResolver:
+    """
+    Resolves the references to classes of the analyzed code to the 
+        module-qualified names of the classes.
+
+    References are qualified by the parsers with the imports and the classes 
+        of their modules. A reference that is not the name of a known class is
+        resolved to the only class defined in the analyzed files whose 
+        qualified name ends with the reference, or that ends the reference, 
+        like the absolute imports of a package analyzed from its own folder.
+        Ambiguous references are not resolved.
+    """
+
+    def __init__(self, classes: dict[str, Class]) -> None:
+
+        self.class_names = set(classes.keys())
+
+        # Qualified names of the classes defined in the analyzed files, by 
+        # bare name
+        self._defined_classes: dict[str, list[str]] = {}
+        for class_name, class_obj in classes.items():
+            if class_obj.file:
+                self._defined_classes.setdefault(
+                    self.get_bare_name(class_name), []
+                ).append(class_name)
+
+    @staticmethod
+    def get_bare_name(class_name: str) -> str:
+        """
+        Returns the name of a class without its module.
+        """
+        return class_name.rsplit('.', 1)[-1]
+
+    def resolve_defined(self, reference: str) -> str | None:
+        """
+        Resolves a reference to a class defined in the analyzed files, or 
+            returns None if there is no such class or it is ambiguous.
+        """
+        matches = [
+            class_name 
+            for class_name in self._defined_classes.get(self.get_bare_name(reference), ())
+            if class_name == reference or class_name.endswith('.' + reference) 
+            or reference.endswith('.' + class_name)
+        ]
+        if len(matches) == 1:
+            return matches[0]
+        if reference in matches:
+            return reference
+        return None
+
+    def resolve(self, reference: str) -> str | None:
+        """
+        Resolves a reference to the name of a known class, including the
+            placeholders of base classes that are not defined in the analyzed
+            files, or returns None if it can not be resolved.
+        """
+        if reference in self.class_names:
+            return reference
+        return self.resolve_defined(reference)
+
+    @staticmethod
+    def get_module_name(root: str, file_path: str) -> str:
+        """
+        Returns the dotted name of the module of a file, from its path relative
+            to the analyzed folder. If the folder is itself a package, the 
+            names of the packages that contain it are included, so the module
+            names match the absolute imports of the package.
+        """
+        root = os.path.abspath(root)
+        relative_path = os.path.relpath(os.path.abspath(file_path), root)
+        parts = NameResolver.path_to_module_name(relative_path).split('.')
+
+        package_path = root
+        while os.path.isfile(os.path.join(package_path, '__init__.py')):
+            package_path, package_name = os.path.split(package_path)
+            if not package_name:
+                break
+            parts.insert(0, package_name)
+
+        return '.'.join(part for part in parts if part not in ('', '.'))
+
+    @staticmethod
+    def path_to_module_name(relative_path: str) -> str:
+        """
+        Returns the dotted name of the module of a relative file path, like
+            'package/module.py', without the package names of its folder.
+        """
+        parts = os.path.splitext(os.path.normpath(relative_path))[0] \
+            .replace(os.sep, '/').split('/')
+        if parts[-1] == '__init__':
+            parts.pop()
+        return '.'.join(part for part in parts if part not in ('', '.'))
+
+    @staticmethod
+    def resolve_relative_import(
+        module_name: str, is_package: bool, imported_module: str | None, level: int
+    ) -> str:
+        """
+        Returns the absolute name of a module imported by the given module, 
+            with the level of a relative import.
+        """
+        if not level:
+            return imported_module or ''
+
+        package = module_name.split('.') if module_name else []
+        if not is_package:
+            package = package[:-1]
+        package = package[:max(0, len(package) - (level - 1))]
+        if imported_module:
+            package.append(imported_module)
+        return '.'.join(package)
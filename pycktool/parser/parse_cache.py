@@ -0,0 +1,203 @@
+import os
+import ast
+import json
+import hashlib
+
+from pycktool import __version__
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.name_resolver import NameResolver
+
+class ParseCache:
+    """
+    Stores the class records of each parsed file, keyed by its content and 
+        by the options of the parser that extracted them.
+
+    The astroid backend infers the classes used by a file from the modules it
+        imports, so its entries also store the hash of the analyzed files 
+        imported by the file, and are not loaded if any of them changed. 
+        Changes to the modules imported by those modules are not detected, so
+        the records of a file whose inferred classes come from them can be 
+        stale until the file changes.
+    """
+
+    def __init__(
+        self, cache_dir: str, backend: str = 'astroid', 
+        parser_options: dict | None = None
+    ) -> None:
+
+        self.cache_dir = cache_dir
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # Versions of the tools and options of the parser used to extract the
+        # cached data. The options are only used by astroid, and its 
+        # inference context only changes the memory used
+        self._versions = [__version__, BaseCodeParser.RECORDS_VERSION, backend]
+        self._track_imports = backend == 'astroid'
+        if self._track_imports:
+            self._versions.append(self._get_astroid_version())
+            self._versions.append(json.dumps(
+                {
+                    name: value for name, value in (parser_options or {}).items()
+                    if name != 'inference_context'
+                }, 
+                sort_keys=True
+            ))
+
+        # Hashes of the imported files, by path, with their size and 
+        # modification time
+        self._imported_hashes: dict[str, tuple[tuple[int, int], str]] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _get_astroid_version() -> str:
+        """
+        Returns the version of astroid from its package metadata, without 
+            importing it, so runs where every file is cached do not load it.
+        """
+        from importlib import metadata
+        try:
+            return metadata.version('astroid')
+        except metadata.PackageNotFoundError:
+            import astroid
+            return astroid.__version__
+
+    @staticmethod
+    def get_imported_files(content: bytes, file_path: str, module_name: str) -> list[str]:
+        """
+        Returns the paths of the analyzed files imported by a file, found from
+            its module name and the folder that contains its top package.
+        """
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return []
+
+        is_package = os.path.basename(file_path) == '__init__.py'
+        root = os.path.dirname(os.path.abspath(file_path))
+        for _ in range(module_name.count('.') + is_package):
+            root = os.path.dirname(root)
+
+        imported_modules = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported_modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                imported_module = NameResolver.resolve_relative_import(
+                    module_name, is_package, node.module, node.level
+                )
+                # The imported names can be modules of a package
+                imported_modules.add(imported_module)
+                imported_modules.update(
+                    f'{imported_module}.{alias.name}' if imported_module else alias.name
+                    for alias in node.names
+                )
+
+        imported_files = set()
+        for imported_module in imported_modules:
+            if not imported_module:
+                continue
+            module_path = os.path.join(root, *imported_module.split('.'))
+            for imported_path in (module_path + '.py', os.path.join(module_path, '__init__.py')):
+                if os.path.isfile(imported_path):
+                    imported_files.add(imported_path)
+        imported_files.discard(os.path.abspath(file_path))
+        return sorted(imported_files)
+
+    def get_dependencies(
+        self, content: bytes, file_path: str, module_name: str = ''
+    ) -> list[str]:
+        """
+        Returns the files whose changes invalidate the records of a file: the
+            analyzed files it imports with the astroid backend, and none with
+            the ast backend, whose records only depend on the file.
+        """
+        if not self._track_imports or not module_name:
+            return []
+        return self.get_imported_files(content, file_path, module_name)
+
+    def _get_imported_hash(self, file_path: str) -> str:
+        """
+        Returns the hash of the content of an imported file, hashing it again 
+            only if its size or modification time changed.
+        """
+        try:
+            stat = os.stat(file_path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            stored = self._imported_hashes.get(file_path)
+            if stored is not None and stored[0] == signature:
+                return stored[1]
+            with open(file_path, 'rb') as file:
+                file_hash = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            return ''
+        self._imported_hashes[file_path] = (signature, file_hash)
+        return file_hash
+
+    def get_key(self, content: bytes, file_path: str, module_name: str = '') -> str:
+        """
+        Returns the cache key of a file, computed from its content, its path,
+            its module name, the format of the records, the parser backend 
+            and options, and the versions of PyCKTool and astroid used to 
+            extract its data.
+        """
+        file_hash = hashlib.sha256(content)
+        file_hash.update(b'\0' + os.path.abspath(file_path).encode('utf-8'))
+        file_hash.update(b'\0' + module_name.encode('utf-8'))
+        for version in self._versions:
+            file_hash.update(b'\0' + version.encode('utf-8'))
+        return file_hash.hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def load(self, key: str) -> list[dict] | None:
+        """
+        Loads the class records stored for the given key. Returns None if 
+            there is no valid entry for the key, or if any of the files its
+            records depend on changed.
+        """
+        try:
+            with open(self._get_entry_path(key), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            records = entry['records']
+            dependencies = entry['dependencies']
+        except (OSError, ValueError, TypeError, KeyError):
+            self.misses += 1
+            return None
+        if any(
+            self._get_imported_hash(file_path) != file_hash 
+            for file_path, file_hash in dependencies.items()
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return records
+
+    def save(
+        self, key: str, records: list[dict], dependencies: list[str] | None = None
+    ) -> None:
+        """
+        Stores the class records of a file for the given key, with the hashes
+            of the files its records depend on.
+        """
+        entry = {
+            'records': records,
+            'dependencies': {
+                file_path: self._get_imported_hash(file_path) 
+                for file_path in dependencies or ()
+            },
+        }
+        entry_path = self._get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # Write to a temporary file first, so concurrent workers and 
+        # interrupted runs never leave a partial entry behind
+        temp_path = f'{entry_path}.{os.getpid()}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(entry, file)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            print('Failed to write cache entry: ', entry_path)
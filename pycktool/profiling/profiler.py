@@ -0,0 +1,219 @@
+import sys
+import time
+import heapq
+from contextlib import contextmanager, nullcontext
+
+def get_peak_rss(who: str = 'self') -> float | None:
+    """
+    Returns the peak resident set size in MB of the process, since it started
+        or since its peak was reset, or of its largest finished child process
+        if who is 'children'. Returns None if it is not available in the 
+        platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(
+        resource.RUSAGE_CHILDREN if who == 'children' else resource.RUSAGE_SELF
+    ).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak resident set size of the process to its current resident
+        set size. Returns whether the platform supports it, which only Linux 
+        does.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        return False
+    return True
+
+class PeakMemory:
+    """
+    Context measuring the peak resident set size of the process while it is 
+        open, and the one of its child processes finished while it is open, 
+        like the workers of a process pool.
+
+    The peak of the process is reset when the context is entered where the
+        platform supports it. Otherwise, the peak is only known if the block
+        raises the peak of the process, and is None if it does not.
+    """
+
+    # Contexts open in the process, whose peaks are kept when another one 
+    # resets the peak of the process
+    _open: list['PeakMemory'] = []
+
+    def __init__(self) -> None:
+
+        # Peak RSS in MB of the process and of its finished children while
+        # the context is open, or None if unknown or if no child finished
+        self.peak_rss: float | None = None
+        self.children_peak_rss: float | None = None
+
+        self._start_peak_rss: float | None = None
+        self._start_children_peak_rss: float | None = None
+        self._reset = False
+
+    @staticmethod
+    def _update_open_peaks() -> None:
+        peak_rss = get_peak_rss()
+        for memory in PeakMemory._open:
+            if memory._reset and peak_rss is not None:
+                memory.peak_rss = max(memory.peak_rss or 0.0, peak_rss)
+
+    def __enter__(self) -> 'PeakMemory':
+        self._update_open_peaks()
+        self._start_peak_rss = get_peak_rss()
+        self._start_children_peak_rss = get_peak_rss('children')
+        self._reset = reset_peak_rss()
+        PeakMemory._open.append(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._update_open_peaks()
+        PeakMemory._open.remove(self)
+        if not self._reset:
+            peak_rss = get_peak_rss()
+            if peak_rss is not None and peak_rss > self._start_peak_rss:
+                self.peak_rss = peak_rss
+        children_peak_rss = get_peak_rss('children')
+        if children_peak_rss is not None and \
+           children_peak_rss > self._start_children_peak_rss:
+            self.children_peak_rss = children_peak_rss
+
+class Profiler:
+    """
+    Collects the time and peak memory of each phase of a run, the time of 
+        each step of each parsed file, and the counters of the parsers.
+
+    A disabled profiler collects nothing: its phases are empty contexts, and 
+        the parsers only time the files when the profiler is enabled.
+    """
+
+    # Steps of the extraction of a file, in the order they happen
+    FILE_STEPS = ['read', 'decode', 'ast_parse', 'inference', 'extraction']
+
+    def __init__(self, enabled: bool = False) -> None:
+
+        self.enabled = enabled
+
+        # Time in seconds of each phase, and peak RSS in MB of the process 
+        # and of the worker processes finished during the phase
+        self.phases: dict[str, dict] = {}
+
+        # Seconds of each step of each parsed file, by file path
+        self.files: dict[str, dict[str, float]] = {}
+
+        self.counters: dict[str, int] = {}
+
+    def phase(self, name: str):
+        """
+        Returns a context that times the given phase of the run.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timed_phase(name)
+
+    @contextmanager
+    def _timed_phase(self, name: str):
+        start = time.perf_counter()
+        memory = PeakMemory()
+        try:
+            with memory:
+                yield
+        finally:
+            phase = self.phases.setdefault(
+                name, {'seconds': 0.0, 'peak_rss': None, 'workers_peak_rss': None}
+            )
+            phase['seconds'] += time.perf_counter() - start
+            for key, peak_rss in (
+                ('peak_rss', memory.peak_rss), 
+                ('workers_peak_rss', memory.children_peak_rss)
+            ):
+                if peak_rss is not None:
+                    phase[key] = max(phase[key] or 0.0, peak_rss)
+
+    def add_file(self, file_path: str, timings: dict[str, float]) -> None:
+        """
+        Adds the timings of the steps of a parsed file. The extraction time is
+            the parse time not spent parsing the code or inferring.
+        """
+        timings = dict(timings)
+        if 'parse' in timings:
+            timings['extraction'] = max(
+                0.0, 
+                timings.pop('parse') - timings.get('ast_parse', 0.0) - 
+                timings.get('inference', 0.0)
+            )
+        self.files[file_path] = timings
+
+    def add_counters(self, counters: dict[str, int]) -> None:
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @staticmethod
+    def _get_rate(hits: int, misses: int) -> str:
+        if hits + misses == 0:
+            return '-'
+        return f'{hits / (hits + misses):.1%}'
+
+    def report(self, slowest_files: int = 10) -> str:
+        """
+        Returns the report of the run, with the time and peak memory of each
+            phase, the slowest files and the counters.
+        """
+        lines = ['Phases:']
+        for name, phase in self.phases.items():
+            peak_rss = phase['peak_rss']
+            workers_peak_rss = phase['workers_peak_rss']
+            lines.append(
+                f'  {name:<12} {phase["seconds"]:>10.3f} s   peak RSS ' + 
+                (f'{peak_rss:.1f} MB' if peak_rss is not None else '-') +
+                (
+                    f'   workers peak RSS {workers_peak_rss:.1f} MB' 
+                    if workers_peak_rss is not None else ''
+                )
+            )
+
+        totals = {
+            step: sum(timings.get(step, 0.0) for timings in self.files.values()) 
+            for step in self.FILE_STEPS
+        }
+        lines.append(f'Files: {len(self.files)}')
+        lines.extend(
+            f'  {step:<12} {seconds:>10.3f} s' for step, seconds in totals.items()
+        )
+
+        lines.append('Slowest files:')
+        slowest = heapq.nlargest(
+            slowest_files, self.files.items(), key=lambda item: sum(item[1].values())
+        )
+        for file_path, timings in slowest:
+            steps = ', '.join(
+                f'{step} {timings[step]:.3f}' for step in self.FILE_STEPS 
+                if step in timings
+            )
+            lines.append(f'  {sum(timings.values()):>10.3f} s   {file_path} ({steps})')
+
+        lines.append('Counters:')
+        lines.extend(
+            f'  {name:<24} {value:>10}' for name, value in self.counters.items()
+        )
+        lines.append(
+            '  inference cache hit rate ' + self._get_rate(
+                self.counters.get('inference_cache_hits', 0), 
+                self.counters.get('inferences', 0)
+            )
+        )
+        lines.append(
+            '  parse cache hit rate     ' + self._get_rate(
+                self.counters.get('parse_cache_hits', 0), 
+                self.counters.get('parse_cache_misses', 0)
+            )
+        )
+        return '\n'.join(lines)
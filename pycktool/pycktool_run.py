@@ -1,25 +1,369 @@
+import os
+
+from pycktool.incremental.snapshot import Snapshot
 from pycktool.output_handler.output_handler import OutputHandler
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.base_code_parser import BaseCodeParser
 from pycktool.parser.folder_parser import FolderParser
+from pycktool.parser.name_resolver import NameResolver
 from pycktool.metrics.metrics import Metrics
+from pycktool.profiling.profiler import Profiler
+from pycktool.results.analysis_results import AnalysisResults
+from pycktool.sharding.shard import Shard
 
 class PyCKTool:
 
     @staticmethod
-    def run(path: str, output_format: str= 'csv', prefix: str= '') -> None:
+    def get_parser_options(
+        backend: str, inference_steps: int | None, inference_timeout: float | None,
+        inference_context: str = 'installed'
+    ) -> dict | None:
+        """
+        Returns the options of the code parser of the backend.
+        """
+        if backend == 'astroid' and \
+           (inference_steps or inference_timeout or inference_context != 'installed'):
+            return {
+                'inference_steps': inference_steps, 
+                'file_inference_time': inference_timeout,
+                'inference_context': inference_context
+            }
+        return None
+
+    @staticmethod
+    def get_socket_path(path: str, socket_path: str | None = None) -> str:
+        """
+        Returns the socket of the daemon of the analyzed path, by default a
+            hidden file in the path.
+        """
+        return socket_path or os.path.join(path, '.pycktool.sock')
+
+    @staticmethod
+    def serve(
+        path: str, socket_path: str | None= None, cache_dir: str | None= None,
+        backend: str= 'astroid', inference_steps: int | None= None,
+        inference_timeout: float | None= None, include: list[str] | None= None,
+        exclude: list[str] | None= None, use_gitignore: bool= True,
+        poll_interval: float= 1.0, inference_context: str= 'modules'
+    ) -> None:
+        """
+        Runs the analysis daemon of the path until it receives a shutdown 
+            query.
+
+        The inference context is 'modules' by default, so the modules of the
+            analyzed code stay loaded by astroid to infer the changed files, 
+            at the cost of the memory of these modules. With 'installed', 
+            they are loaded again after each file, and with 'all', the 
+            astroid caches are kept too, and grow with each parsed file.
+        """
+        from pycktool.daemon.analysis_daemon import AnalysisDaemon
+        daemon = AnalysisDaemon(
+            path, backend, 
+            PyCKTool.get_parser_options(
+                backend, inference_steps, inference_timeout, inference_context
+            ),
+            FileDiscovery(path, include, exclude, use_gitignore), cache_dir, 
+            poll_interval
+        )
+        daemon.serve(PyCKTool.get_socket_path(path, socket_path))
+        print('PyCKTool daemon stopped')
+
+    @staticmethod
+    def analyze(
+        path: str | None= None, files: list[str] | None= None,
+        sources: dict[str, str] | None= None, backend: str= 'astroid', jobs: int= 1,
+        cache_dir: str | None= None, inference_steps: int | None= None,
+        inference_timeout: float | None= None, include: list[str] | None= None,
+        exclude: list[str] | None= None, use_gitignore: bool= True,
+        inference_context: str= 'installed', engine: str= 'python'
+    ) -> AnalysisResults:
+        """
+        Analyzes python code and returns the results in memory, without 
+            writing any file.
+
+        The code is given by one of:
+            path: A folder, whose python files are found as in the command 
+                line. If files are also given, only they are analyzed, with 
+                their module names relative to the folder.
+            files: A list of python files, with their module names relative 
+                to their common folder.
+            sources: The source code of each module, by its relative file 
+                path, like {'package/module.py': 'class A: ...'}.
+
+        The metrics of each class are calculated when the results are 
+            iterated, so they can be consumed lazily, except with the numpy
+            engine, which calculates the metrics of all the classes at once.
+        """
+        if sources is not None and (path is not None or files is not None):
+            raise ValueError('Sources can not be analyzed with a path or files')
+        if sources is None and path is None and not files:
+            raise ValueError('A path, files or sources must be given')
+
+        parser_options = PyCKTool.get_parser_options(
+            backend, inference_steps, inference_timeout, inference_context
+        )
+
+        if sources is not None:
+            root = '.'
+            parser = FolderParser.create_code_parser(backend, parser_options)
+            for file_path, code in sources.items():
+                try:
+                    parser.extract_code_data(
+                        code, file_path, NameResolver.path_to_module_name(file_path)
+                    )
+                except Exception as e:
+                    print('Failed to parse file content: ', file_path)
+                    BaseCodeParser.add_stats(parser.stats, {'parse_failures': 1})
+            parser.process_possible_coupled_classes()
+        else:
+            root = path if path is not None else os.path.commonpath([
+                os.path.dirname(os.path.abspath(file_path)) for file_path in files
+            ])
+            fp = FolderParser(
+                root, jobs, cache_dir, backend=backend, parser_options=parser_options,
+                discovery=FileDiscovery(root, include, exclude, use_gitignore)
+            )
+            if files is not None:
+                fp.parse_files(files)
+            else:
+                fp.parse_path()
+            parser = fp.parser
+
+        return AnalysisResults(
+            parser.classes, OutputHandler.get_class_files(parser.classes, root),
+            parser.stats, engine
+        )
+
+    @staticmethod
+    def extract_shard(
+        path: str, shard_output: str, shard: str= '0/1', jobs: int= 1,
+        cache_dir: str | None= None, backend: str= 'astroid',
+        inference_steps: int | None= None, inference_timeout: float | None= None,
+        include: list[str] | None= None, exclude: list[str] | None= None,
+        use_gitignore: bool= True, inference_context: str= 'installed'
+    ) -> None:
+        """
+        Extracts the class records of the files of a shard of the path, given
+            as 'INDEX/COUNT', and saves them to the shard output file, to be
+            merged with the other shards by PyCKTool.merge. The files of the
+            path are split in COUNT shards by the hash of their paths.
+        """
+        index, count = Shard.parse_shard(shard)
+        discovery = FileDiscovery(path, include, exclude, use_gitignore)
+        file_paths = Shard.select_files(path, discovery.iter_files(), index, count)
+
+        parser_options = PyCKTool.get_parser_options(
+            backend, inference_steps, inference_timeout, inference_context
+        )
+        fp = FolderParser(
+            path, jobs, cache_dir, keep_file_records=True, backend=backend,
+            parser_options=parser_options, discovery=discovery
+        )
+        file_records = fp.extract_files_records(file_paths)
+        Shard.from_file_records(
+            path, file_records, fp.parser.stats, backend, index, count, parser_options
+        ).save(shard_output)
+        print(f'PyCKTool shard {index}/{count} saved: {len(file_records)} files')
 
-        fp = FolderParser(path)
-        fp.parse_path()
+    @staticmethod
+    def merge(
+        shard_paths: list[str], output_format: str= 'csv', prefix: str= '',
+        root: str= '.', engine: str= 'python'
+    ) -> None:
+        """
+        Merges the shards saved by PyCKTool.extract_shard, resolving the 
+            coupling across them, and saves the metrics of all the classes as
+            PyCKTool.run does. The root is the folder of the analyzed files, 
+            only used to hash them in the sqlite output.
+        """
+        shards = [Shard.load(shard_path) for shard_path in shard_paths]
+        parser = Shard.merge(shards)
 
-        metrics = Metrics(fp.parser.classes)
-        results_class, results_methods = metrics.calculate_all_metrics()
+        metrics = Metrics.create(parser.classes, engine)
+        results_class = metrics.iter_class_metrics()
+        results_methods = metrics.iter_method_metrics()
+        for cycle in metrics.inheritance_cycles:
+            print('Circular inheritance: ', ' -> '.join(cycle + cycle[:1]))
+        if parser.stats.get('inference_fallbacks'):
+            print(
+                'Inference budget exhausted, coupled classes resolved by name: ', 
+                parser.stats['inference_fallbacks']
+            )
 
         OutputHandler.save_results(
-            results_class, results_methods, 'results', output_format, prefix
+            results_class, results_methods, 'results', output_format, prefix,
+            shards[0].repository if shards else '',
+            OutputHandler.get_class_files(parser.classes, '.'),
+            {
+                class_name: class_obj.coupled_classes 
+                for class_name, class_obj in parser.classes.items()
+            },
+            root, f'{shards[0].backend if shards else ""} {engine}'
         )
+        print('PyCKTool merge completed')
+
+    @staticmethod
+    def history(
+        path: str, revision_range: str= 'HEAD', output_format: str= 'csv',
+        prefix: str= '', cache_dir: str | None= None, backend: str= 'ast',
+        inference_steps: int | None= None, inference_timeout: float | None= None,
+        include: list[str] | None= None, exclude: list[str] | None= None,
+        use_gitignore: bool= True, inference_context: str= 'installed',
+        profile: bool= False, engine: str= 'python'
+    ) -> None:
+        """
+        Calculates the metrics of the path at each commit of the git revision
+            range, following the first parent of the merges, and saves them as
+            a time series to CSV or JSON Lines files, with the commit hash and
+            date of each row. The files are read from the git object store, 
+            and each version of a file is only parsed once.
+
+        The backend is ast by default. The files of each commit are parsed 
+            from the object store, but astroid infers the modules they import
+            from the files checked out in the path, so with astroid the 
+            coupling and inheritance across modules mix the analyzed commit 
+            with the checkout.
+        """
+        # git and the history writer are only needed by history runs
+        from pycktool.history.git_history import GitHistory
+        from pycktool.output_handler.history_output import HistoryOutput
+        if output_format not in HistoryOutput.FORMATS:
+            raise ValueError(
+                f'History results are saved as {" or ".join(HistoryOutput.FORMATS)}, '
+                f'not {output_format}'
+            )
+
+        if backend == 'astroid':
+            print(
+                'The astroid backend infers the imported modules from the checked '
+                'out files, not from each commit - use the ast backend to resolve '
+                'them by name'
+            )
+
+        profiler = Profiler(profile)
+        history = GitHistory(
+            path, backend, 
+            PyCKTool.get_parser_options(
+                backend, inference_steps, inference_timeout, inference_context
+            ),
+            FileDiscovery(path, include, exclude, use_gitignore), cache_dir, engine
+        )
+        with profiler.phase('history'):
+            commits = HistoryOutput.save_results(
+                history.iter_results(revision_range),
+                os.path.join(os.getcwd(), f'{prefix}history-classes.{output_format}'),
+                os.path.join(os.getcwd(), f'{prefix}history-methods.{output_format}'),
+                output_format
+            )
+
+        if profile:
+            profiler.add_counters(history.stats)
+            print(profiler.report())
+
+        print(
+            f'PyCKTool history completed: {commits} commits, '
+            f'{history.stats.get("history_files_parsed", 0)} file versions parsed'
+        )
+
+    @staticmethod
+    def run(
+        path: str, output_format: str= 'csv', prefix: str= '', jobs: int= 1,
+        cache_dir: str | None= None, snapshot_path: str | None= None,
+        revision_range: str | None= None, backend: str= 'astroid',
+        inference_steps: int | None= None, inference_timeout: float | None= None,
+        profile: bool= False, include: list[str] | None= None,
+        exclude: list[str] | None= None, use_gitignore: bool= True,
+        inference_context: str= 'installed', engine: str= 'python'
+    ) -> None:
+
+        profiler = Profiler(profile)
+        discovery = FileDiscovery(path, include, exclude, use_gitignore)
+        parser_options = PyCKTool.get_parser_options(
+            backend, inference_steps, inference_timeout, inference_context
+        )
+
+        snapshot = None
+        if snapshot_path and revision_range and os.path.exists(snapshot_path):
+            try:
+                snapshot = Snapshot.load(snapshot_path)
+            except ValueError as e:
+                print(e, '- running a full analysis')
+            if snapshot is not None and snapshot.backend != backend:
+                print('Snapshot was created with another backend - running a full analysis')
+                snapshot = None
+
+        if snapshot is not None:
+            # git is only needed by incremental runs
+            from pycktool.incremental.incremental_analysis import IncrementalAnalysis
+            analysis = IncrementalAnalysis(
+                path, snapshot, cache_dir, parser_options, discovery, engine, jobs
+            )
+            with profiler.phase('incremental'):
+                results_class, results_methods = analysis.run(revision_range)
+            for cycle in analysis.metrics.inheritance_cycles:
+                print('Circular inheritance: ', ' -> '.join(cycle + cycle[:1]))
+            classes = analysis.parser.classes
+            stats = analysis.parser.stats
+            file_records = {
+                os.path.join(path, file_path): records
+                for file_path, records in analysis.file_records.items()
+            }
+        else:
+            fp = FolderParser(
+                path, jobs, cache_dir, keep_file_records=bool(snapshot_path), 
+                backend=backend, parser_options=parser_options, profiler=profiler,
+                discovery=discovery
+            )
+            with profiler.phase('parse'):
+                fp.parse_path()
+            stats = fp.parser.stats
+
+            with profiler.phase('metrics'):
+                metrics = Metrics.create(fp.parser.classes, engine)
+                # Profiled runs calculate the metrics before the output, to 
+                # time them separately
+                if snapshot_path or profile:
+                    results_class, results_methods = metrics.calculate_all_metrics()
+                else:
+                    # The results are only written, so they are streamed to the output
+                    results_class = metrics.iter_class_metrics()
+                    results_methods = metrics.iter_method_metrics()
+            for cycle in metrics.inheritance_cycles:
+                print('Circular inheritance: ', ' -> '.join(cycle + cycle[:1]))
+            classes = fp.parser.classes
+            file_records = fp.file_records
+
+        if stats.get('inference_fallbacks'):
+            print(
+                'Inference budget exhausted, coupled classes resolved by name: ', 
+                stats['inference_fallbacks']
+            )
+
+        with profiler.phase('output'):
+            OutputHandler.save_results(
+                results_class, results_methods, 'results', output_format, prefix,
+                os.path.basename(os.path.abspath(path)), 
+                OutputHandler.get_class_files(classes, path),
+                {
+                    class_name: class_obj.coupled_classes 
+                    for class_name, class_obj in classes.items()
+                }, 
+                path, f'{backend} {engine}'
+            )
+
+        if snapshot_path:
+            with profiler.phase('snapshot'):
+                Snapshot.from_analysis(
+                    path, file_records, classes, results_class, results_methods, backend
+                ).save(snapshot_path)
+
+        if profile:
+            profiler.add_counters(stats)
+            print(profiler.report())
 
         print('PyCKTool execution completed')
 
 if __name__ == "__main__":
 
     path = r'F:\CEFET\TCC\repositorios\pylint' 
-    PyCKTool.run(path, 'csv')
\ No newline at end of file
+    PyCKTool.run(path, 'csv')
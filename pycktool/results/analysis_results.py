@@ -0,0 +1,122 @@
+from typing import Iterator
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+
+class MethodResult:
+    """
+    Metrics of a method of an analyzed class.
+    """
+
+    __slots__ = ('class_name', 'name', 'metrics')
+
+    def __init__(self, class_name: str, name: str, metrics: dict) -> None:
+
+        self.class_name = class_name
+        self.name = name
+        self.metrics: dict[str, int] = metrics
+
+    def __getitem__(self, metric: str) -> int:
+        return self.metrics[metric]
+
+    def __repr__(self) -> str:
+        return f'MethodResult({self.class_name}.{self.name}, {self.metrics})'
+
+    def to_dict(self) -> dict:
+        return {'class': self.class_name, 'method': self.name, **self.metrics}
+
+class ClassResult:
+    """
+    Metrics of an analyzed class and of its methods. The file is None for the
+        base classes that are not defined in the analyzed code.
+    """
+
+    __slots__ = ('name', 'file', 'metrics', 'methods')
+
+    def __init__(
+        self, name: str, file: str | None, metrics: dict, methods: dict[str, MethodResult]
+    ) -> None:
+
+        self.name = name
+        self.file = file
+        self.metrics: dict[str, int | str] = metrics
+        self.methods = methods
+
+    def __getitem__(self, metric: str) -> int | str:
+        return self.metrics[metric]
+
+    def __repr__(self) -> str:
+        return f'ClassResult({self.name}, {self.metrics})'
+
+    def to_dict(self) -> dict:
+        return {'class': self.name, 'file': self.file, **self.metrics}
+
+class AnalysisResults:
+    """
+    Results of an analysis kept in memory. The metrics of each class are only
+        calculated when the class is iterated or got, so iterating over the
+        results does not keep all of them in memory.
+    """
+
+    def __init__(
+        self, classes: dict[str, Class], class_files: dict[str, str] | None = None,
+        stats: dict[str, int] | None = None, engine: str = 'python'
+    ) -> None:
+
+        self.classes = classes
+        self.metrics = Metrics.create(classes, engine)
+
+        # File of each class defined in the analyzed code, relative to the 
+        # analyzed folder, and counters of the parsers, like the number of 
+        # files that could not be parsed
+        self.class_files = class_files or {}
+        self.stats = stats or {}
+
+    @property
+    def inheritance_cycles(self) -> list[list[str]]:
+        return self.metrics.inheritance_cycles
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __contains__(self, class_name: str) -> bool:
+        return class_name in self.classes
+
+    def __iter__(self) -> Iterator[ClassResult]:
+        for class_name in self.classes.keys():
+            yield self.get(class_name)
+
+    def __getitem__(self, class_name: str) -> ClassResult:
+        if class_name not in self.classes:
+            raise KeyError(class_name)
+        return self.get(class_name)
+
+    def get(self, class_name: str) -> ClassResult | None:
+        """
+        Calculates the metrics of a class and its methods, or returns None if
+            the class was not analyzed.
+        """
+        if class_name not in self.classes:
+            return None
+        methods = {
+            method_name: MethodResult(class_name, method_name, metrics)
+            for method_name, metrics in self.metrics.get_method_metrics(class_name).items()
+        }
+        return ClassResult(
+            class_name, self.class_files.get(class_name),
+            self.metrics.get_class_metrics(class_name), methods
+        )
+
+    def iter_methods(self) -> Iterator[MethodResult]:
+        """
+        Yields the metrics of each method of each class.
+        """
+        for class_result in self:
+            yield from class_result.methods.values()
+
+    def to_dicts(self) -> tuple[dict, dict]:
+        """
+        Returns the class and method results as dictionaries by class name,
+            like Metrics.calculate_all_metrics, as expected by OutputHandler.
+        """
+        return self.metrics.calculate_all_metrics()
@@ -0,0 +1,200 @@
+import os
+import gzip
+import json
+import zlib
+from typing import Iterable
+
+from pycktool import __version__
+from pycktool.parser.base_code_parser import BaseCodeParser
+from pycktool.parser.file_discovery import FileDiscovery
+
+class Shard:
+    """
+    Partial result of an analysis, with the class records extracted from a
+        subset of the files of a folder, before their possible coupled
+        classes are resolved.
+
+    Each shard of a folder can be extracted by a different machine, and the
+        shards are merged at the end, resolving the coupling across them and
+        calculating the metrics of all the classes, as a run over the whole
+        folder would.
+    """
+
+    def __init__(
+        self, files: dict[str, list[dict]], stats: dict[str, int] | None = None,
+        repository: str = '', backend: str = 'astroid', root: str = '',
+        index: int = 0, count: int = 1, parser_options: dict | None = None
+    ) -> None:
+
+        # Class records extracted from each file, by path relative to the
+        # analyzed folder, with the file of each class also relative to it
+        self.files = files
+
+        # Counters of the extraction of the files of the shard
+        self.stats = stats or {}
+
+        # Name and absolute path of the analyzed folder, and parser backend 
+        # used to extract the class records
+        self.repository = repository
+        self.root = root
+        self.backend = backend
+
+        # Index of the shard among the COUNT shards of the folder
+        self.index = index
+        self.count = count
+
+        # Options of the parser that change the extracted records, without the
+        # inference context, which only changes the memory used, and the 
+        # options not given
+        self.parser_options = {
+            name: value for name, value in (parser_options or {}).items()
+            if name != 'inference_context' and value is not None
+        }
+
+    @staticmethod
+    def parse_shard(shard: str) -> tuple[int, int]:
+        """
+        Parses a shard given as 'INDEX/COUNT', like '0/4' for the first of four
+            shards. Raises a ValueError if it is not valid.
+        """
+        index, separator, count = shard.partition('/')
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            index, count = -1, 0
+        if not separator or count < 1 or not 0 <= index < count:
+            raise ValueError(f'Invalid shard {shard}, expected INDEX/COUNT like 0/4')
+        return index, count
+
+    @staticmethod
+    def get_shard_index(relative_path: str, count: int) -> int:
+        """
+        Returns the shard of a file, by the hash of its path relative to the
+            analyzed folder, so a file is in the same shard on every machine
+            and whatever other files the folder has.
+        """
+        relative_path = relative_path.replace(os.sep, '/')
+        return zlib.crc32(relative_path.encode('utf-8')) % count
+
+    @staticmethod
+    def select_files(
+        root: str, file_paths: Iterable[str], index: int, count: int
+    ) -> list[str]:
+        """
+        Returns the files of the folder that belong to the given shard, in
+            the given order.
+        """
+        return [
+            file_path for file_path in file_paths
+            if Shard.get_shard_index(os.path.relpath(file_path, root), count) == index
+        ]
+
+    @staticmethod
+    def from_file_records(
+        root: str, file_records: dict[str, list[dict]],
+        stats: dict[str, int] | None = None, backend: str = 'astroid',
+        index: int = 0, count: int = 1, parser_options: dict | None = None
+    ) -> 'Shard':
+        """
+        Creates the given shard of a folder from the class records extracted 
+            from its files, with the files of the classes made relative to it.
+        """
+        files = {}
+        for file_path, records in file_records.items():
+            relative_path = os.path.normpath(os.path.relpath(file_path, root))
+            files[relative_path] = [
+                {**record, 'file': relative_path} if record['file'] else record
+                for record in records
+            ]
+        root = os.path.abspath(root)
+        return Shard(
+            files, stats, os.path.basename(root), backend, root, index, count,
+            parser_options
+        )
+
+    @staticmethod
+    def _open(path: str, mode: str):
+        """
+        Opens a shard file, compressed with gzip if its name ends with .gz.
+        """
+        if path.endswith('.gz'):
+            return gzip.open(path, mode + 't', encoding='utf-8')
+        return open(path, mode, encoding='utf-8')
+
+    def save(self, path: str) -> None:
+        """
+        Saves the shard to a JSON file, compressed if its name ends with .gz.
+        """
+        data = {
+            'version': __version__,
+            'records_version': BaseCodeParser.RECORDS_VERSION,
+            'backend': self.backend,
+            'repository': self.repository,
+            'root': self.root,
+            'index': self.index,
+            'count': self.count,
+            'parser_options': self.parser_options,
+            'stats': self.stats,
+            'files': self.files,
+        }
+        with self._open(path, 'w') as file:
+            json.dump(data, file)
+
+    @staticmethod
+    def load(path: str) -> 'Shard':
+        """
+        Loads a shard from a JSON file. Raises a ValueError if the shard was
+            created by another version of PyCKTool.
+        """
+        with Shard._open(path, 'r') as file:
+            data = json.load(file)
+
+        if data.get('version') != __version__ or \
+           data.get('records_version') != BaseCodeParser.RECORDS_VERSION:
+            raise ValueError(f'Shard {path} was created by another version of PyCKTool')
+        return Shard(
+            data['files'], data['stats'], data['repository'], data['backend'],
+            data['root'], data['index'], data['count'], data['parser_options']
+        )
+
+    @staticmethod
+    def merge(shards: list['Shard']) -> BaseCodeParser:
+        """
+        Merges the class records of the shards into a parser, and resolves the
+            possible coupled classes of all of them. The files are merged in
+            the order of the analysis of the whole folder, so the data is the
+            same of a single run.
+
+        Raises a ValueError if the shards were extracted from different 
+            folders, with different backends or parser options, or if they 
+            are not each of the shards of the folder exactly once.
+        """
+        settings = {
+            (shard.root, shard.backend, json.dumps(shard.parser_options, sort_keys=True))
+            for shard in shards
+        }
+        if len(settings) > 1:
+            raise ValueError(
+                'Shards of different repositories, backends or parser options can not be merged'
+            )
+        if len({shard.count for shard in shards}) > 1:
+            raise ValueError('Shards of different shard counts can not be merged')
+        if shards:
+            indexes = [shard.index for shard in shards]
+            missing = sorted(set(range(shards[0].count)) - set(indexes))
+            repeated = sorted({index for index in indexes if indexes.count(index) > 1})
+            if missing or repeated:
+                raise ValueError(
+                    f'Each of the {shards[0].count} shards must be merged once, '
+                    f'missing shards: {missing}, repeated shards: {repeated}'
+                )
+
+        parser = BaseCodeParser()
+        files = {}
+        for shard in shards:
+            files.update(shard.files)
+            BaseCodeParser.add_stats(parser.stats, shard.stats)
+        for relative_path in sorted(files.keys(), key=FileDiscovery.get_order_key):
+            parser.merge_class_records(files[relative_path])
+        parser.process_possible_coupled_classes()
+        return parser
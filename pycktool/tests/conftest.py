@@ -0,0 +1,49 @@
+import os
+import subprocess
+import pytest
+
+
+def _write_files(path: str, files: dict[str, str | None]) -> None:
+    """
+    Writes the code of each file, by its path relative to the given folder,
+        creating its folders. Files without code are removed.
+    """
+    for file_name, code in files.items():
+        file_path = os.path.join(path, file_name)
+        if code is None:
+            os.remove(file_path)
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(code)
+
+
+def _git(path: str, *args: str) -> None:
+    """
+    Runs a git command in the given repository, with a test author.
+    """
+    subprocess.run(
+        ['git', '-C', path, '-c', 'user.name=test', '-c', 'user.email=test@test', *args],
+        check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def write_files():
+    return _write_files
+
+
+@pytest.fixture
+def git():
+    return _git
+
+
+@pytest.fixture
+def project_path(request, tmp_path):
+    """
+    Writes the _FILES of the test class to a temporary folder, or to its
+        _FOLDER subfolder if the class has one, and returns the folder.
+    """
+    path = str(tmp_path / getattr(request.cls, '_FOLDER', ''))
+    _write_files(path, request.cls._FILES)
+    yield path
@@ -0,0 +1,198 @@
+import os
+import socket
+import threading
+import time
+import pytest
+
+from pycktool.daemon.analysis_daemon import AnalysisDaemon
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+
+class TestAnalysisDaemon:
+
+    _FILES = {
+        'base.py': """
+class Base:
+    def __init__(self):
+        self.value = 0
+""",
+        'child.py': """
+from base import Base
+
+class Child(Base):
+    def run(self, other: Base):
+        return other.value
+""",
+    }
+
+    @pytest.fixture
+    def parsed_files(self, monkeypatch):
+        parsed_files = []
+        extract_file_records = FolderParser.extract_file_records
+        def extract(file_path, *args):
+            parsed_files.append(os.path.basename(file_path))
+            return extract_file_records(file_path, *args)
+        monkeypatch.setattr(FolderParser, 'extract_file_records', staticmethod(extract))
+        yield parsed_files
+
+    def test_scan_matches_full_analysis(self, project_path: str):
+        daemon = AnalysisDaemon(project_path, backend='ast')
+        daemon.scan()
+
+        expected = Metrics(FolderParser(project_path, backend='ast').parse_path())
+        assert Metrics(daemon.classes).calculate_all_metrics() == \
+            expected.calculate_all_metrics()
+
+    def test_scan_only_parses_changed_files(self, project_path: str, tmp_path, parsed_files):
+        daemon = AnalysisDaemon(project_path, backend='ast')
+        daemon.scan()
+        parsed_files.clear()
+
+        assert daemon.scan() == 0
+        (tmp_path / 'child.py').write_text(
+            "class Child:\n    def run(self):\n        pass\n", encoding='utf-8'
+        )
+        (tmp_path / 'base.py').unlink()
+
+        assert daemon.scan() == 2
+        assert parsed_files == ['child.py']
+        assert set(daemon.classes.keys()) == {'child.Child'}
+
+    @pytest.fixture
+    def rebuilds(self, monkeypatch):
+        rebuilds = []
+        rebuild_classes = AnalysisDaemon._rebuild_classes
+        def rebuild(daemon):
+            rebuilds.append(daemon.scans)
+            rebuild_classes(daemon)
+        monkeypatch.setattr(AnalysisDaemon, '_rebuild_classes', rebuild)
+        yield rebuilds
+
+    @pytest.mark.parametrize('backend', ['astroid', 'ast'])
+    def test_changed_files_only_rebuild_their_classes(
+        self, project_path: str, tmp_path, rebuilds, backend: str
+    ):
+        (tmp_path / 'other.py').write_text(
+            "from child import Child\n\nclass Other(Child):\n    pass\n"
+            "\nclass Unknown(Missing):\n    pass\n", 
+            encoding='utf-8'
+        )
+        daemon = AnalysisDaemon(project_path, backend=backend)
+        daemon.scan()
+
+        (tmp_path / 'child.py').write_text(
+            "from base import Base\n\nclass Child(Base):\n"
+            "    def run(self):\n        self.count = 1\n        return Base()\n"
+            "\n    def stop(self):\n        self.count = 0\n", 
+            encoding='utf-8'
+        )
+        (tmp_path / 'base.py').write_text(
+            "class Base:\n    pass\n", encoding='utf-8'
+        )
+
+        assert daemon.scan() == 2
+        assert rebuilds == [0]
+        expected = Metrics(FolderParser(project_path, backend=backend).parse_path())
+        assert Metrics(daemon.classes).calculate_all_metrics() == \
+            expected.calculate_all_metrics()
+        assert daemon.classes['other.Other'].parents == [daemon.classes['child.Child']]
+
+    def test_changed_imported_modules_are_inferred_again(
+        self, project_path: str, tmp_path, monkeypatch
+    ):
+        # The modules are imported by astroid from the path, which caches where
+        # each module name is found, so their names are not used by other tests
+        monkeypatch.syspath_prepend(project_path)
+        thing_code = (
+            "class Real:\n    def go(self):\n        pass\n"
+            "\nclass Other:\n    def go(self):\n        pass\n"
+        )
+        user_code = (
+            "from stale_b import Thing\n\nclass User:\n"
+            "    def run(self):\n        Thing().go()\n"
+        )
+        (tmp_path / 'stale_b.py').write_text(thing_code + "\nThing = Real\n", encoding='utf-8')
+        (tmp_path / 'stale_a.py').write_text(user_code, encoding='utf-8')
+        # The modules loaded by astroid are kept, as when the daemon is run
+        daemon = AnalysisDaemon(
+            project_path, backend='astroid', parser_options={'inference_context': 'modules'}
+        )
+        daemon.scan()
+        assert daemon.classes['stale_a.User'].coupled_classes == {'stale_b.Real'}
+
+        # The unchanged importer is parsed again
+        (tmp_path / 'stale_b.py').write_text(thing_code + "\nThing = Other\n", encoding='utf-8')
+        assert daemon.scan() == 1
+        assert daemon.classes['stale_a.User'].coupled_classes == {'stale_b.Other'}
+
+        # The importer is parsed before the changed module
+        (tmp_path / 'stale_b.py').write_text(thing_code + "\nThing = Real\n", encoding='utf-8')
+        (tmp_path / 'stale_a.py').write_text(user_code + "\n", encoding='utf-8')
+        assert daemon.scan() == 2
+        expected = FolderParser(project_path, backend='astroid').parse_path()
+        assert expected['stale_a.User'].coupled_classes == {'stale_b.Real'}
+        assert daemon.classes['stale_a.User'].coupled_classes == {'stale_b.Real'}
+
+    def test_added_classes_rebuild_all_classes(self, project_path: str, tmp_path, rebuilds):
+        daemon = AnalysisDaemon(project_path, backend='ast')
+        daemon.scan()
+
+        (tmp_path / 'base.py').write_text(
+            "class Base:\n    pass\n\nclass Other(Base):\n    pass\n", encoding='utf-8'
+        )
+
+        assert daemon.scan() == 1
+        assert rebuilds == [0, 1]
+        assert daemon.handle_query({'command': 'class', 'name': 'Base'})['metrics']['NOC'] == 2
+
+    def test_queries(self, project_path: str):
+        daemon = AnalysisDaemon(project_path, backend='ast')
+        daemon.scan()
+
+        answer = daemon.handle_query({'command': 'class', 'name': 'Child'})
+        assert answer['ok'] and answer['name'] == 'child.Child'
+        assert answer['metrics']['DIT'] == 1
+        assert set(answer['methods'].keys()) == {'run'}
+
+        answer = daemon.handle_query({'command': 'file', 'path': 'child.py'})
+        assert [results['name'] for results in answer['classes']] == ['child.Child']
+
+        answer = daemon.handle_query({'command': 'top', 'metric': 'NOC', 'limit': 1})
+        assert answer['classes'] == [['base.Base', 1]]
+
+        assert not daemon.handle_query({'command': 'class', 'name': 'Missing'})['ok']
+        assert not daemon.handle_query({'command': 'unknown'})['ok']
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are not available')
+    def test_serves_queries_over_a_socket(self, project_path: str, tmp_path):
+        socket_path = str(tmp_path / 'daemon.sock')
+        daemon = AnalysisDaemon(project_path, backend='ast', poll_interval=0.05)
+        thread = threading.Thread(target=daemon.serve, args=(socket_path,))
+        thread.start()
+        try:
+            deadline = time.monotonic() + 10
+            while True:
+                try:
+                    status = AnalysisDaemon.query(socket_path, {'command': 'status'})
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.01)
+            assert status['ok'] and status['files'] == 2
+
+            # A client left open does not block the others
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle_client:
+                idle_client.connect(socket_path)
+                status = AnalysisDaemon.query(socket_path, {'command': 'status'}, timeout=5)
+                assert status['ok']
+
+            (tmp_path / 'other.py').write_text("class Other:\n    pass\n", encoding='utf-8')
+            refresh = AnalysisDaemon.query(socket_path, {'command': 'refresh'})
+            assert refresh['changed_files'] == 1
+        finally:
+            AnalysisDaemon.query(socket_path, {'command': 'shutdown'})
+            thread.join(10)
+
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
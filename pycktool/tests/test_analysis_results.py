@@ -0,0 +1,69 @@
+import os
+import pytest
+
+import pycktool
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.pycktool_run import PyCKTool
+
+class TestAnalysisResults:
+
+    _FOLDER = 'project'
+
+    _FILES = {
+        'pkg/base.py': """
+class Base:
+    def __init__(self, value):
+        self.value = value
+""",
+        'pkg/child.py': """
+from pkg.base import Base
+
+class Child(Base):
+    def run(self, other: Base):
+        return other.value
+""",
+    }
+
+    @pytest.mark.parametrize('backend', ['astroid', 'ast'])
+    def test_sources_are_analyzed_in_memory(self, backend: str, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        results = pycktool.analyze(sources=self._FILES, backend=backend)
+
+        assert os.listdir(tmp_path) == []
+        assert [class_result.name for class_result in results] == \
+            ['pkg.base.Base', 'pkg.child.Child']
+        child = results['pkg.child.Child']
+        assert child.file == os.path.join('pkg', 'child.py')
+        assert child['DIT'] == 1
+        assert child['CBO'] == 1
+        assert child.methods['run']['NOP'] == 2
+        assert results.get('Missing') is None
+
+    def test_path_results_match_the_metrics(self, project_path: str):
+        results = PyCKTool.analyze(project_path, backend='ast')
+        expected = Metrics(FolderParser(project_path, backend='ast').parse_path())
+
+        assert results.to_dicts() == expected.calculate_all_metrics()
+        assert {
+            (method.class_name, method.name) for method in results.iter_methods()
+        } == {('pkg.base.Base', '__init__'), ('pkg.child.Child', 'run')}
+
+    def test_files_are_named_by_their_common_folder(self, project_path: str):
+        results = PyCKTool.analyze(
+            files=[os.path.join(project_path, 'pkg', 'child.py')], backend='ast'
+        )
+
+        assert list(results.classes.keys())[0] == 'child.Child'
+
+    def test_unparsable_sources_are_counted(self):
+        results = PyCKTool.analyze(sources={'bad.py': 'class ('}, backend='ast')
+
+        assert len(results) == 0
+        assert results.stats['parse_failures'] == 1
+
+    def test_sources_can_not_be_analyzed_with_a_path(self, project_path: str):
+        with pytest.raises(ValueError):
+            PyCKTool.analyze(project_path, sources=self._FILES)
+        with pytest.raises(ValueError):
+            PyCKTool.analyze()
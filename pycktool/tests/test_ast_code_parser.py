@@ -0,0 +1,31 @@
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.ast_code_parser import AstCodeParser
+from pycktool.parser.code_parser import CodeParser
+from pycktool.tests import test_code_parser
+
+class TestAstCodeParser(test_code_parser.TestCodeParser):
+    """
+    Runs the code parser tests with the ast backend.
+    """
+
+    _parser_class = AstCodeParser
+
+    def test_structural_data_matches_astroid_backend(self):
+        astroid_parser = CodeParser()
+        astroid_parser.extract_code_data(self._FULL_CODE)
+        astroid_parser.process_possible_coupled_classes()
+        ast_parser = AstCodeParser()
+        ast_parser.extract_code_data(self._FULL_CODE)
+        ast_parser.process_possible_coupled_classes()
+
+        assert list(ast_parser.classes.keys()) == list(astroid_parser.classes.keys())
+        assert Metrics(ast_parser.classes).calculate_method_metrics() == \
+            Metrics(astroid_parser.classes).calculate_method_metrics()
+        for class_name, class_obj in astroid_parser.classes.items():
+            ast_class_obj = ast_parser.classes[class_name]
+            assert ast_class_obj.lloc == class_obj.lloc
+            assert ast_class_obj.get_all_parent_names() == class_obj.get_all_parent_names()
+            for method_name, method in class_obj.methods.items():
+                ast_method = ast_class_obj.methods[method_name]
+                assert ast_method.accessed_attributes == method.accessed_attributes
+                assert ast_method.called == method.called
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+from pycktool.benchmarks.bench_pipeline import compare_with_baseline
+from pycktool.benchmarks.bench_startup import get_environment, get_imported_modules
+from pycktool.benchmarks.bench_visitor import run_nesting, run_project
+from pycktool.benchmarks.project_generator import generate_project
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+
+class TestBenchmarks:
+
+    def test_generated_project_has_the_given_shape(self, tmp_path):
+        file_paths = generate_project(
+            str(tmp_path / 'first'), 25, classes_per_file=10, hierarchy_depth=5
+        )
+        generate_project(str(tmp_path / 'second'), 25, classes_per_file=10, hierarchy_depth=5)
+
+        classes = FolderParser(str(tmp_path / 'first'), backend='ast').parse_path()
+        results_class = Metrics(classes).calculate_class_metrics()
+
+        assert len(file_paths) == 3
+        assert len(classes) == 25
+        assert max(results['DIT'] for results in results_class.values()) == 4
+        for file_path in file_paths:
+            second_path = file_path.replace('first', 'second')
+            with open(file_path) as first_file, open(second_path) as second_file:
+                assert first_file.read() == second_file.read()
+
+    def test_compare_with_baseline_reports_slower_phases(self):
+        baseline = [{
+            'classes': 100, 'parse': {'seconds': 1.0}, 
+            'metrics': {'seconds': 0.5}, 'output': {'seconds': 0.001}
+        }]
+        results = [{
+            'classes': 100, 'parse': {'seconds': 1.5}, 
+            'metrics': {'seconds': 0.55}, 'output': {'seconds': 0.002}
+        }]
+
+        regressions = compare_with_baseline(results, baseline, 0.2)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith('parse with 100 classes')
+
+    def test_help_does_not_import_heavy_modules(self):
+        assert get_imported_modules(['--help']) == []
+
+    def test_cached_run_does_not_import_astroid(self, tmp_path):
+        project_path = str(tmp_path / 'project')
+        cache_dir = str(tmp_path / 'cache')
+        generate_project(project_path, 20)
+        args = [project_path, '--cache-dir', cache_dir, '--output-prefix', str(tmp_path / 'r')]
+        subprocess.run(
+            [sys.executable, '-m', 'pycktool', *args], cwd=str(tmp_path), 
+            env=get_environment(), check=True, capture_output=True
+        )
+
+        imports = get_imported_modules(args, str(tmp_path))
+
+        assert 'astroid' not in imports
+        assert 'chardet' not in imports
+
+    def test_class_nodes_are_visited_at_most_once(self):
+        result = run_project(20)
+
+        assert 0 < result['visited_nodes'] <= result['class_nodes']
+
+    def test_nested_code_is_traversed_with_a_small_stack(self):
+        assert run_nesting([25, 100], frames=200) == {25: 'ok', 100: 'ok'}
+
+    def test_nested_code_is_traversed_with_a_small_stack_by_the_ast_backend(self):
+        assert run_nesting([25, 100], frames=200, backend='ast') == {25: 'ok', 100: 'ok'}
@@ -1,8 +1,11 @@
+import astroid
 import pytest
 from pycktool.parser.code_parser import CodeParser
 
 class TestCodeParser:
 
+    _parser_class = CodeParser
+
     _FULL_CODE =  """
     class UsedClass6:
         def __init__(self):
@@ -55,7 +58,7 @@ class TestCodeParser:
 
     @pytest.fixture
     def parsed_full_code(self):
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(self._FULL_CODE)
         yield cp
 
@@ -131,7 +134,7 @@ class TestCodeParser:
                 def test_function(self):
                     {code}
         """
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(test_code)
         assert "_used_attribute" in \
             cp.classes["Test"].methods["test_function"].accessed_attributes
@@ -213,7 +216,7 @@ class TestCodeParser:
                 def test_function(self):
                     {code}
         """
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(test_code)
         assert "called_function" in \
             cp.classes["Test"].methods["test_function"].called
@@ -237,7 +240,7 @@ class TestCodeParser:
             class Test:
                 {code}
         """
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(test_code)
         assert "CoupledClass" in \
             cp.classes["Test"].possible_coupled_classes
@@ -273,7 +276,7 @@ class TestCodeParser:
                 def test_function(self):
                     {code}
         """
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(test_code)
         assert function_name not in \
             cp.classes["Test"].methods["test_function"].called
@@ -283,7 +286,186 @@ class TestCodeParser:
             class Test(str):
                 pass
         """
-        cp = CodeParser()
+        cp = self._parser_class()
         cp.extract_code_data(test_code)
         assert 'str' not in \
-            cp.classes["Test"].coupled_classes
\ No newline at end of file
+            cp.classes["Test"].coupled_classes
+
+class TestCodeParserInferenceBudget:
+
+    _CODE = """
+    class Coupled:
+        def method(self):
+            pass
+
+    def build(value):
+        if value:
+            return build(value - 1)
+        return Coupled()
+
+    class Test:
+        def test_function(self):
+            Coupled.method()
+            build(10).method()
+            print(self.attribute)
+    """
+
+    def test_unbounded_budget_does_not_fall_back(self):
+        cp = CodeParser()
+        cp.extract_code_data(self._CODE)
+        cp.process_possible_coupled_classes()
+        assert cp.stats['inference_fallbacks'] == 0
+        assert cp.stats['inference_cache_hits'] > 0
+        assert 'Coupled' in cp.classes['Test'].coupled_classes
+
+    def test_bounded_budget_matches_unbounded_budget(self):
+        cp = CodeParser()
+        cp.extract_code_data(self._CODE)
+        bounded_cp = CodeParser(inference_steps=1000, file_inference_time=60)
+        bounded_cp.extract_code_data(self._CODE)
+        assert bounded_cp.export_class_records() == cp.export_class_records()
+
+    def test_exhausted_inference_steps_fall_back_to_names(self):
+        cp = CodeParser(inference_steps=1)
+        cp.extract_code_data(self._CODE)
+        cp.process_possible_coupled_classes()
+        assert cp.stats['inference_fallbacks'] > 0
+        assert 'Coupled' in cp.classes['Test'].coupled_classes
+
+    def test_exhausted_inference_time_falls_back_to_names(self):
+        cp = CodeParser(file_inference_time=0)
+        cp.extract_code_data(self._CODE)
+        cp.process_possible_coupled_classes()
+        assert cp.stats['inferences'] == 0
+        assert cp.stats['inference_fallbacks'] > 0
+        assert 'Coupled' in cp.classes['Test'].coupled_classes
+
+    def test_inference_cache_is_cleared_after_each_file(self):
+        cp = CodeParser()
+        cp.extract_code_data(self._CODE)
+        assert cp._inference_cache == {}
+
+class TestCodeParserTraversal:
+
+    _CODE = """
+    class Test:
+        value = 0
+
+        def test_function(self, items: list, other: Other = None):
+            total = 0
+            for item in items:
+                if item:
+                    total += self.add(item.value, self.scale(item))
+                else:
+                    continue
+            def inner():
+                return total
+            try:
+                self.result = {'total': total}
+            except ValueError:
+                pass
+            return [self.check(item) for item in items]
+
+        if value:
+            def other_function(self):
+                pass
+    """
+
+    @pytest.fixture
+    def parsed_code(self) -> CodeParser:
+        cp = CodeParser()
+        cp.extract_code_data(self._CODE)
+        yield cp
+
+    def test_lloc_is_counted_while_traversing(self, parsed_code: CodeParser):
+        module = astroid.parse(self._CODE)
+        class_node = module.body[0]
+
+        assert parsed_code.classes['Test'].methods['test_function'].lloc == 10
+        assert parsed_code.classes['Test'].methods['test_function'].lloc == \
+            parsed_code.count_lloc(class_node.body[1])
+        assert parsed_code.classes['Test'].lloc == 13
+        assert parsed_code.classes['Test'].lloc == parsed_code.count_lloc(class_node)
+
+    def test_method_data_is_extracted_in_one_pass(self, parsed_code: CodeParser):
+        method = parsed_code.classes['Test'].methods['test_function']
+        class_nodes = sum(1 for _ in astroid.parse(self._CODE).body[0].nodes_of_class(astroid.NodeNG))
+
+        assert method.number_of_parameters == 3
+        assert method.called == {'add', 'scale', 'check'}
+        assert 'result' in method.accessed_attributes
+        assert {'list', 'Other'} <= parsed_code.classes['Test'].possible_coupled_classes
+        assert 0 < parsed_code.stats['visited_nodes'] <= class_nodes
+
+class TestCodeParserInferenceContext:
+
+    _CODE = """
+import os
+from context_base import Base
+
+class Child(Base):
+    def run(self):
+        Base().run()
+        return os.path.join('a', 'b')
+"""
+
+    @pytest.fixture
+    def base_path(self, tmp_path, monkeypatch):
+        (tmp_path / 'context_base.py').write_text(
+            "class Base:\n    def run(self):\n        pass\n", encoding='utf-8'
+        )
+        # astroid caches the imports that failed for the whole process, so the
+        # module is not named as the modules of other tests
+        monkeypatch.syspath_prepend(str(tmp_path))
+        # The astroid caches are not cleared while a test parses its files
+        monkeypatch.setattr(CodeParser, '_files_since_cache_clear', 0)
+        yield tmp_path
+        astroid.MANAGER.astroid_cache.pop('context_base', None)
+
+    @pytest.mark.parametrize('inference_context', ['all', 'modules', 'installed'])
+    def test_inference_context_does_not_change_the_data(
+        self, base_path, inference_context: str
+    ):
+        cp = CodeParser(inference_context=inference_context)
+        cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+
+        all_cp = CodeParser(inference_context='all')
+        all_cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+        assert cp.export_class_records() == all_cp.export_class_records()
+        assert 'context_base.Base' in cp.classes['child.Child'].possible_coupled_classes
+
+    def test_installed_modules_are_kept(self, base_path):
+        cp = CodeParser(inference_context='installed')
+        cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+
+        assert 'os' in astroid.MANAGER.astroid_cache
+        assert 'context_base' not in astroid.MANAGER.astroid_cache
+        assert CodeParser.is_installed_module(astroid.MANAGER.astroid_cache['os'])
+
+    def test_loaded_modules_are_kept(self, base_path):
+        cp = CodeParser(inference_context='modules')
+        cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+
+        assert 'context_base' in astroid.MANAGER.astroid_cache
+        assert not CodeParser.is_installed_module(astroid.MANAGER.astroid_cache['context_base'])
+
+    def test_astroid_caches_are_cleared_periodically(self, base_path, monkeypatch):
+        clears = []
+        clear_cache = astroid.MANAGER.clear_cache
+        monkeypatch.setattr(CodeParser, 'CLEAR_CACHE_INTERVAL', 2)
+        monkeypatch.setattr(
+            astroid.MANAGER, 'clear_cache', lambda: clears.append(1) or clear_cache()
+        )
+        cp = CodeParser(inference_context='modules')
+        cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+        assert not clears
+
+        cp.extract_code_data(self._CODE, str(base_path / 'child.py'), 'child')
+        assert clears
+        # The modules kept are not parsed again after the clear
+        assert 'context_base' in astroid.MANAGER.astroid_cache
+        assert 'os' in astroid.MANAGER.astroid_cache
+
+    def test_unknown_inference_context_is_rejected(self):
+        with pytest.raises(ValueError):
+            CodeParser(inference_context='file')
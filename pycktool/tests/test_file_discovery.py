@@ -0,0 +1,111 @@
+import os
+import pytest
+
+from pycktool.parser.file_discovery import FileDiscovery
+
+class TestFileDiscovery:
+
+    _FILES = {
+        **dict.fromkeys([
+            'main.py',
+            'README.md',
+            'pkg/__init__.py',
+            'pkg/module.py',
+            'pkg/generated_pb2.py',
+            'pkg/tests/test_module.py',
+            '.hidden/secret.py',
+            '.venv/lib/site.py',
+            'env/pyvenv.cfg',
+            'env/lib/package.py',
+            'node_modules/tool/script.py',
+            'build/lib/pkg/module.py',
+            'logs/debug.py',
+        ], ''),
+        '.gitignore': '# Logs\nlogs/\n*_pb2.py\n',
+    }
+
+    @staticmethod
+    def _discover(project_path: str, **options) -> list[str]:
+        discovery = FileDiscovery(project_path, **options)
+        return [
+            os.path.relpath(file_path, project_path).replace(os.sep, '/')
+            for file_path in discovery.iter_files()
+        ]
+
+    def test_default_discovery(self, project_path: str):
+        assert self._discover(project_path) == [
+            'main.py', 'pkg/__init__.py', 'pkg/module.py', 'pkg/tests/test_module.py'
+        ]
+
+    def test_include_and_exclude_patterns(self, project_path: str):
+        files = self._discover(
+            project_path, include=['pkg/*.py'], exclude=['tests/', '__init__.py']
+        )
+
+        assert files == ['pkg/module.py']
+
+    def test_hidden_files_are_analyzed(self, project_path: str, tmp_path):
+        (tmp_path / 'pkg' / '.local.py').write_text('', encoding='utf-8')
+
+        files = self._discover(project_path)
+
+        assert 'pkg/.local.py' in files
+        assert '.hidden/secret.py' not in files
+
+    def test_wildcards_do_not_match_folders(self, project_path: str, tmp_path):
+        (tmp_path / '.gitignore').write_text('/pkg/*.py\n', encoding='utf-8')
+        (tmp_path / 'build_tools' / 'lib').mkdir(parents=True)
+        (tmp_path / 'build_tools' / 'lib' / 'tool.py').write_text('', encoding='utf-8')
+
+        assert self._discover(project_path) == [
+            'main.py', 'build_tools/lib/tool.py', 'logs/debug.py', 
+            'pkg/tests/test_module.py'
+        ]
+        assert self._discover(project_path, exclude=['pkg/**/test_*.py']) == [
+            'main.py', 'build_tools/lib/tool.py', 'logs/debug.py'
+        ]
+        assert FileDiscovery.match_pattern('build_tools', 'build*', True)
+        assert not FileDiscovery.match_pattern('build_tools/lib/tool.py', 'build*', True)
+
+    def test_gitignore_can_be_disabled(self, project_path: str):
+        files = self._discover(project_path, use_gitignore=False)
+
+        assert {'logs/debug.py', 'pkg/generated_pb2.py'} <= set(files)
+
+    def test_nested_gitignore_negation(self, project_path: str, tmp_path):
+        (tmp_path / 'pkg' / '.gitignore').write_text('!*_pb2.py\n', encoding='utf-8')
+
+        assert 'pkg/generated_pb2.py' in self._discover(project_path)
+
+    def test_counts_scanned_and_skipped_files(self, project_path: str):
+        discovery = FileDiscovery(project_path)
+        files = list(discovery.iter_files())
+
+        # main.py, README.md, .gitignore and the files of pkg are scanned
+        assert discovery.stats['files_scanned'] == 7
+        assert discovery.stats['files_skipped'] == 7 - len(files)
+        # .hidden, .venv, env, node_modules, build and logs are pruned
+        assert discovery.stats['dirs_pruned'] == 6
+
+    @pytest.mark.skipif(not hasattr(os, 'symlink'), reason='symlinks are not available')
+    def test_symlink_loops_are_walked_once(self, project_path: str, tmp_path):
+        try:
+            os.symlink(tmp_path / 'pkg', tmp_path / 'pkg' / 'tests' / 'loop')
+        except OSError:
+            pytest.skip('symlinks can not be created')
+        discovery = FileDiscovery(project_path)
+        files = list(discovery.iter_files())
+
+        assert len(files) == 4
+        assert discovery.stats['symlink_loops'] == 1
+
+    def test_is_included_matches_discovery(self, project_path: str):
+        discovery = FileDiscovery(project_path)
+
+        assert discovery.is_included('pkg/module.py')
+        assert discovery.is_included(os.path.join('pkg', 'deleted.py'))
+        assert not discovery.is_included('.venv/lib/site.py')
+        assert not discovery.is_included('env/lib/package.py')
+        assert not discovery.is_included('logs/debug.py')
+        assert not discovery.is_included('pkg/generated_pb2.py')
+        assert not discovery.is_included('README.md')
@@ -0,0 +1,207 @@
+import pytest
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.profiling.profiler import Profiler
+
+class TestFolderParser:
+
+    _FILES = {
+        'base.py': """
+class Base:
+    def __init__(self):
+        self.value = 0
+
+class Config:
+    def load(self, path: str):
+        return open(path)
+""",
+        'child.py': """
+from base import Base, Config
+from sub.helper import Helper
+
+class Child(Base):
+    def run(self, config: Config):
+        self.value = config.load('file')
+        Helper.help()
+""",
+        'sub/helper.py': """
+class Helper:
+    @staticmethod
+    def help():
+        pass
+
+class Base:
+    def reset(self):
+        self.value = 0
+""",
+    }
+
+    def test_parallel_parsing_matches_serial_parsing(self, project_path: str):
+        serial = FolderParser(project_path)
+        serial_classes = serial.parse_path()
+        parallel = FolderParser(project_path, jobs=2)
+        parallel_classes = parallel.parse_path()
+
+        assert set(serial_classes.keys()) == set(parallel_classes.keys())
+        assert Metrics(serial_classes).calculate_all_metrics() == \
+            Metrics(parallel_classes).calculate_all_metrics()
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_classes_with_the_same_name_are_kept_apart(self, project_path: str, jobs: int):
+        fp = FolderParser(project_path, jobs=jobs)
+        classes = fp.parse_path()
+
+        assert set(classes.keys()) == {
+            'base.Base', 'base.Config', 'child.Child', 'sub.helper.Helper', 
+            'sub.helper.Base'
+        }
+        assert classes['child.Child'].parents == [classes['base.Base']]
+        assert set(classes['base.Base'].methods.keys()) == {'__init__'}
+        assert set(classes['sub.helper.Base'].methods.keys()) == {'reset'}
+        assert classes['child.Child'].coupled_classes == {
+            'base.Base', 'base.Config', 'sub.helper.Helper'
+        }
+
+    @pytest.mark.parametrize('backend', ['astroid', 'ast'])
+    def test_ambiguous_references_are_not_resolved(self, project_path: str, tmp_path, backend: str):
+        (tmp_path / 'other.py').write_text(
+            "class Other(Base):\n    pass\n", encoding='utf-8'
+        )
+        classes = FolderParser(project_path, backend=backend).parse_path()
+
+        assert [parent.name for parent in classes['other.Other'].parents] == ['Base']
+        assert classes['other.Other'].coupled_classes.isdisjoint(
+            {'base.Base', 'sub.helper.Base'}
+        )
+
+    def test_cached_parsing_matches_parsing_without_cache(self, project_path: str, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        expected = Metrics(FolderParser(project_path).parse_path()).calculate_all_metrics()
+
+        first_run = FolderParser(project_path, cache_dir=cache_dir)
+        first_results = Metrics(first_run.parse_path()).calculate_all_metrics()
+        second_run = FolderParser(project_path, cache_dir=cache_dir)
+        second_results = Metrics(second_run.parse_path()).calculate_all_metrics()
+
+        assert first_results == expected
+        assert second_results == expected
+        assert first_run.cache.misses == len(self._FILES)
+        assert second_run.cache.hits == len(self._FILES)
+
+    def test_cache_parses_changed_files_again(self, project_path: str, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        FolderParser(project_path, cache_dir=cache_dir).parse_path()
+
+        (tmp_path / 'child.py').write_text(
+            "from base import Base\n\nclass Child(Base):\n    def run(self):\n        pass\n", 
+            encoding='utf-8'
+        )
+        fp = FolderParser(project_path, cache_dir=cache_dir)
+        classes = fp.parse_path()
+
+        assert fp.cache.misses == 1
+        assert set(classes['child.Child'].methods.keys()) == {'run'}
+        assert 'base.Config' not in classes['child.Child'].coupled_classes
+
+    def test_parallel_parsing_sums_the_parser_stats(self, project_path: str):
+        serial = FolderParser(project_path)
+        serial.parse_path()
+        parallel = FolderParser(project_path, jobs=2)
+        parallel.parse_path()
+
+        assert serial.parser.stats['inferences'] > 0
+        assert parallel.parser.stats == serial.parser.stats
+
+    def test_cache_skips_files_with_exhausted_inference_budget(self, project_path: str, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        options = {'file_inference_time': 0}
+        FolderParser(project_path, cache_dir=cache_dir, parser_options=options).parse_path()
+
+        fp = FolderParser(project_path, cache_dir=cache_dir, parser_options=options)
+        fp.parse_path()
+
+        assert fp.cache.hits == 0
+        assert fp.cache.misses == len(self._FILES)
+
+    def test_cache_is_keyed_by_the_parser_options(self, project_path: str, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        FolderParser(project_path, cache_dir=cache_dir).parse_path()
+
+        fp = FolderParser(
+            project_path, cache_dir=cache_dir, parser_options={'inference_steps': 1000}
+        )
+        fp.parse_path()
+        context_fp = FolderParser(
+            project_path, cache_dir=cache_dir, parser_options={'inference_context': 'modules'}
+        )
+        context_fp.parse_path()
+
+        assert fp.cache.misses == len(self._FILES)
+        assert context_fp.cache.hits == len(self._FILES)
+
+    def test_cache_parses_files_importing_changed_files_again(self, project_path: str, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        FolderParser(project_path, cache_dir=cache_dir).parse_path()
+        FolderParser(project_path, cache_dir=cache_dir, backend='ast').parse_path()
+
+        (tmp_path / 'sub' / 'helper.py').write_text(
+            "class Helper:\n    pass\n", encoding='utf-8'
+        )
+        fp = FolderParser(project_path, cache_dir=cache_dir)
+        fp.parse_path()
+        ast_fp = FolderParser(project_path, cache_dir=cache_dir, backend='ast')
+        ast_fp.parse_path()
+
+        # child.py imports sub/helper.py, whose classes astroid infers
+        assert fp.cache.misses == 2
+        assert ast_fp.cache.misses == 1
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_profiled_parsing_times_each_file(self, project_path: str, jobs: int):
+        profiler = Profiler(enabled=True)
+        fp = FolderParser(project_path, jobs=jobs, profiler=profiler)
+        fp.parse_path()
+
+        assert len(profiler.files) == len(self._FILES)
+        for timings in profiler.files.values():
+            assert set(timings.keys()) >= {'read', 'decode', 'ast_parse', 'extraction'}
+            assert all(seconds >= 0 for seconds in timings.values())
+
+class TestFolderParserDecoding:
+
+    @pytest.fixture
+    def no_detection(self, monkeypatch):
+        def fail(content):
+            raise AssertionError('The encoding should not be detected')
+        monkeypatch.setattr(FolderParser, '_guess_file_encode', staticmethod(fail))
+
+    def test_decodes_utf8_with_bom(self, no_detection):
+        content = '\ufeffname = "café"\n'.encode('utf-8')
+
+        assert FolderParser._decode_file_content(content, 'file.py') == 'name = "café"\n'
+
+    def test_decodes_with_coding_cookie(self, no_detection):
+        code = '# -*- coding: latin-1 -*-\nname = "café"\n'
+
+        assert FolderParser._decode_file_content(code.encode('latin-1'), 'file.py') == code
+
+    def test_detects_undeclared_encoding(self, monkeypatch):
+        monkeypatch.setattr(
+            FolderParser, '_guess_file_encode', staticmethod(lambda content: 'cp1252')
+        )
+        code = 'name = "café"\n'
+
+        assert FolderParser._decode_file_content(code.encode('cp1252'), 'file.py') == code
+
+    def test_detection_uses_a_bounded_sample(self, monkeypatch):
+        chardet = pytest.importorskip('chardet')
+        sizes = []
+        def detect(content):
+            sizes.append(len(content))
+            return {'encoding': None}
+        monkeypatch.setattr(chardet, 'detect', detect)
+        monkeypatch.setattr(FolderParser, '_ENCODING_SAMPLE_SIZE', 16)
+
+        assert FolderParser._guess_file_encode(b'x' * 100) == 'utf-8'
+        assert sizes == [16]
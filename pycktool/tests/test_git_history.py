@@ -0,0 +1,130 @@
+import os
+import csv
+import shutil
+import pytest
+
+from pycktool.history.git_history import GitHistory, GitObjectReader
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.pycktool_run import PyCKTool
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not available')
+class TestGitHistory:
+
+    _BASE = """
+class Base:
+    def __init__(self):
+        self.value = 0
+"""
+
+    _COMMITS = [
+        {
+            'src/base.py': _BASE,
+            'src/child.py': """
+from base import Base
+
+class Child(Base):
+    def run(self, other: Base):
+        return other.value
+""",
+        },
+        {
+            'src/helper.py': """
+from child import Child
+
+class Helper:
+    def help(self, child: Child):
+        return child.run(None)
+""",
+        },
+        {'README': 'Only a change outside the python files'},
+        {
+            'src/base.py': """
+class Root:
+    pass
+
+class Base(Root):
+    def __init__(self):
+        self.value = 0
+        self.other = 1
+""",
+            'src/helper.py': None,
+        },
+        # The first version of base.py is restored
+        {'src/base.py': _BASE},
+    ]
+
+    @pytest.fixture
+    def repository(self, tmp_path, git, write_files):
+        path = str(tmp_path / 'repository')
+        os.makedirs(os.path.join(path, 'src'))
+        git(path, 'init', '-q')
+
+        # Results of a full analysis of the folder at each commit
+        expected = []
+        for files in self._COMMITS:
+            write_files(path, files)
+            git(path, 'add', '-A')
+            git(path, 'commit', '-q', '-m', 'commit')
+            expected.append(Metrics(
+                FolderParser(os.path.join(path, 'src'), backend='ast').parse_path()
+            ).calculate_all_metrics())
+        yield path, expected
+
+    def test_results_of_each_commit_match_a_full_analysis(self, repository):
+        path, expected = repository
+        history = GitHistory(os.path.join(path, 'src'), backend='ast')
+        results = list(history.iter_results('HEAD'))
+
+        assert [(classes, methods) for _, _, classes, methods in results] == expected
+        assert [commit_id for commit_id, _, _, _ in results] == \
+            [commit_id for commit_id, _, _ in history.list_commits('HEAD')]
+
+    def test_each_file_version_is_parsed_once(self, repository):
+        path, _ = repository
+        history = GitHistory(os.path.join(path, 'src'), backend='ast')
+        list(history.iter_results('HEAD'))
+
+        # base.py and child.py, helper.py, and the new version of base.py. The
+        # restored version of base.py is not parsed again
+        assert history.stats['history_commits'] == 5
+        assert history.stats['history_files_parsed'] == 4
+        assert history.stats['history_files_reused'] == 5
+
+    def test_revision_ranges_are_analyzed(self, repository):
+        path, expected = repository
+        history = GitHistory(os.path.join(path, 'src'), backend='ast')
+        results = list(history.iter_results('HEAD~2..HEAD'))
+
+        assert [(classes, methods) for _, _, classes, methods in results] == expected[-2:]
+
+    def test_history_is_saved_as_a_time_series(self, repository, tmp_path, monkeypatch):
+        path, expected = repository
+        monkeypatch.chdir(tmp_path)
+        PyCKTool.history(os.path.join(path, 'src'), 'HEAD', backend='ast')
+
+        with open(tmp_path / 'history-classes.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert list(rows[0].keys())[:3] == ['commit', 'date', 'class']
+        assert len(rows) == sum(len(classes) for classes, _ in expected)
+        assert len({row['commit'] for row in rows}) == 5
+        with open(tmp_path / 'history-methods.csv', encoding='utf-8') as file:
+            assert len(list(csv.DictReader(file))) == sum(
+                len(class_methods) for _, methods in expected
+                for class_methods in methods.values()
+            )
+
+        with pytest.raises(ValueError):
+            PyCKTool.history(os.path.join(path, 'src'), 'HEAD', 'parquet', backend='ast')
+
+    def test_history_uses_the_ast_backend_by_default(self, repository):
+        path, _ = repository
+
+        assert GitHistory(os.path.join(path, 'src')).backend == 'ast'
+
+    def test_missing_objects_are_reported(self, repository):
+        path, _ = repository
+        with GitObjectReader(path) as reader:
+            assert reader.read('HEAD')[0] == 'commit'
+            with pytest.raises(RuntimeError):
+                reader.read('0' * 40)
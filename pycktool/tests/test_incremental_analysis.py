@@ -0,0 +1,173 @@
+import os
+import shutil
+import pytest
+
+from pycktool.incremental.incremental_analysis import IncrementalAnalysis
+from pycktool.incremental.snapshot import Snapshot
+from pycktool.metrics.metrics import Metrics
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.pycktool_run import PyCKTool
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not available')
+class TestIncrementalAnalysis:
+
+    _FILES = {
+        'base.py': """
+class Base:
+    def __init__(self):
+        self.value = 0
+
+class Config:
+    def load(self, path: str):
+        return open(path)
+""",
+        'child.py': """
+class Child(Base):
+    def run(self, config: Config):
+        self.value = config.load('file')
+
+class GrandChild(Child):
+    pass
+""",
+        'helper.py': """
+class Helper:
+    def help(self, child: Child):
+        return child.run(None)
+""",
+    }
+
+    _CHANGES = {
+        'base.py': """
+class Root:
+    pass
+
+class Base(Root):
+    def __init__(self):
+        self.value = 0
+        self.other = 1
+""",
+        'new.py': """
+class Config:
+    def load(self, path: str):
+        return Helper()
+""",
+        'helper.py': None,
+    }
+
+    @staticmethod
+    def _full_analysis(path):
+        fp = FolderParser(path, keep_file_records=True)
+        classes = fp.parse_path()
+        results = Metrics(classes).calculate_all_metrics()
+        return Snapshot.from_analysis(path, fp.file_records, classes, *results), results
+
+    @pytest.fixture
+    def snapshot(self, project_path: str, tmp_path, git, write_files):
+        git(project_path, 'init', '-q')
+        git(project_path, 'add', '-A')
+        git(project_path, 'commit', '-q', '-m', 'first')
+
+        snapshot, _ = self._full_analysis(project_path)
+        snapshot.save(str(tmp_path / 'snapshot.json'))
+
+        write_files(project_path, self._CHANGES)
+        git(project_path, 'add', '-A')
+        git(project_path, 'commit', '-q', '-m', 'second')
+        yield Snapshot.load(str(tmp_path / 'snapshot.json'))
+
+    def test_incremental_analysis_matches_full_analysis(self, snapshot, tmp_path):
+        analysis = IncrementalAnalysis(str(tmp_path), snapshot)
+        classes_results, methods_results = analysis.run('HEAD~1..HEAD')
+
+        _, (expected_classes, expected_methods) = self._full_analysis(str(tmp_path))
+        assert classes_results == expected_classes
+        assert methods_results == expected_methods
+
+    def test_incremental_analysis_only_parses_changed_files(self, snapshot, tmp_path, monkeypatch):
+        parsed_files = []
+        extract_file_records = FolderParser.extract_file_records
+        def tracked_extract_file_records(file_path, *args):
+            parsed_files.append(os.path.basename(file_path))
+            return extract_file_records(file_path, *args)
+        monkeypatch.setattr(
+            FolderParser, 'extract_file_records', staticmethod(tracked_extract_file_records)
+        )
+
+        analysis = IncrementalAnalysis(str(tmp_path), snapshot)
+        analysis.run('HEAD~1..HEAD')
+
+        assert sorted(parsed_files) == ['base.py', 'new.py']
+        assert 'helper.py' not in analysis.file_records
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_incremental_analysis_uses_the_engine_and_jobs(self, snapshot, tmp_path, jobs: int):
+        pytest.importorskip('numpy')
+        analysis = IncrementalAnalysis(str(tmp_path), snapshot, engine='numpy', jobs=jobs)
+        classes_results, methods_results = analysis.run('HEAD~1..HEAD')
+
+        _, (expected_classes, expected_methods) = self._full_analysis(str(tmp_path))
+        assert type(analysis.metrics).__name__ == 'NumpyMetrics'
+        assert classes_results == expected_classes
+        assert methods_results == expected_methods
+
+    def test_importers_of_changed_files_are_parsed_again(
+        self, tmp_path, monkeypatch, git, write_files
+    ):
+        # The modules are imported by astroid from the path, which caches where
+        # each module name is found, so their names are not used by other tests
+        path = str(tmp_path / 'imports')
+        monkeypatch.syspath_prepend(path)
+        thing_code = (
+            "class Real:\n    def go(self):\n        pass\n"
+            "\nclass Other:\n    def go(self):\n        pass\n"
+        )
+        write_files(path, {
+            'inc_thing.py': thing_code + "\nThing = Real\n",
+            'inc_user.py': "from inc_thing import Thing\n\nclass User:\n"
+                           "    def run(self):\n        Thing().go()\n",
+            'inc_other.py': "class Unrelated:\n    pass\n",
+        })
+        git(path, 'init', '-q')
+        git(path, 'add', '-A')
+        git(path, 'commit', '-q', '-m', 'first')
+        snapshot, _ = self._full_analysis(path)
+
+        write_files(path, {'inc_thing.py': thing_code + "\nThing = Other\n"})
+        git(path, 'commit', '-q', '-am', 'second')
+        parsed_files = []
+        extract_file_records = FolderParser.extract_file_records
+        def tracked_extract_file_records(file_path, *args):
+            parsed_files.append(os.path.basename(file_path))
+            return extract_file_records(file_path, *args)
+        monkeypatch.setattr(
+            FolderParser, 'extract_file_records', staticmethod(tracked_extract_file_records)
+        )
+        analysis = IncrementalAnalysis(path, snapshot)
+        classes_results, _ = analysis.run('HEAD~1..HEAD')
+
+        assert sorted(parsed_files) == ['inc_thing.py', 'inc_user.py']
+        assert analysis.parser.classes['inc_user.User'].coupled_classes == {'inc_thing.Other'}
+        _, (expected_classes, _) = self._full_analysis(path)
+        assert classes_results == expected_classes
+
+    def test_incremental_runs_report_circular_inheritance(
+        self, project_path: str, tmp_path, monkeypatch, capsys, git, write_files
+    ):
+        git(project_path, 'init', '-q')
+        git(project_path, 'add', '-A')
+        git(project_path, 'commit', '-q', '-m', 'first')
+        snapshot_path = str(tmp_path / 'snapshot.json')
+        output_path = tmp_path / 'output'
+        output_path.mkdir()
+        monkeypatch.chdir(output_path)
+        PyCKTool.run(project_path, 'json', snapshot_path=snapshot_path, backend='ast')
+
+        write_files(project_path, {'base.py': "class Base(GrandChild):\n    pass\n"})
+        git(project_path, 'commit', '-q', '-am', 'second')
+        capsys.readouterr()
+        PyCKTool.run(
+            project_path, 'json', snapshot_path=snapshot_path, revision_range='HEAD~1..HEAD',
+            backend='ast'
+        )
+
+        assert 'Circular inheritance' in capsys.readouterr().out
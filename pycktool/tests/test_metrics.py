@@ -158,4 +158,94 @@ class TestMetrics:
         fin = Metrics.fan_in("ClassA", all_classes)
     
         # Assert - ClassA has 1 fan-in and 2 fan-out
-        assert fin == 2
\ No newline at end of file
+        assert fin == 2
+
+    # Indexed FIN, NOC and CBO match the values calculated by scanning all classes
+    def test_indexed_metrics_match_scanned_metrics(self):
+        # Arrange
+        class_a = Class("ClassA")
+        class_b = Class("ClassB")
+        class_c = Class("ClassC")
+        class_b.parents.append(class_a)
+        class_c.parents.extend([class_a, class_b])
+        class_a.coupled_classes.add("ClassB")
+        class_b.coupled_classes.update({"ClassA", "ClassC"})
+        class_c.coupled_classes.add("ClassA")
+        all_classes = {"ClassA": class_a, "ClassB": class_b, "ClassC": class_c}
+
+        # Act
+        results = Metrics(all_classes).calculate_class_metrics()
+
+        # Assert
+        for class_name in all_classes.keys():
+            assert results[class_name]['FIN'] == Metrics.fan_in(class_name, all_classes)
+            assert results[class_name]['NOC'] == \
+                Metrics.number_of_children(class_name, all_classes)
+            assert results[class_name]['CBO'] == \
+                Metrics.coupling_between_classes(class_name, all_classes)
+
+    # LCOM counts the clusters of methods and attributes
+    def test_lcom_counts_disconnected_clusters(self):
+        # Arrange
+        class_obj = Class("TestClass")
+        class_obj.attributes.update({("attribute1", None), ("attribute2", None)})
+        method1 = Method("method1")
+        method1.accessed_attributes.add("attribute1")
+        method2 = Method("method2")
+        method2.called.add("method1")
+        method3 = Method("method3")
+        method3.accessed_attributes.add("attribute2")
+        class_obj.methods = {"method1": method1, "method2": method2, "method3": method3}
+
+        # Act
+        result = Metrics.lack_of_cohesion_4(class_obj)
+
+        # Assert
+        assert result == 2
+
+    # LCOM handles classes too large for a recursive graph traversal
+    def test_lcom_with_long_chain_of_calls(self):
+        # Arrange
+        class_obj = Class("TestClass")
+        for i in range(5000):
+            method = Method(f"method{i}")
+            method.called.add(f"method{i + 1}")
+            class_obj.methods[method.name] = method
+
+        # Act
+        result = Metrics.lack_of_cohesion_4(class_obj)
+
+        # Assert
+        assert result == 1
+
+    # Reports classes inheriting from a circular inheritance
+    def test_dit_with_circular_inheritance(self):
+        # Arrange
+        class_a = Class("ClassA")
+        class_b = Class("ClassB")
+        class_c = Class("ClassC")
+        class_a.parents.append(class_b)
+        class_b.parents.append(class_a)
+        class_c.parents.append(class_a)
+        all_classes = {"ClassA": class_a, "ClassB": class_b, "ClassC": class_c}
+
+        # Act
+        metrics = Metrics(all_classes)
+
+        # Assert
+        assert metrics.get_depth_of_inheritance_tree("ClassC") == 'Circular'
+        assert Metrics.depth_of_inheritance_tree(class_c) == 'Circular'
+        assert metrics.inheritance_cycles == [["ClassA", "ClassB"]]
+
+    # Handles hierarchies deeper than the recursion limit
+    def test_dit_with_deep_inheritance(self):
+        # Arrange
+        classes = [Class(f"Class{i}") for i in range(5000)]
+        for child, parent in zip(classes[1:], classes):
+            child.parents.append(parent)
+
+        # Act
+        result = Metrics.depth_of_inheritance_tree(classes[-1])
+
+        # Assert
+        assert result == 4999
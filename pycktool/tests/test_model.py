@@ -0,0 +1,32 @@
+import json
+
+from pycktool.model.class_model import Class
+from pycktool.model.method_model import Method
+
+class TestModel:
+
+    def test_models_have_no_attributes_dictionary(self):
+        class_obj = Class('ClassA')
+        class_obj.methods['method'] = Method('method')
+
+        assert not hasattr(class_obj, '__dict__')
+        assert not hasattr(class_obj.methods['method'], '__dict__')
+
+    def test_records_share_interned_names(self):
+        class_obj = Class('ClassA', 'module.py')
+        method = Method('method')
+        method.called.add('ClassB.run')
+        class_obj.methods['method'] = method
+        class_obj.attributes.add(('value', 'builtins.int'))
+        class_obj.add_coupled_class('ClassB')
+        record = class_obj.to_record()
+
+        # Records loaded from other processes or caches have their own strings
+        first = Class.from_record(json.loads(json.dumps(record)))
+        second = Class.from_record(json.loads(json.dumps(record)))
+
+        assert first.name is second.name
+        assert next(iter(first.coupled_classes)) is next(iter(second.coupled_classes))
+        assert next(iter(first.methods['method'].called)) is \
+            next(iter(second.methods['method'].called))
+        assert next(iter(first.attributes)) == ('value', 'builtins.int')
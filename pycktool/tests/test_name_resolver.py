@@ -0,0 +1,94 @@
+import pytest
+
+from pycktool.model.class_model import Class
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.parser.name_resolver import NameResolver
+
+class TestNameResolver:
+
+    @staticmethod
+    def _create_resolver(defined: list[str], placeholders: list[str] = ()) -> NameResolver:
+        classes = {name: Class(name, ['module.py']) for name in defined}
+        classes.update({name: Class(name) for name in placeholders})
+        return NameResolver(classes)
+
+    def test_resolves_unique_suffixes(self):
+        resolver = self._create_resolver(['pkg.models.User', 'pkg.views.View'])
+
+        assert resolver.resolve('pkg.models.User') == 'pkg.models.User'
+        assert resolver.resolve('models.User') == 'pkg.models.User'
+        assert resolver.resolve('User') == 'pkg.models.User'
+        assert resolver.resolve('Missing') is None
+
+    def test_resolves_references_that_end_with_a_class(self):
+        # Absolute imports of a package analyzed from inside of it
+        resolver = self._create_resolver(['models.User'])
+
+        assert resolver.resolve('pkg.models.User') == 'models.User'
+
+    def test_does_not_resolve_ambiguous_references(self):
+        resolver = self._create_resolver(['a.User', 'b.User'], ['User'])
+
+        assert resolver.resolve_defined('User') is None
+        assert resolver.resolve('User') == 'User'
+        assert resolver.resolve('a.User') == 'a.User'
+
+    def test_module_names(self, tmp_path):
+        package = tmp_path / 'pkg'
+        (package / 'sub').mkdir(parents=True)
+        (package / '__init__.py').write_text('')
+
+        assert NameResolver.get_module_name(str(tmp_path), str(package / 'sub' / 'mod.py')) == \
+            'pkg.sub.mod'
+        assert NameResolver.get_module_name(str(tmp_path), str(package / '__init__.py')) == \
+            'pkg'
+        # The package names of an analyzed package are included
+        assert NameResolver.get_module_name(str(package), str(package / 'mod.py')) == \
+            'pkg.mod'
+
+    @pytest.mark.parametrize('module_name, is_package, imported, level, expected', [
+        ('pkg.sub.mod', False, 'other', 0, 'other'),
+        ('pkg.sub.mod', False, 'other', 1, 'pkg.sub.other'),
+        ('pkg.sub.mod', False, None, 2, 'pkg'),
+        ('pkg.sub', True, 'other', 1, 'pkg.sub.other'),
+    ])
+    def test_relative_imports(
+        self, module_name: str, is_package: bool, imported: str | None, level: int,
+        expected: str
+    ):
+        assert NameResolver.resolve_relative_import(
+            module_name, is_package, imported, level
+        ) == expected
+
+@pytest.mark.parametrize('backend', ['astroid', 'ast'])
+class TestQualifiedClassNames:
+
+    _CODE = """
+import pkg.base
+from ..models import User as Account
+from .views import View
+
+class Local:
+    pass
+
+class Service(pkg.base.Base):
+    def run(self, account: Account, local: Local):
+        View.render()
+"""
+
+    def test_classes_and_references_are_qualified(self, backend: str):
+        parser = FolderParser.create_code_parser(backend)
+        parser.extract_code_data(self._CODE, 'pkg/sub/service.py', 'pkg.sub.service')
+
+        service = parser.classes['pkg.sub.service.Service']
+        assert 'pkg.sub.service.Local' in parser.classes
+        assert [parent.name for parent in service.parents] == ['pkg.base.Base']
+        assert {
+            'pkg.models.User', 'pkg.sub.service.Local', 'pkg.sub.views.View'
+        } <= service.possible_coupled_classes
+
+    def test_classes_are_not_qualified_without_module_name(self, backend: str):
+        parser = FolderParser.create_code_parser(backend)
+        parser.extract_code_data(self._CODE)
+
+        assert {'Local', 'Service'} <= set(parser.classes.keys())
@@ -0,0 +1,125 @@
+import pytest
+
+from pycktool.benchmarks.bench_metrics import generate_classes
+from pycktool.metrics.metrics import Metrics
+from pycktool.model.class_model import Class
+from pycktool.model.method_model import Method
+from pycktool.pycktool_run import PyCKTool
+
+class TestNumpyMetrics:
+
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip('numpy')
+
+    @staticmethod
+    def _create_method(name: str, lloc: int, accessed: set, called: set) -> Method:
+        method = Method(name)
+        method.lloc = lloc
+        method.accessed_attributes.update(accessed)
+        method.called.update(called)
+        return method
+
+    def test_unknown_engines_are_reported(self):
+        with pytest.raises(ValueError):
+            Metrics.create({}, 'fortran')
+
+    def test_results_match_the_python_engine(self):
+        classes = generate_classes(500)
+        for i, class_obj in enumerate(classes.values()):
+            class_obj.attributes.update({(f'attribute{j}', None) for j in range(i % 4)})
+            class_obj.called.update({f'function{j}' for j in range(i % 3)})
+            for j in range(i % 5):
+                class_obj.methods[f'method{j}'] = self._create_method(
+                    f'method{j}', i % 7 + j, {f'attribute{j % 3}', 'missing'},
+                    {f'method{(j + i) % 5}', 'function'}
+                )
+
+        metrics = Metrics.create(classes, 'numpy')
+        python_metrics = Metrics(classes)
+
+        assert metrics.calculate_all_metrics() == python_metrics.calculate_all_metrics()
+        for class_name in classes.keys():
+            assert metrics.get_fan_in(class_name) == python_metrics.get_fan_in(class_name)
+            assert metrics.get_number_of_children(class_name) == \
+                python_metrics.get_number_of_children(class_name)
+            assert metrics.get_coupling_between_classes(class_name) == \
+                python_metrics.get_coupling_between_classes(class_name)
+
+    def test_lcom_edge_cases_match_the_python_engine(self):
+        only_init = Class('OnlyInit')
+        only_init.attributes.add(('value', None))
+        only_init.methods['__init__'] = self._create_method('__init__', 1, {'value'}, set())
+
+        unused_attributes = Class('UnusedAttributes')
+        unused_attributes.attributes.update({('first', None), ('second', None)})
+        unused_attributes.methods['run'] = self._create_method('run', 1, set(), {'run'})
+
+        # A method sharing its name with an attribute is a single vertex
+        shared_name = Class('SharedName')
+        shared_name.attributes.add(('run', None))
+        shared_name.methods['run'] = self._create_method('run', 1, set(), set())
+        shared_name.methods['stop'] = self._create_method('stop', 1, {'run'}, set())
+
+        chain_class = Class('Chain')
+        for i in range(2000):
+            chain_class.methods[f'method{i}'] = self._create_method(
+                f'method{i}', 1, set(), {f'method{i + 1}'}
+            )
+
+        classes = {
+            class_obj.name: class_obj
+            for class_obj in (
+                Class('Empty'), only_init, unused_attributes, shared_name, chain_class
+            )
+        }
+
+        results = Metrics.create(classes, 'numpy').calculate_class_metrics()
+
+        assert {name: result['LCOM'] for name, result in results.items()} == \
+            {'Empty': 0, 'OnlyInit': 0, 'UnusedAttributes': 3, 'SharedName': 1, 'Chain': 1}
+        assert results == Metrics(classes).calculate_class_metrics()
+
+    def test_circular_inheritance_is_reported(self):
+        class_a = Class('ClassA')
+        class_b = Class('ClassB')
+        class_c = Class('ClassC')
+        class_a.parents.append(class_b)
+        class_b.parents.append(class_a)
+        class_c.parents.append(class_a)
+        classes = {'ClassA': class_a, 'ClassB': class_b, 'ClassC': class_c}
+
+        metrics = Metrics.create(classes, 'numpy')
+
+        assert metrics.inheritance_cycles == [['ClassA', 'ClassB']]
+        assert metrics.get_coupling_between_classes('ClassA') == 0
+        assert metrics.get_class_metrics('ClassC')['DIT'] == 'Circular'
+        assert metrics.get_number_of_children('ClassA') == 2
+        assert metrics.get_fan_in('Unknown') == 0
+
+    def test_analysis_uses_the_engine(self):
+        sources = {
+            'package/shapes.py': """
+class Shape:
+    def __init__(self):
+        self.sides = 0
+
+    def area(self):
+        return self.sides
+
+class Square(Shape):
+    def __init__(self, size):
+        self.size = size
+
+    def area(self):
+        return self.size * self.size
+
+    def describe(self, other: Shape):
+        return other.area()
+""",
+        }
+
+        results = PyCKTool.analyze(sources=sources, backend='ast', engine='numpy')
+
+        assert results.to_dicts() == \
+            PyCKTool.analyze(sources=sources, backend='ast').to_dicts()
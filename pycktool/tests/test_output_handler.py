@@ -0,0 +1,206 @@
+import csv
+import json
+import pytest
+import sqlite3
+
+from pycktool.output_handler.json_output import JSONOutput
+from pycktool.output_handler.output_handler import OutputHandler
+from pycktool.output_handler.sqlite_output import SQLiteOutput
+
+class TestOutputHandler:
+
+    _CLASSES_RESULTS = {
+        'ClassA': {'WMC': 2, 'DIT': 'Circular'},
+        'ClassB': {'WMC': 0, 'DIT': 1},
+    }
+
+    _METHODS_RESULTS = {
+        'ClassB': {},
+        'ClassA': {
+            'method_a': {'LLOC': 1, 'NOP': 1},
+            'method_b': {'LLOC': 3, 'NOP': 2},
+        },
+    }
+
+    @pytest.fixture
+    def output_dir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        yield tmp_path
+
+    @pytest.mark.parametrize('results', [{}, _CLASSES_RESULTS, _METHODS_RESULTS])
+    def test_json_output_matches_json_dump(self, results: dict, tmp_path):
+        path = tmp_path / 'results.json'
+        JSONOutput.save_results(iter(results.items()), str(path))
+
+        assert path.read_text(encoding='utf-8') == json.dumps(results, indent=4)
+
+    def test_csv_output_streams_the_rows(self, output_dir):
+        OutputHandler.save_results(
+            iter(self._CLASSES_RESULTS.items()), iter(self._METHODS_RESULTS.items()),
+            'results'
+        )
+
+        with open(output_dir / 'results-classes.csv', encoding='utf-8') as file:
+            classes_rows = list(csv.reader(file))
+        with open(output_dir / 'results-methods.csv', encoding='utf-8') as file:
+            methods_rows = list(csv.reader(file))
+
+        assert classes_rows == [
+            ['class', 'WMC', 'DIT'], ['ClassA', '2', 'Circular'], ['ClassB', '0', '1']
+        ]
+        assert methods_rows == [
+            ['class', 'method', 'LLOC', 'NOP'], 
+            ['ClassA', 'method_a', '1', '1'], 
+            ['ClassA', 'method_b', '3', '2'],
+        ]
+
+    def test_jsonl_output_writes_a_row_per_line(self, output_dir):
+        OutputHandler.save_results(
+            self._CLASSES_RESULTS, self._METHODS_RESULTS, 'results', 'jsonl'
+        )
+
+        with open(output_dir / 'results-methods.jsonl', encoding='utf-8') as file:
+            methods_rows = [json.loads(line) for line in file]
+
+        assert methods_rows == [
+            {'class': 'ClassA', 'method': 'method_a', 'LLOC': 1, 'NOP': 1},
+            {'class': 'ClassA', 'method': 'method_b', 'LLOC': 3, 'NOP': 2},
+        ]
+
+    @pytest.mark.parametrize('output_format', ['parquet', 'arrow'])
+    def test_columnar_output_has_typed_columns(self, output_dir, output_format: str):
+        pa = pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+
+        OutputHandler.save_results(
+            self._CLASSES_RESULTS, self._METHODS_RESULTS, 'results', output_format,
+            repository='repo', class_files={'ClassA': 'module.py'}
+        )
+
+        path = str(output_dir / f'results-classes.{output_format}')
+        if output_format == 'parquet':
+            table = pyarrow.parquet.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+
+        assert table.schema.field('DIT').type == pa.int64()
+        assert table.select(['repository', 'file', 'class', 'WMC', 'DIT']).to_pylist() == [
+            {'repository': 'repo', 'file': 'module.py', 'class': 'ClassA', 'WMC': 2, 'DIT': None},
+            {'repository': 'repo', 'file': None, 'class': 'ClassB', 'WMC': 0, 'DIT': 1},
+        ]
+
+
+class TestSQLiteOutput:
+
+    @pytest.fixture
+    def project_path(self, tmp_path):
+        (tmp_path / 'module.py').write_text('class ClassA: pass\n', encoding='utf-8')
+        (tmp_path / 'other.py').write_text('class ClassB: pass\n', encoding='utf-8')
+        yield tmp_path
+
+    def _save(self, project_path, classes_results: dict, methods_results: dict, 
+              class_files: dict, coupled_classes: dict, settings: str = '') -> dict:
+        return SQLiteOutput.save_results(
+            classes_results.items(), methods_results.items(), 
+            str(project_path / 'results.sqlite'), 'repo', class_files, 
+            coupled_classes, str(project_path), settings
+        )
+
+    def test_repeated_run_writes_only_changed_rows(self, project_path):
+        classes_results = {
+            'ClassA': {'WMC': 2, 'DIT': 'Circular', 'CBO': 1},
+            'ClassB': {'WMC': 0, 'DIT': 0, 'CBO': 1},
+        }
+        methods_results = {
+            'ClassA': {'method': {'LLOC': 2, 'NOP': 1}}, 'ClassB': {}
+        }
+        class_files = {'ClassA': 'module.py', 'ClassB': 'other.py'}
+        coupled_classes = {'ClassA': {'ClassB'}, 'ClassB': set()}
+
+        first_written = self._save(
+            project_path, classes_results, methods_results, class_files, coupled_classes
+        )
+        second_written = self._save(
+            project_path, classes_results, methods_results, class_files, coupled_classes
+        )
+
+        assert first_written == {'files': 2, 'classes': 2, 'methods': 1, 'coupling': 1}
+        assert second_written == {'files': 0, 'classes': 0, 'methods': 0, 'coupling': 0}
+
+        connection = sqlite3.connect(project_path / 'results.sqlite')
+        assert connection.execute(
+            'SELECT class, file, DIT FROM classes ORDER BY class'
+        ).fetchall() == [('ClassA', 'module.py', None), ('ClassB', 'other.py', 0)]
+        connection.close()
+
+    def test_changed_file_updates_and_deletes_rows(self, project_path):
+        self._save(
+            project_path, 
+            {'ClassA': {'WMC': 2}, 'ClassB': {'WMC': 0}},
+            {'ClassA': {'method': {'LLOC': 2, 'NOP': 1}}, 'ClassB': {}},
+            {'ClassA': 'module.py', 'ClassB': 'other.py'},
+            {'ClassA': {'ClassB'}, 'ClassB': set()}
+        )
+
+        (project_path / 'module.py').write_text(
+            'class ClassA:\n    def other(self): pass\n', encoding='utf-8'
+        )
+        written = self._save(
+            project_path, 
+            {'ClassA': {'WMC': 1}},
+            {'ClassA': {'other': {'LLOC': 1, 'NOP': 1}}},
+            {'ClassA': 'module.py'},
+            {'ClassA': set()}
+        )
+
+        assert written == {'files': 1, 'classes': 1, 'methods': 1, 'coupling': 0}
+        connection = sqlite3.connect(project_path / 'results.sqlite')
+        assert connection.execute('SELECT path FROM files').fetchall() == [('module.py',)]
+        assert connection.execute('SELECT class, WMC FROM classes').fetchall() == [('ClassA', 1)]
+        assert connection.execute(
+            'SELECT class, method FROM methods'
+        ).fetchall() == [('ClassA', 'other')]
+        assert connection.execute('SELECT * FROM coupling').fetchall() == []
+        connection.close()
+
+    def test_changed_file_writes_only_changed_methods(self, project_path):
+        self._save(
+            project_path, 
+            {'ClassA': {'WMC': 3}},
+            {'ClassA': {
+                'first': {'LLOC': 1, 'NOP': 1}, 'second': {'LLOC': 2, 'NOP': 1}, 
+                'third': {'LLOC': 3, 'NOP': 1}
+            }},
+            {'ClassA': 'module.py'},
+            {'ClassA': set()}
+        )
+
+        (project_path / 'module.py').write_text(
+            'class ClassA:\n    def first(self): pass\n', encoding='utf-8'
+        )
+        written = self._save(
+            project_path, 
+            {'ClassA': {'WMC': 3}},
+            {'ClassA': {
+                'first': {'LLOC': 1, 'NOP': 1}, 'second': {'LLOC': 5, 'NOP': 1}
+            }},
+            {'ClassA': 'module.py'},
+            {'ClassA': set()}
+        )
+
+        assert written == {'files': 1, 'classes': 0, 'methods': 1, 'coupling': 0}
+        connection = sqlite3.connect(project_path / 'results.sqlite')
+        assert connection.execute(
+            'SELECT method, LLOC FROM methods ORDER BY method'
+        ).fetchall() == [('first', 1), ('second', 5)]
+        connection.close()
+
+    def test_changed_settings_write_the_files_again(self, project_path):
+        arguments = (
+            {'ClassA': {'WMC': 1}}, {'ClassA': {'method': {'LLOC': 1, 'NOP': 1}}},
+            {'ClassA': 'module.py'}, {'ClassA': set()}
+        )
+        self._save(project_path, *arguments, 'astroid python')
+
+        assert self._save(project_path, *arguments, 'astroid python')['files'] == 0
+        assert self._save(project_path, *arguments, 'ast python')['files'] == 1
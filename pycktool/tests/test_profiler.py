@@ -0,0 +1,60 @@
+import sys
+import subprocess
+import pytest
+
+from pycktool.profiling.profiler import PeakMemory, Profiler, get_peak_rss, reset_peak_rss
+
+class TestProfiler:
+
+    def test_disabled_profiler_collects_nothing(self):
+        profiler = Profiler()
+
+        with profiler.phase('parse'):
+            pass
+
+        assert profiler.phases == {}
+
+    def test_report_lists_phases_slowest_files_and_rates(self):
+        profiler = Profiler(enabled=True)
+        with profiler.phase('parse'):
+            profiler.add_file('fast.py', {'read': 0.001, 'parse': 0.01, 'ast_parse': 0.005})
+            profiler.add_file('slow.py', {'read': 0.001, 'parse': 2.0, 'inference': 1.5})
+        profiler.add_counters({'inferences': 3, 'inference_cache_hits': 1})
+
+        report = profiler.report(slowest_files=1)
+
+        assert profiler.files['slow.py']['extraction'] == 0.5
+        assert 'parse' in profiler.phases
+        assert 'slow.py' in report
+        assert 'fast.py' not in report
+        assert 'inference cache hit rate 25.0%' in report
+
+    @pytest.mark.skipif(get_peak_rss() is None, reason='peak RSS is not available')
+    def test_peak_memory_is_measured_for_each_phase(self):
+        if not reset_peak_rss():
+            pytest.skip('the peak RSS can not be reset in this platform')
+        profiler = Profiler(enabled=True)
+
+        with profiler.phase('parse'):
+            data = bytearray(64 * 1024 * 1024)
+            data[::4096] = b'\x01' * len(range(0, len(data), 4096))
+            del data
+        with profiler.phase('metrics'):
+            pass
+
+        assert profiler.phases['parse']['peak_rss'] >= \
+            profiler.phases['metrics']['peak_rss'] + 32
+
+    @pytest.mark.skipif(get_peak_rss() is None, reason='peak RSS is not available')
+    def test_peak_memory_of_finished_children_is_measured(self):
+        # The peak of the children is the one of the largest child of the run
+        size = int(get_peak_rss('children') or 0) + 32
+        with PeakMemory() as memory:
+            subprocess.run(
+                [sys.executable, '-c', f'data = bytearray({size} * 1024 * 1024); '
+                 'data[::4096] = b"\\x01" * len(range(0, len(data), 4096))'],
+                check=True
+            )
+
+        assert memory.children_peak_rss is not None
+        assert memory.children_peak_rss >= size
@@ -0,0 +1,168 @@
+import os
+import json
+import pytest
+
+from pycktool.metrics.metrics import Metrics
+from pycktool.output_handler.output_handler import OutputHandler
+from pycktool.parser.file_discovery import FileDiscovery
+from pycktool.parser.folder_parser import FolderParser
+from pycktool.pycktool_run import PyCKTool
+from pycktool.sharding.shard import Shard
+
+class TestShard:
+
+    _FOLDER = 'project'
+
+    _FILES = {
+        'base.py': """
+class Base:
+    def __init__(self):
+        self.value = 0
+""",
+        'pkg/__init__.py': '',
+        'pkg/child.py': """
+from base import Base
+from pkg.nested.helper import Helper
+
+class Child(Base):
+    def run(self, helper: Helper):
+        return helper.help(self)
+""",
+        'pkg/nested/helper.py': """
+class Helper:
+    def help(self, child):
+        return Base()
+""",
+        'pkg/other.py': """
+class Child(Unknown):
+    pass
+""",
+        'zlast.py': """
+from pkg.child import Child
+
+class GrandChild(Child):
+    pass
+""",
+    }
+
+    def _extract_shards(self, project_path: str, output_path, count: int) -> list[str]:
+        shard_paths = []
+        for index in range(count):
+            shard_path = str(output_path / f'shard-{index}.json.gz')
+            PyCKTool.extract_shard(project_path, shard_path, f'{index}/{count}', backend='ast')
+            shard_paths.append(shard_path)
+        return shard_paths
+
+    def test_shards_are_parsed(self):
+        assert Shard.parse_shard('2/4') == (2, 4)
+        for shard in ['4/4', '-1/4', '0/0', '1', 'a/b']:
+            with pytest.raises(ValueError):
+                Shard.parse_shard(shard)
+
+    def test_each_file_is_in_one_shard(self, project_path: str):
+        file_paths = list(FileDiscovery(project_path).iter_files())
+        shards = [Shard.select_files(project_path, file_paths, index, 3) for index in range(3)]
+
+        assert sorted(sum(shards, [])) == sorted(file_paths)
+        assert Shard.select_files(project_path, file_paths, 0, 1) == file_paths
+
+    def test_files_are_ordered_as_discovered(self, project_path: str):
+        relative_paths = [
+            os.path.relpath(file_path, project_path)
+            for file_path in FileDiscovery(project_path).iter_files()
+        ]
+
+        assert sorted(relative_paths, key=FileDiscovery.get_order_key) == relative_paths
+
+    @pytest.mark.parametrize('count', [1, 2, 3])
+    def test_merged_shards_match_a_full_run(self, project_path: str, tmp_path, count: int):
+        shard_paths = self._extract_shards(project_path, tmp_path, count)
+        parser = Shard.merge([Shard.load(shard_path) for shard_path in shard_paths])
+
+        expected = FolderParser(project_path, backend='ast').parse_path()
+        assert list(parser.classes.keys()) == list(expected.keys())
+        assert Metrics(parser.classes).calculate_all_metrics() == \
+            Metrics(expected).calculate_all_metrics()
+        assert OutputHandler.get_class_files(parser.classes, '.') == \
+            OutputHandler.get_class_files(expected, project_path)
+
+    def test_merge_saves_the_results(self, project_path: str, tmp_path, monkeypatch):
+        shard_paths = self._extract_shards(project_path, tmp_path, 2)
+        monkeypatch.chdir(tmp_path)
+        PyCKTool.merge(shard_paths, 'json', 'merged-')
+        PyCKTool.run(project_path, 'json', 'full-', backend='ast')
+
+        for results in ['classes', 'methods']:
+            with open(tmp_path / f'merged-results-{results}.json', encoding='utf-8') as file:
+                merged = json.load(file)
+            with open(tmp_path / f'full-results-{results}.json', encoding='utf-8') as file:
+                assert merged == json.load(file)
+
+    def test_shard_files_are_relative(self, project_path: str, tmp_path):
+        shard_path = str(tmp_path / 'shard.json')
+        PyCKTool.extract_shard(project_path, shard_path, backend='ast')
+        shard = Shard.load(shard_path)
+
+        assert shard.repository == 'project'
+        assert shard.root == os.path.abspath(project_path)
+        assert (shard.index, shard.count) == (0, 1)
+        assert shard.stats.get('parse_failures', 0) == 0
+        assert {record['name']: record['file'] for record in shard.files['base.py']} == \
+            {'base.Base': 'base.py'}
+
+    def test_shards_of_other_backends_or_versions_are_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            Shard.merge([
+                Shard({}, backend='ast', index=0, count=2),
+                Shard({}, backend='astroid', index=1, count=2)
+            ])
+
+        shard_path = str(tmp_path / 'shard.json')
+        Shard({}).save(shard_path)
+        with open(shard_path, encoding='utf-8') as file:
+            data = json.load(file)
+        data['records_version'] = 'old'
+        with open(shard_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        with pytest.raises(ValueError):
+            Shard.load(shard_path)
+
+    def test_shards_of_other_folders_or_options_are_rejected(self):
+        with pytest.raises(ValueError):
+            Shard.merge([
+                Shard({}, repository='project', root='/a/project', index=0, count=2),
+                Shard({}, repository='project', root='/b/project', index=1, count=2)
+            ])
+        with pytest.raises(ValueError):
+            Shard.merge([
+                Shard({}, index=0, count=2, parser_options={'inference_steps': 10}),
+                Shard({}, index=1, count=2, parser_options={'inference_steps': 20})
+            ])
+
+        # The inference context does not change the records
+        Shard.merge([
+            Shard({}, index=0, count=2, parser_options={'inference_context': 'modules'}),
+            Shard({}, index=1, count=2)
+        ])
+
+    @pytest.mark.parametrize('shards', [
+        [(0, 2)], [(0, 2), (0, 2)], [(0, 2), (1, 2), (1, 2)], [(0, 2), (1, 3)]
+    ])
+    def test_missing_or_repeated_shards_are_rejected(self, shards: list[tuple[int, int]]):
+        with pytest.raises(ValueError):
+            Shard.merge([Shard({}, index=index, count=count) for index, count in shards])
+
+    def test_saved_shards_keep_their_settings(self, project_path: str, tmp_path):
+        shard_paths = []
+        for index in range(2):
+            shard_path = str(tmp_path / f'shard-{index}.json')
+            PyCKTool.extract_shard(
+                project_path, shard_path, f'{index}/2', inference_steps=10 * (index + 1)
+            )
+            shard_paths.append(shard_path)
+        shards = [Shard.load(shard_path) for shard_path in shard_paths]
+
+        assert [(shard.index, shard.count) for shard in shards] == [(0, 2), (1, 2)]
+        assert shards[1].parser_options == {'inference_steps': 20}
+        with pytest.raises(ValueError):
+            Shard.merge(shards)
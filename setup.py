@@ -19,10 +19,14 @@ setup(
     packages=find_packages(),
     entry_points={
         "console_scripts": [
-            "pycktool=pycktool.main:main",
+            "pycktool=pycktool:main",
         ],
     },
     install_requires=requirements,
+    extras_require={
+        'columnar': ['pyarrow'],
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Environment :: Console',
         'Intended Audience :: Developers',